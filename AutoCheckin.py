@@ -1,515 +1,2487 @@
+import argparse
+import asyncio
+import functools
+import importlib.util
+import itertools
+import json
+import os
+import random
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
 import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait as futures_wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import urllib3
+
+try:
+    import psutil  # 可选依赖，资源调度器用它测量浏览器的内存和 CPU 占用
+except ImportError:
+    psutil = None
+
+# selenium 在第一次需要浏览器时才由 load_selenium 导入并填充以下名称，
+# 只检查配置（--dry-run）或只使用 HTTP 接口时无需付出导入开销
+webdriver = Options = WebDriverWait = EC = None
+TimeoutException = StaleElementReferenceException = None
 
 # --- 全局常量 ---
 TIMESLEEP = 0.5  # 定义一个统一的等待时间，方便管理
+SITE_BASE_URL = 'https://www.blablalink.com'
+TARGET_URL = f'{SITE_BASE_URL}/points'
+OUTPOST_URL = f'{SITE_BASE_URL}/?plate_type=outpost'
+NUM_TO_LIKE = 5  # 每日需要点赞的帖子数量
+NUM_TO_BROWSE = 3  # 每日需要浏览的帖子数量
+NUM_TO_COMMENT = 1  # 每日需要评论的帖子数量，多个帖子在同一个标签页中依次评论
+FEED_SCROLL_ROUNDS = 3  # 当前列表中可操作的帖子不足时，最多向下滚动加载更多帖子的次数
+
+# 积分页面上各任务行的标识文本，与任务函数一一对应。
+# 文本中的数量（5 个点赞、3 个浏览、1 条评论）由站点规定，与 NUM_TO_* 无关：
+# NUM_TO_* 低于这些数量时，积分页面上的任务不会显示为完成，验证会认为任务未完成。
+POINTS_TASK_IDENTIFIERS = {
+    "daily_check_in": "每日簽到",
+    "browse_posts": "瀏覽3個貼文",
+    "like_posts": "按讚5個貼文",
+    "post_emoji_comment": "發布1條評論",
+}
+
+# 浏览器模式下可执行的任务，按执行顺序排列
+BROWSER_TASKS = ("daily_check_in", "like_posts", "post_emoji_comment", "browse_posts", "check_points_page")
+ENABLED_TASKS = BROWSER_TASKS  # 本次运行要执行的任务，可通过命令行 --tasks 只选择其中一部分
+FEED_TASKS = {"like_posts", "post_emoji_comment", "browse_posts"}  # 需要先进入“前哨基地”最新列表的任务
+
+# --- 任务调度 ---
+TASK_RETRIES = 2  # 每个任务失败后的重试次数
+TASK_TIMEOUT = 60  # 每个任务单次尝试的硬超时（秒）
+RETRY_BASE_DELAY = 1.0  # 重试退避的基础时间（秒），每次重试翻倍并加入随机抖动
+RETRY_MAX_DELAY = 15.0  # 重试退避的上限（秒）
+VERIFY_ROUNDS = 1  # 积分页面验证未通过时，重新执行未完成任务的轮数
+
+# --- 多账号配置 ---
+ACCOUNTS_FILE = "accounts.json"  # 账号列表文件，格式见 load_accounts
+DEFAULT_CHROME_PROFILE_PATH = r"E:\AutoCheckin_chrome_profile"  # 未提供账号文件时使用
+# DEFAULT_CHROME_PROFILE_PATH = r"C:\Users\jyr\Desktop\AutoCheckin_chrome_profile"
+MAX_WORKERS = 2  # 同时运行的浏览器数量上限
+
+# --- 节奏控制 ---
+FAST_MODE = False  # 快速模式：跳过所有装饰性的停留，只保留等待页面条件的部分
+MIN_DWELL = TIMESLEEP  # 每个动作之后的最短停留时间（秒），避免操作过快被判定为机器人
+BROWSE_DWELL = 1.0  # 浏览帖子时在详情页停留的时间（秒）
+# 浏览帖子的方式："tabs"：从列表中提取帖子链接，在后台标签页中同时打开，列表页无需重新加载；
+# "click"：逐个点击标题进入详情页再后退（帖子没有链接时也会退回此方式）
+BROWSE_MODE = "tabs"
+TAB_MIN_DWELL = 0.5  # 后台标签页加载完成后至少停留的时间（秒），让详情页的浏览请求发出；快速模式下同样生效
+WAIT_TIMEOUT = 20  # 显式等待的超时时间（秒）
+WAIT_POLL_FREQUENCY = 0.1  # 显式等待的轮询间隔（秒），默认的 0.5 秒会白白浪费时间
+EXPAND_REVEAL_TIMEOUT = 2  # 积分页面点击“展开”后等待新任务行出现的最长时间（秒）
+LIKE_COUNT_TIMEOUT = 3  # 点赞后等待点赞数变化的最长时间（秒），所有点赞数都变化后立即继续
+# 开启浏览器性能日志，签到、点赞、评论和切换排序后等待对应的后端接口响应（并据此判断是否成功），
+# 而不是轮询页面元素的变化。见 NetworkMonitor。
+# API_ENDPOINTS 中的接口路径尚未在真实站点上确认，因此默认关闭；确认后再开启
+NETWORK_WAITS = False
+NETWORK_REQUEST_GRACE = 3  # 操作后等待对应接口请求出现的时间（秒），超过仍未出现则退回页面元素判断
+SELECTOR_CACHE_FILE = "selector_cache.json"  # 各定位器上次命中的策略（CSS 或 XPath），跨运行、跨账号复用
+
+# --- 运行报告 ---
+REPORTS_DIR = "reports"  # 每次账号运行的计时报告（JSON）保存目录
+
+# --- 运行状态缓存 ---
+STATE_DB_PATH = "run_state.sqlite3"  # 记录每个账号每天已完成的任务和已操作过的帖子
+STATE_RETENTION_DAYS = 7  # 只保留最近几天的记录，更早的记录在启动时清除
+SERVER_UTC_OFFSET_HOURS = 8  # 服务器所在时区（UTC+8）
+SERVER_RESET_HOUR = 0  # 服务器每日任务重置的时刻（服务器时区的小时数）
+
+# --- 资源调度 ---
+# 多账号运行时，只有本机的可用内存和 CPU 足够时才启动新的浏览器（需要安装 psutil），见 ResourceGovernor
+GOVERNOR_ENABLED = True
+GOVERNOR_MEMORY_RESERVE_MB = 1024  # 启动新浏览器后至少保留的可用内存（MB）
+GOVERNOR_CPU_LIMIT = 85  # 系统 CPU 占用超过该百分比时暂缓启动新浏览器
+GOVERNOR_DEFAULT_BROWSER_MB = 400  # 尚未测量到任何浏览器时，假设每个浏览器占用的内存（MB）
+GOVERNOR_ADMIT_INTERVAL = 1.0  # 资源不足时重新检查的间隔（秒）
+BROWSER_MEMORY_CEILING_MB = 1500  # 浏览器池中的浏览器内存超过该值时关闭并在需要时重新启动
+
+# --- 常驻模式 ---
+DAEMON_MODE = False  # 常驻运行：每天服务器重置后按计划错开启动各账号，而不是运行一次后退出
+DAEMON_START_DELAY_MINUTES = 5  # 服务器重置后等待多久开始第一个账号（分钟），避开重置时刻的高峰
+DAEMON_WINDOW_MINUTES = 120  # 所有账号的开始时间在这段时间内均匀错开（分钟）
+DAEMON_RETRY_DELAY_MINUTES = 60  # 账号运行失败后，隔多久再重试（分钟）
+DAEMON_MAX_ATTEMPTS = 3  # 每个账号每天最多尝试的次数
+DAEMON_STATUS_FILE = "daemon_status.json"  # 常驻模式的状态文件，每次状态变化时更新
+DAEMON_STATUS_PORT = 0  # 大于 0 时在 127.0.0.1 的该端口上提供只读的状态接口（GET /status）
+
+# --- 任务引擎 ---
+# "browser"：所有操作都通过渲染后的页面完成；
+# "http"：使用浏览器配置文件中的会话 Cookie 直接调用后端接口，失败的任务再退回浏览器执行
+# "async"：与 "http" 相同，但在单个事件循环中并发驱动所有账号的任务流水线
+ENGINE = "browser"
+ASYNC_GLOBAL_CONCURRENCY = 16  # async 模式下全局同时进行的接口请求上限
+ASYNC_ACCOUNT_CONCURRENCY = 3  # async 模式下单个账号同时进行的接口请求上限
+API_BASE_URL = "https://api.blablalink.com"  # 可指向本地的桩服务器进行测试
+# 网页端调用的后端接口路径，站点改版时只需在此更新
+API_ENDPOINTS = {
+    "check_in": "/api/lip/proxy/lipass/Points/DailyCheckIn",
+    "post_list": "/api/ugc/direct/standalonesite/Dynamics/GetPostList",
+    "post_detail": "/api/ugc/direct/standalonesite/Dynamics/GetPostDetail",
+    "like": "/api/ugc/proxy/standalonesite/Dynamics/PostStar",
+    "comment": "/api/ugc/proxy/standalonesite/Dynamics/PostComment",
+}
+API_OUTPOST_PLATE_ID = 38  # “前哨基地”板块的 ID
+# 接口模式下的帖子任务：任务名称 → (运行状态中记录的操作类型, ApiClient 方法名, 日志中的动作名称)
+API_FEED_TASKS = {
+    "like_posts": ("like", "like_post", "点赞"),
+    "post_emoji_comment": ("comment", "comment_post", "评论"),
+    "browse_posts": ("browse", "browse_post", "浏览"),
+}
+API_COMMENT_CONTENT = "👍"  # HTTP 模式下发送的评论内容
+# 接口模式下，通过接口完成的任务是否再启动浏览器、由积分页面确认其进度（需同时选择 check_points_page 任务）。
+# 开启后每个账号都要启动一次浏览器，因此默认关闭；关闭时只有接口执行失败的任务才会启动浏览器
+API_VERIFY_IN_BROWSER = False
+# 浏览器模式下点赞前先用浏览器会话的 Cookie 调用帖子列表接口，以接口返回的 my_upvote 确认哪些帖子已点赞。
+# 与 NETWORK_WAITS 一样，API_ENDPOINTS 中的帖子列表接口和返回字段尚未在真实站点上确认，因此默认关闭；
+# 开启后返回中没有 my_upvote 字段的帖子仍以页面上的状态为准
+LIKE_STATE_FROM_API = False
+LIKE_STATE_API_TIMEOUT = 5  # 读取点赞状态的接口请求超时（秒），不重试，避免占用点赞任务的硬超时
+API_TIMEOUT = 10  # 单个接口请求的超时时间（秒）
+API_POOL_SIZE = 4  # 每个账号的连接池大小
+COOKIES_DIR = "cookies"  # 从浏览器配置文件导出的 Cookie 缓存目录
+COOKIES_MAX_AGE = 12 * 3600  # Cookie 缓存的有效期（秒），过期后重新从浏览器导出
+
+# --- 浏览器会话 ---
+# "profile"：每个账号用自己的 Chrome 配置文件启动一个新的浏览器，运行结束后关闭；
+# "cookies"：每个工作线程保留一个常驻的浏览器，切换账号时只替换 Cookie 并清空站点存储，
+#            启动开销每个线程只付出一次。账号 Cookie 来自 load_account_cookies 的缓存；
+#            缓存不存在或已过期时，仍会用账号的配置文件启动一次完整的浏览器导出 Cookie（见 export_cookies）。
+SESSION_MODE = "profile"
+
+# --- 浏览器启动选项（生产模式） ---
+# 每一项都可以单独关闭；调试时可将 window_size 设为 None 以恢复最大化的窗口
+BROWSER_OPTIONS = {
+    # 无头模式，不显示浏览器窗口。默认关闭：首次使用配置文件时需要在窗口中手动登录，
+    # 确认配置文件已登录后可设为 True 或使用命令行参数 --headless
+    "headless": False,
+    "block_images": True,  # 通过偏好设置禁止加载图片（签到状态依赖 class 名，不依赖图片本身）
+    "block_media": True,  # 通过 CDP 屏蔽音视频和字体等请求，见 BLOCKED_URL_PATTERNS
+    "page_load_strategy": "eager",  # DOM 就绪即返回，不等待图片等子资源加载完成
+    "window_size": (1280, 800),  # 缩小的窗口尺寸；为 None 时最大化窗口
+    "disable_background_networking": True,  # 禁止后台网络请求（更新检查、预取等）
+    "disable_gpu": True,  # 禁用 GPU 加速
+    "extra_arguments": [],  # 额外的命令行参数，例如在容器中运行时需要的 "--no-sandbox"
+}
+BLOCKED_URL_PATTERNS = ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.woff", "*.woff2", "*.ttf", "*.otf"]
+
+# --- 调试选项 ---
+HIGHLIGHT_ELEMENTS = False  # 调试模式：点击前高亮元素。关闭时 highlight_element 不产生任何 WebDriver 调用
 
 
 def highlight_element(driver, element, duration=0.5):
     """
     使用JavaScript高亮显示一个元素，持续指定时间。
+
+    仅在 HIGHLIGHT_ELEMENTS 开启时生效，关闭时直接返回，不产生任何 WebDriver 调用。
+    样式的恢复由页面内的 setTimeout 异步完成，Python 线程不会因此等待。
+
     :param driver: WebDriver 实例
     :param element: 要高亮的网页元素
     :param duration: 高亮持续时间（秒）
     """
+    if not HIGHLIGHT_ELEMENTS:
+        return
     try:
-        # 保存原始边框样式
-        original_style = element.get_attribute("style")
-        # 应用高亮样式：3像素、红色、实线边框
-        highlight_style = "border: 3px solid red; box-shadow: 0px 0px 8px red;"
-        driver.execute_script(f"arguments[0].setAttribute('style', arguments[1]);", element,
-                              original_style + highlight_style)
-
-        # 等待指定时间，让肉眼可以看到高亮效果
-        time.sleep(duration)
-
-        # 恢复元素的原始样式
-        driver.execute_script("arguments[0].setAttribute('style', arguments[1]);", element, original_style)
+        # 在一次脚本调用中保存原始样式、应用高亮样式（3像素、红色、实线边框），并定时恢复
+        driver.execute_script(
+            """
+            var el = arguments[0];
+            var originalStyle = el.getAttribute('style') || '';
+            el.setAttribute('style', originalStyle + 'border: 3px solid red; box-shadow: 0px 0px 8px red;');
+            setTimeout(function () { el.setAttribute('style', originalStyle); }, arguments[1]);
+            """,
+            element, int(duration * 1000))
     except Exception as e:
         # 如果元素失效或出现其他问题，则忽略高亮，避免脚本中断
         # print(f"高亮元素时出错: {e}")
         pass
 
 
-def setup_driver(profile_path):
+class RunMetrics:
+    """
+    记录一次账号运行中每个任务的耗时数据：总耗时、显式等待耗时、WebDriver 往返次数及耗时。
+
+    WebDriver 命令和显式等待会计入当前正在执行的任务；任务之外的命令计入 "other"。
+    """
+
+    def __init__(self, account):
+        """
+        :param account: 字符串，账号名称。
+        """
+        self.account = account
+        self.started_at = time.time()
+        self.tasks = []
+        self._stack = []
+        self._other = self._new_entry("other")
+
+    @staticmethod
+    def _new_entry(task):
+        return {"task": task, "wall_time": 0.0, "wait_time": 0.0, "round_trips": 0,
+                "command_time": 0.0, "commands": {}, "result": None}
+
+    def _current(self):
+        return self._stack[-1] if self._stack else self._other
+
+    def start_task(self, task):
+        """开始记录一个任务，返回该任务的记录。"""
+        entry = self._new_entry(task)
+        entry["_start"] = time.perf_counter()
+        self._stack.append(entry)
+        return entry
+
+    def end_task(self, entry, result):
+        """结束记录一个任务。"""
+        entry["wall_time"] = time.perf_counter() - entry.pop("_start")
+        entry["result"] = result if isinstance(result, (bool, int, float, str, type(None))) else bool(result)
+        self._stack.remove(entry)
+        self.tasks.append(entry)
+
+    def record_command(self, command, elapsed):
+        """记录一次 WebDriver 命令往返。"""
+        entry = self._current()
+        entry["round_trips"] += 1
+        entry["command_time"] += elapsed
+        entry["commands"][command] = entry["commands"].get(command, 0) + 1
+
+    def record_wait(self, elapsed):
+        """记录一次显式等待的耗时。"""
+        self._current()["wait_time"] += elapsed
+
+    def to_dict(self):
+        """:return: 可序列化为 JSON 的报告字典。"""
+        # 任务之外的命令没有独立的起止时间，以命令耗时作为其总耗时
+        self._other["wall_time"] = self._other["command_time"]
+        tasks = self.tasks + ([self._other] if self._other["round_trips"] else [])
+        return {
+            "account": self.account,
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "total_time": time.time() - self.started_at,
+            "round_trips": sum(t["round_trips"] for t in tasks),
+            "tasks": tasks,
+        }
+
+    def save(self, directory=REPORTS_DIR):
+        """
+        将报告写入 JSON 文件，文件名包含精确到毫秒的开始时间。
+
+        同一账号在同一毫秒内开始的多次运行（例如常驻模式下的快速重试）会在文件名后追加序号，不会互相覆盖。
+
+        :param directory: 字符串，报告保存目录。
+        :return: 字符串，报告文件路径。
+        """
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.fromtimestamp(self.started_at).strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        for attempt in itertools.count():
+            suffix = f"-{attempt}" if attempt else ""
+            path = os.path.join(directory, f"{self.account}-{timestamp}{suffix}.json")
+            try:
+                # "x" 模式只在文件不存在时创建，检查与创建之间不会被其他线程抢先
+                with open(path, "x", encoding="utf-8") as f:
+                    json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+                return path
+            except FileExistsError:
+                continue
+
+
+def instrument_driver(driver, metrics):
+    """
+    让 driver 的每一次 WebDriver 命令都计入 metrics。
+
+    所有 WebDriver 调用（find_element、execute_script、get 等）最终都经过 driver.execute，
+    因此只需要包装这一个方法。
+
+    :param driver: WebDriver 实例。
+    :param metrics: RunMetrics 实例。
+    :return: 传入的 driver。
+    """
+    # 浏览器池中的 driver 会被多个账号复用，始终包装最原始的 execute，避免层层嵌套
+    original_execute = getattr(driver, "_unwrapped_execute", driver.execute)
+    driver._unwrapped_execute = original_execute
+
+    def execute(driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return original_execute(driver_command, params)
+        finally:
+            metrics.record_command(driver_command, time.perf_counter() - start)
+
+    driver.execute = execute
+    driver.run_metrics = metrics
+    return driver
+
+
+def timed_task(func):
+    """
+    任务函数的装饰器：driver 带有 run_metrics 时，记录任务的总耗时、等待耗时和往返次数。
+    """
+    @functools.wraps(func)
+    def wrapper(driver, *args, **kwargs):
+        metrics = getattr(driver, "run_metrics", None)
+        if metrics is None:
+            return func(driver, *args, **kwargs)
+        entry = metrics.start_task(func.__name__)
+        result = None
+        try:
+            result = func(driver, *args, **kwargs)
+            return result
+        finally:
+            metrics.end_task(entry, result)
+    return wrapper
+
+
+def load_selenium():
+    """
+    导入 selenium，并填充本模块中的 webdriver、Options、WebDriverWait、EC 和异常类名称。
+    只在第一次调用时真正导入；所有需要浏览器的入口（setup_driver、make_wait）都会先调用它。
+    """
+    global webdriver, Options, WebDriverWait, EC, TimeoutException, StaleElementReferenceException
+    if webdriver is not None:
+        return
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+    from selenium import webdriver
+
+
+class TimedWebDriverWait:
+    """会把等待耗时计入 driver.run_metrics 的 WebDriverWait 包装。"""
+
+    def __init__(self, driver, timeout, poll_frequency=WAIT_POLL_FREQUENCY):
+        load_selenium()
+        self._driver = driver
+        self._wait = WebDriverWait(driver, timeout, poll_frequency=poll_frequency)
+
+    def until(self, method, message=""):
+        start = time.perf_counter()
+        try:
+            return self._wait.until(method, message)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def until_not(self, method, message=""):
+        start = time.perf_counter()
+        try:
+            return self._wait.until_not(method, message)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def _record(self, elapsed):
+        metrics = getattr(self._driver, "run_metrics", None)
+        if metrics is not None:
+            metrics.record_wait(elapsed)
+
+
+def percentile(values, pct):
+    """
+    :param values: 数值列表。
+    :param pct: 百分位（0-100）。
+    :return: 最近秩法计算的百分位数，列表为空时返回 None。
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize_reports(reports):
+    """
+    汇总多份运行报告，计算每个任务的 p50 / p95 耗时和平均往返次数。
+
+    :param reports: 报告字典列表（RunMetrics.to_dict() 的返回值或读取的 JSON 文件）。
+    :return: 字典，键为任务名称，值为 {"count", "p50", "p95", "avg_round_trips"}。
+    """
+    by_task = {}
+    for report in reports:
+        for task in report["tasks"]:
+            by_task.setdefault(task["task"], []).append(task)
+    return {
+        name: {
+            "count": len(entries),
+            "p50": percentile([e["wall_time"] for e in entries], 50),
+            "p95": percentile([e["wall_time"] for e in entries], 95),
+            "avg_round_trips": sum(e["round_trips"] for e in entries) / len(entries),
+        }
+        for name, entries in by_task.items()
+    }
+
+
+def print_latency_summary(reports):
+    """
+    打印多份运行报告的任务耗时分布。
+
+    :param reports: 报告字典列表。
+    """
+    summary = summarize_reports(reports)
+    if not summary:
+        return
+    print("\n========== 任务耗时分布 ==========")
+    for name, stats in summary.items():
+        print(f"  {name}: p50 {stats['p50']:.2f} 秒，p95 {stats['p95']:.2f} 秒，"
+              f"平均往返 {stats['avg_round_trips']:.1f} 次（样本 {stats['count']} 个）")
+
+
+def pace(seconds=None):
+    """
+    动作之间的节奏停留。快速模式下直接返回，不做任何停留。
+
+    :param seconds: 停留时间（秒），为 None 时使用 MIN_DWELL。
+    """
+    if FAST_MODE:
+        return
+    time.sleep(MIN_DWELL if seconds is None else seconds)
+
+
+@contextmanager
+def script_timeout(driver, seconds):
+    """
+    临时修改异步脚本的超时时间，结束后恢复原值。该设置对整个 driver 生效，不恢复会影响之后所有的异步脚本。
+
+    :param driver: WebDriver 实例。
+    :param seconds: 超时时间（秒）。
+    """
+    previous = driver.timeouts.script
+    driver.set_script_timeout(seconds)
+    try:
+        yield driver
+    finally:
+        driver.set_script_timeout(previous)
+
+
+def make_wait(driver, timeout=WAIT_TIMEOUT):
+    """
+    创建一个使用较短轮询间隔、并会记录等待耗时的 WebDriverWait。
+
+    :param driver: WebDriver 实例。
+    :param timeout: 超时时间（秒）。
+    :return: WebDriverWait 实例。
+    """
+    return TimedWebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_FREQUENCY)
+
+
+def wait_for_page_ready(driver, wait):
+    """
+    等待当前文档加载完成（document.readyState 为 interactive 或 complete）。
+
+    :param driver: WebDriver 实例。
+    :param wait: WebDriverWait 实例。
+    """
+    wait.until(lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"))
+
+
+# 在页面内解析一个选择器：先用 CSS（原生 querySelectorAll，加上可选的文本过滤），
+# 没有匹配时再退回到 XPath；上次只能靠 XPath 命中的选择器（prefer 为 "xpath"）则先尝试 XPath。
+# 返回命中的策略和元素列表，整个过程只需一次 execute_script。
+# resolveSelector 也被其他页面内脚本复用（见 _COMMENT_IN_PANEL_JS）。
+_RESOLVE_SELECTOR_FN_JS = """
+function resolveSelector(selector, context, mode) {
+    context = context || document;
+    function ownText(el) {
+        var text = '';
+        for (var i = 0; i < el.childNodes.length; i++) {
+            if (el.childNodes[i].nodeType === 3) { text += el.childNodes[i].textContent; }
+        }
+        return text;
+    }
+    function matchesText(el) {
+        if (!selector.text) { return true; }
+        if (selector.text_mode === 'exact') { return ownText(el).trim() === selector.text; }
+        if (selector.text_mode === 'own') { return ownText(el).indexOf(selector.text) >= 0; }
+        return (el.textContent || '').indexOf(selector.text) >= 0;
+    }
+    function isVisible(el) {
+        return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    }
+    function byCss() {
+        if (!selector.css) { return []; }
+        try {
+            return Array.prototype.filter.call(context.querySelectorAll(selector.css), matchesText);
+        } catch (e) {
+            // 浏览器不支持该 CSS 语法（例如旧版本没有 :has）时，交给 XPath 处理
+            return [];
+        }
+    }
+    function byXpath() {
+        var nodes = [];
+        if (!selector.xpath) { return nodes; }
+        var snapshot = document.evaluate(selector.xpath, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+        return nodes;
+    }
+    var order = selector.prefer === 'xpath' ? [['xpath', byXpath], ['css', byCss]] : [['css', byCss], ['xpath', byXpath]];
+    var elements = [], strategy = null;
+    for (var i = 0; i < order.length && !elements.length; i++) {
+        elements = order[i][1]();
+        if (elements.length) { strategy = order[i][0]; }
+    }
+    if (mode === 'visible' || mode === 'clickable') {
+        elements = elements.filter(isVisible);
+    }
+    if (mode === 'clickable') {
+        elements = elements.filter(function (el) { return !el.disabled; });
+    }
+    return {strategy: strategy, elements: elements};
+}
+"""
+_RESOLVE_SELECTOR_JS = _RESOLVE_SELECTOR_FN_JS + """
+return resolveSelector(arguments[0], arguments[1], arguments[2]);
+"""
+
+
+@dataclass(frozen=True)
+class Selector:
+    """
+    一个具名的元素定位器。
+
+    css 为首选的快速路径；text 用于在 CSS 结果上按文本过滤（CSS 本身无法按文本匹配）：
+    text_mode 为 "contains" 时匹配元素的全部文本，"own" 只匹配元素自身的文本节点，
+    "exact" 要求自身文本去掉首尾空白后完全相等。xpath 为 CSS 无法命中时的后备定位方式。
+    与 context 一起使用的选择器，其 XPath 需以 "." 开头；含后代组合符的 CSS 需以 ":scope" 开头，
+    否则祖先部分可能匹配到 context 之外的元素。以 "." 开头的 XPath 在不传 context 时同样在整个页面中查找。
+    """
+    css: Optional[str] = None
+    xpath: Optional[str] = None
+    text: Optional[str] = None
+    text_mode: str = "contains"
+
+
+class SelectorRegistry:
+    """
+    集中管理页面元素的定位器，并统计每个定位器的命中情况。
+
+    页面改版时只需修改这里的定义；运行结束后通过 print_stats 可以看出哪些 CSS 快速路径已经失效
+    （只能靠 XPath 找到）或者彻底找不到元素。同一个实例可以被多个线程共享。
+    """
+
+    def __init__(self, selectors):
+        """
+        :param selectors: 字典，定位器名称 -> Selector。
+        """
+        self.selectors = dict(selectors)
+        self.lock = threading.Lock()
+        self.stats = {}
+        # 定位器名称 -> 上次命中的策略（"css" 或 "xpath"），下次定位时先尝试该策略
+        self.preferred = {}
+
+    def record(self, name, strategy, elapsed):
+        """
+        记录一次定位结果。
+
+        :param name: 字符串，定位器名称。
+        :param strategy: "css"、"xpath"，未找到时为 None。
+        :param elapsed: 浮点数，本次定位耗时（秒）。
+        """
+        with self.lock:
+            stats = self.stats.setdefault(
+                name, {"resolves": 0, "css_hits": 0, "xpath_hits": 0, "misses": 0, "total_time": 0.0})
+            stats["resolves"] += 1
+            stats["total_time"] += elapsed
+            if strategy == "css":
+                stats["css_hits"] += 1
+            elif strategy == "xpath":
+                stats["xpath_hits"] += 1
+            else:
+                stats["misses"] += 1
+            if strategy:
+                self.preferred[name] = strategy
+
+    def spec(self, name):
+        """
+        :param name: 字符串，定位器名称。
+        :return: 传给页面内 resolveSelector 的字典，包含上次命中的策略。
+        """
+        selector = self.selectors[name]
+        with self.lock:
+            prefer = self.preferred.get(name)
+        return {"css": selector.css, "xpath": selector.xpath, "text": selector.text,
+                "text_mode": selector.text_mode, "prefer": prefer}
+
+    def load_cache(self, path=None):
+        """
+        读取上次运行保存的各定位器命中策略，使所有账号从第一次定位起就先尝试有效的策略。
+        定位器的 CSS 或 XPath 已被修改的条目会被忽略，修改后的定位器重新按默认顺序尝试。
+
+        :param path: 缓存文件路径，默认为 SELECTOR_CACHE_FILE。
+        """
+        path = path or SELECTOR_CACHE_FILE
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(cached, dict):
+            return
+        with self.lock:
+            for name, entry in cached.items():
+                selector = self.selectors.get(name)
+                if (selector is None or not isinstance(entry, dict) or entry.get("strategy") not in ("css", "xpath")
+                        or entry.get("css") != selector.css or entry.get("xpath") != selector.xpath):
+                    continue
+                self.preferred.setdefault(name, entry["strategy"])
+
+    def save_cache(self, path=None):
+        """
+        保存各定位器最近命中的策略（先写临时文件再替换，避免写入中断导致文件损坏）。
+
+        :param path: 缓存文件路径，默认为 SELECTOR_CACHE_FILE。
+        """
+        path = path or SELECTOR_CACHE_FILE
+        with self.lock:
+            cached = {name: {"strategy": strategy, "css": self.selectors[name].css,
+                             "xpath": self.selectors[name].xpath}
+                      for name, strategy in self.preferred.items()}
+        if not cached:
+            return
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(cached, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"⚠️ 保存定位器缓存失败: {e}")
+
+    def find_all(self, driver, name, context=None, mode="present"):
+        """
+        在一次 execute_script 调用中查找定位器匹配的所有元素。
+
+        :param driver: WebDriver 实例。
+        :param name: 字符串，定位器名称。
+        :param context: 在该元素内部查找，默认为整个页面。
+        :param mode: "present"（存在即可）、"visible"（可见）或 "clickable"（可见且未禁用）。
+        :return: 元素列表，按文档顺序排列。
+        """
+        start = time.perf_counter()
+        result = driver.execute_script(_RESOLVE_SELECTOR_JS, self.spec(name), context, mode) or {}
+        elements = result.get("elements") or []
+        self.record(name, result.get("strategy") if elements else None, time.perf_counter() - start)
+        return elements
+
+    def find(self, driver, name, context=None, mode="present"):
+        """
+        :return: 第一个匹配的元素，找不到时为 None。参数同 find_all。
+        """
+        elements = self.find_all(driver, name, context, mode)
+        return elements[0] if elements else None
+
+    def present(self, name, context=None):
+        """
+        :return: 可传给 wait.until 的条件：元素存在时返回该元素，否则返回 False。
+        """
+        return lambda driver: self.find(driver, name, context) or False
+
+    def visible(self, name, context=None):
+        """
+        :return: 可传给 wait.until 的条件：元素可见时返回该元素，否则返回 False。
+        """
+        return lambda driver: self.find(driver, name, context, "visible") or False
+
+    def clickable(self, name, context=None):
+        """
+        :return: 可传给 wait.until 的条件：元素可见且未禁用时返回该元素，否则返回 False。
+        """
+        return lambda driver: self.find(driver, name, context, "clickable") or False
+
+    def print_stats(self):
+        """
+        打印每个定位器的命中统计，并标出 CSS 快速路径失效或完全找不到元素的定位器。
+        """
+        with self.lock:
+            stats = {name: dict(value) for name, value in self.stats.items()}
+        if not stats:
+            return
+        print("\n--- 定位器命中统计 ---")
+        print(f"{'定位器':<24}{'次数':>6}{'CSS':>6}{'XPath':>7}{'未找到':>8}{'平均(ms)':>10}")
+        for name in sorted(stats):
+            value = stats[name]
+            average = value["total_time"] / value["resolves"] * 1000
+            flag = ""
+            if value["css_hits"] == 0 and value["xpath_hits"] == 0:
+                flag = "  ❌ 从未找到"
+            elif self.selectors[name].css and value["css_hits"] == 0:
+                flag = "  🟡 CSS 已失效，仅靠 XPath"
+            print(f"{name:<24}{value['resolves']:>6}{value['css_hits']:>6}{value['xpath_hits']:>7}"
+                  f"{value['misses']:>8}{average:>10.1f}{flag}")
+
+
+# 脚本用到的全部页面元素定位器。页面改版时优先修改这里。
+SELECTORS = SelectorRegistry({
+    # 积分页面：“每日簽到”任务行，以及行内的已签到 / 未签到图标
+    "check_in_row": Selector(
+        css="div[data-cname='index']", text="每日簽到",
+        xpath="//div[@data-cname='index' and .//div[contains(text(), '每日簽到')]]"),
+    "check_in_done_icon": Selector(
+        css="div[class*='icon-gift-true.png']",
+        xpath=".//div[contains(@class, 'icon-gift-true.png')]"),
+    "check_in_button": Selector(
+        css="div[class*='icon-gift.png']",
+        xpath=".//div[contains(@class, 'icon-gift.png')]"),
+    # 积分页面：展开全部任务的按钮，以及带进度（如 1/3）的任务行
+    "points_expand_button": Selector(
+        css="div[class*='btn-mask'][class*='cursor-pointer']:has(span[class*='rotate-180'])",
+        xpath="//div[contains(@class, 'btn-mask') and contains(@class, 'cursor-pointer')"
+              " and .//span[contains(@class, 'rotate-180')]]"),
+    "points_progress_row": Selector(
+        xpath="//div[contains(@class, 'justify-between') and .//div[contains(text(), '/')]]"),
+    # 帖子列表：卡片、卡片标题、点赞按钮，以及排序切换按钮
+    "post_card": Selector(
+        css="div[class*='card-item']",
+        xpath="//div[contains(@class, 'card-item')]"),
+    # 标题、点赞按钮和评论数也会以 context=帖子卡片 在卡片内部查找，因此 XPath 以 "." 开头
+    "post_title": Selector(
+        css="div[class*='card-item'] div[class*='font-bold'][class*='line-clamp-2']",
+        xpath=".//div[contains(@class, 'font-bold') and contains(@class, 'line-clamp-2')"
+              " and ancestor::div[contains(@class, 'card-item')]]"),
+    "like_button": Selector(
+        css="span[data-cname='like']",
+        xpath=".//span[@data-cname='like']"),
+    "comment_count": Selector(
+        css="span[data-cname='comment']",
+        xpath=".//span[@data-cname='comment']"),
+    # 已点赞状态：点赞按钮自身或其内部元素匹配时视为已点赞（仅在页面内与点赞按钮一起使用）。
+    # 该样式尚未在真实页面上确认；开启 LIKE_STATE_FROM_API 且接口返回了点赞状态时以接口为准
+    "like_button_liked": Selector(
+        css="[class*='liked']:not([class*='unliked']), [aria-pressed='true'], [data-liked='true']"),
+    "sort_hot_button": Selector(
+        css="button", text="熱門",
+        xpath="//button[contains(., '熱門')]"),
+    "sort_latest_option": Selector(
+        css="li", text="最新",
+        xpath="//li[contains(., '最新')]"),
+    # 帖子详情页：评论入口和评论面板。面板由唯一的“評論”标题和“發送”按钮确定，CSS 无法表达
+    "publish_view_button": Selector(
+        css="div", text="發佈我的看法", text_mode="own",
+        xpath="//div[contains(text(), '發佈我的看法')]"),
+    "comment_panel": Selector(
+        xpath="//div[.//div[text()='評論'] and .//span[text()='發送']]"),
+    # 评论面板内部（需传入 context=评论面板）：“最近”表情分类、表情和发送按钮
+    "recent_emoji_tab": Selector(
+        css=":scope div[class*='overflow-x-auto'] div[class*='cursor-pointer']",
+        xpath=".//div[contains(@class, 'overflow-x-auto')]//div[contains(@class, 'cursor-pointer')]"),
+    "emoji": Selector(
+        css=":scope div[class*='overflow-y-auto'][class*='flex-wrap'] div[class*='cursor-pointer']",
+        xpath=".//div[contains(@class, 'overflow-y-auto') and contains(@class, 'flex-wrap')]"
+              "//div[contains(@class, 'cursor-pointer')]"),
+    "send_button": Selector(
+        css="span", text="發送", text_mode="exact",
+        xpath=".//span[text()='發送']"),
+})
+
+
+def click_elements(driver, elements, interval=None):
+    """
+    在一次脚本调用中依次点击多个元素，点击之间的间隔在页面内完成，Python 线程只等待一次往返。
+
+    :param driver: WebDriver 实例。
+    :param elements: 要点击的网页元素列表。
+    :param interval: 两次点击之间的间隔（秒），为 None 时使用 MIN_DWELL，快速模式下为 0。
+    :return: 成功点击的元素数量。
+    """
+    if not elements:
+        return 0
+    if interval is None:
+        interval = MIN_DWELL
+    if FAST_MODE:
+        interval = 0
+    # 异步脚本的超时时间需要覆盖所有点击间隔，结束后恢复原来的设置
+    with script_timeout(driver, max(30, len(elements) * interval + 10)):
+        return driver.execute_async_script(
+            """
+            var elements = arguments[0], interval = arguments[1], done = arguments[arguments.length - 1];
+            var clicked = 0, index = 0;
+            function next() {
+                if (index >= elements.length) { done(clicked); return; }
+                try { elements[index].click(); clicked++; } catch (e) {}
+                index++;
+                if (index < elements.length && interval > 0) { setTimeout(next, interval); } else { next(); }
+            }
+            next();
+            """,
+            elements, int(interval * 1000))
+
+
+# 在页面内一次性取回帖子列表中每个帖子的卡片、点赞按钮、标题、链接和评论数。
+# 帖子 ID 先取帖子链接的 href（之后由 canonical_post_id 提取其中的 post_uuid），没有链接时退回到标题文本，
+# 此时任务改为点击标题进入帖子。卡片中的第一个链接可能是作者或头像链接，因此帖子链接取包含标题的链接，
+# 其次是卡片内第一个指向帖子（/post/ 路径或 post_uuid 参数）的链接。
+# 同时读取每个点赞按钮是否已处于“已点赞”状态，并可从第 start 个卡片开始，只取回滚动后新加载的帖子。
+# 卡片和卡片内各部分都通过 resolveSelector 定位（CSS 失效时退回 XPath），定位器规格来自 SELECTORS.spec；
+# 已点赞状态只有 CSS 定义，直接用 like_button_liked 的 CSS 判断。
+_IS_LIKED_JS = """
+function isLiked(like, likedCss) {
+    if (!like) { return false; }
+    try { return like.matches(likedCss) || !!like.querySelector(likedCss); } catch (e) { return false; }
+}
+"""
+_QUERY_POSTS_JS = _RESOLVE_SELECTOR_FN_JS + _IS_LIKED_JS + """
+var specs = arguments[0], likedCss = arguments[2];
+var found = resolveSelector(specs.card, document, 'present');
+var strategies = {card: found.strategy};
+function first(key, card) {
+    var result = resolveSelector(specs[key], card, 'present');
+    if (result.strategy && !strategies[key]) { strategies[key] = result.strategy; }
+    return result.elements[0] || null;
+}
+function postLink(card, title) {
+    var link = title ? title.closest('a[href]') : null;
+    if (link) { return link; }
+    var links = card.querySelectorAll('a[href]');
+    for (var i = 0; i < links.length; i++) {
+        if (/\\/post\\/|[?&]post_uuid=/.test(links[i].getAttribute('href'))) { return links[i]; }
+    }
+    return null;
+}
+var posts = found.elements.slice(arguments[1] || 0).map(function (card) {
+    var like = first('like', card);
+    var title = first('title', card);
+    var link = postLink(card, title);
+    var comment = first('comment', card);
+    var titleText = title ? (title.innerText || title.textContent || '').trim() : '';
+    var commentCount = comment ? (comment.textContent || '').match(/\\d+/) : null;
+    var likeCount = like ? (like.textContent || '').match(/\\d+/) : null;
+    return {element: card, like: like, liked: isLiked(like, likedCss), title: title, title_text: titleText,
+            likes: likeCount ? parseInt(likeCount[0], 10) : null,
+            url: link ? link.href : '', id: link ? link.getAttribute('href') : titleText,
+            comments: commentCount ? parseInt(commentCount[0], 10) : null};
+});
+return {posts: posts, strategies: strategies};
+"""
+
+# 读取一组点赞按钮上显示的点赞数，无法读取时为 null
+_LIKE_COUNTS_JS = """
+return arguments[0].map(function (like) {
+    var count = (like.textContent || '').match(/\\d+/);
+    return count ? parseInt(count[0], 10) : null;
+});
+"""
+
+# 统计帖子卡片数量；arguments[1] 为真时随后滚动到列表底部以触发加载更多帖子
+_SCROLL_FEED_JS = _RESOLVE_SELECTOR_FN_JS + """
+var count = resolveSelector(arguments[0], document, 'present').elements.length;
+if (arguments[1]) { window.scrollTo(0, document.documentElement.scrollHeight); }
+return count;
+"""
+
+
+def canonical_post_id(href):
+    """
+    从帖子链接中提取帖子的 post_uuid，使浏览器模式与 HTTP 接口模式记录的帖子 ID 一致。
+
+    依次尝试查询参数 post_uuid / uuid / id，以及路径的最后一段（例如 /post/<uuid>）。
+
+    :param href: 字符串，帖子链接（绝对或相对地址）。
+    :return: 字符串，帖子 ID；无法提取时原样返回 href。
+    """
+    parts = urlsplit(href)
+    query = parse_qs(parts.query)
+    for key in ("post_uuid", "uuid", "id"):
+        if query.get(key):
+            return query[key][0]
+    segments = [segment for segment in parts.path.split("/") if segment]
+    return segments[-1] if segments else href
+
+
+def query_posts(driver, start_index=0):
+    """
+    在一次 execute_script 调用中取回当前帖子列表中的所有帖子。
+
+    :param driver: WebDriver 实例。
+    :param start_index: 整数，从第几个卡片开始取回，用于滚动加载后只读取新出现的帖子。
+    :return: 字典列表，每项包含 "element"（卡片）、"like"（点赞按钮或 None）、"liked"（页面上是否显示为已点赞）、
+             "likes"（点赞数）、"title"（标题元素或 None）、"title_text"、"url"、"id"
+             和 "comments"（评论数，无法读取时为 None）。
+    """
+    start = time.perf_counter()
+    names = {"card": "post_card", "like": "like_button", "title": "post_title", "comment": "comment_count"}
+    result = driver.execute_script(_QUERY_POSTS_JS, {key: SELECTORS.spec(name) for key, name in names.items()},
+                                   start_index, SELECTORS.selectors["like_button_liked"].css) or {}
+    posts = result.get("posts") or []
+    for post in posts:
+        if post["url"]:
+            post["id"] = canonical_post_id(post["id"])
+    elapsed = time.perf_counter() - start
+    strategies = result.get("strategies") or {}
+    SELECTORS.record("post_card", strategies.get("card"), elapsed)
+    if posts:
+        for key in ("like", "title", "comment"):
+            SELECTORS.record(names[key], strategies.get(key), elapsed)
+    return posts
+
+
+def load_more_posts(driver, timeout=5):
+    """
+    滚动到帖子列表底部，等待新的帖子加载出来。
+
+    :param driver: WebDriver 实例。
+    :param timeout: 等待新帖子出现的最长时间（秒）。
+    :return: 整数，滚动前的卡片数量（即新帖子的起始下标）；没有加载出新帖子时为 None。
+    """
+    card_spec = SELECTORS.spec("post_card")
+    count = driver.execute_script(_SCROLL_FEED_JS, card_spec, True)
+    try:
+        make_wait(driver, timeout).until(lambda d: d.execute_script(_SCROLL_FEED_JS, card_spec, False) > count)
+    except TimeoutException:
+        return None
+    return count
+
+
+class FeedReader:
+    """
+    “前哨基地”帖子列表的增量读取器，同时维护一个帖子 ID → 帖子信息（标题、链接、点赞状态、评论数）的内存索引。
+
+    在 switch_to_latest_posts 之后创建，点赞、评论、浏览任务共用同一个实例：已读取过的帖子直接从索引中取用，
+    只有需要更多帖子时才读取新渲染的卡片，或向下滚动加载更多。离开列表页（进入帖子详情后返回）之后需调用
+    invalidate：索引中的帖子信息保留，元素引用在下次读取时更新。
+    """
+
+    def __init__(self, driver, max_scrolls=FEED_SCROLL_ROUNDS):
+        """
+        :param driver: WebDriver 实例，需位于帖子列表页。
+        :param max_scrolls: 整数，每次进入列表页后最多向下滚动加载的次数。
+        """
+        self.driver = driver
+        self.max_scrolls = max_scrolls
+        self.index = {}  # 帖子 ID -> 帖子字典（格式同 query_posts），按首次出现的顺序排列
+        self.api_liked = {}  # 帖子 ID -> 接口返回的点赞状态，见 sync_liked_states
+        self.invalidate()
+
+    def invalidate(self):
+        """列表页重新加载后调用：之前读取的元素引用全部失效，之后从头读取。"""
+        self.visible_ids = []  # 当前页面上已读取的帖子 ID，按列表顺序排列
+        self.visible_set = set()  # 与 visible_ids 相同，用于快速判断帖子是否已读取
+        self.scanned = 0  # 当前页面上已读取的卡片数量
+        self.scrolls = 0
+        self.exhausted = False
+
+    def _read_new(self):
+        """
+        读取当前页面上尚未读取的卡片，并更新索引。
+
+        :return: 列表，新出现的帖子字典。
+        """
+        posts = query_posts(self.driver, self.scanned)
+        self.scanned += len(posts)
+        fresh = []
+        for post in posts:
+            if post["id"] in self.visible_set:
+                continue
+            if post["id"] in self.api_liked:
+                post["liked"] = self.api_liked[post["id"]]
+            known = self.index.get(post["id"])
+            if known:
+                # 本次运行中点赞过的帖子，页面上的状态可能尚未刷新；已发送过评论的标记同样保留
+                post["liked"] = post["liked"] or known["liked"]
+                post["comment_sent"] = known.get("comment_sent", False)
+            self.index[post["id"]] = post
+            self.visible_ids.append(post["id"])
+            self.visible_set.add(post["id"])
+            fresh.append(post)
+        return fresh
+
+    def stream(self):
+        """
+        生成器：按列表顺序逐个产出当前页面上的帖子。先产出已读取的帖子，再读取新渲染的卡片，
+        仍不够时向下滚动加载更多。调用方取够所需数量后停止迭代即可，不会多读取或多滚动。
+        """
+        position = 0
+        while True:
+            while position < len(self.visible_ids):
+                yield self.index[self.visible_ids[position]]
+                position += 1
+            if self._read_new():
+                continue
+            if self.exhausted or self.scrolls >= self.max_scrolls:
+                return
+            self.scrolls += 1
+            if load_more_posts(self.driver) is None:
+                self.exhausted = True
+
+    def take(self, count, predicate=None):
+        """
+        :param count: 整数，需要的帖子数量。
+        :param predicate: 函数，接收帖子字典，返回是否选择该帖子。
+        :return: 列表，按列表顺序满足条件的前 count 个帖子。
+        """
+        if count <= 0:
+            return []
+        matches = (post for post in self.stream() if predicate is None or predicate(post))
+        return list(itertools.islice(matches, count))
+
+    def find(self, post_id):
+        """
+        :return: 当前页面上 ID 为 post_id 的帖子字典，找不到时为 None。
+        """
+        return next((post for post in self.stream() if post["id"] == post_id), None)
+
+    def visible_posts(self):
+        """:return: 列表，当前页面上已读取的帖子字典。"""
+        return [self.index[post_id] for post_id in self.visible_ids]
+
+    def sync_liked_states(self, states):
+        """
+        以接口返回的点赞状态覆盖页面上读取的状态，已读取和之后读取的帖子都会生效。
+        应在点击之前调用；之后点赞成功的帖子由 update 标记为已点赞。
+
+        :param states: 字典，帖子 ID → 是否已点赞。
+        """
+        self.api_liked.update(states)
+        for post_id, liked in states.items():
+            if post_id in self.index:
+                self.index[post_id]["liked"] = liked
+
+    def update(self, post_ids, **fields):
+        """
+        更新索引中帖子的信息，例如点赞成功后标记 liked=True。
+
+        :param post_ids: 帖子 ID 列表。
+        """
+        for post_id in post_ids:
+            if post_id in self.index:
+                self.index[post_id].update(fields)
+
+
+def server_day(now=None):
+    """
+    计算当前所属的“服务器日”，即按服务器时区和每日重置时刻划分的日期。
+
+    :param now: 带时区的 datetime，默认为当前时间。
+    :return: 字符串，格式为 YYYY-MM-DD。
+    """
+    now = now or datetime.now(timezone.utc)
+    server_time = now.astimezone(timezone(timedelta(hours=SERVER_UTC_OFFSET_HOURS)))
+    return (server_time - timedelta(hours=SERVER_RESET_HOUR)).strftime("%Y-%m-%d")
+
+
+class RunStateStore:
+    """
+    保存在本地 SQLite 中的运行状态，按账号和服务器日记录已完成的任务和已操作过的帖子。
+
+    脚本崩溃或重新运行时，可以据此跳过已完成的任务，并避免重复点赞（再次点击会取消点赞）。
+    同一个实例可以被多个线程共享。
+    """
+
+    def __init__(self, path=STATE_DB_PATH, retention_days=STATE_RETENTION_DAYS):
+        """
+        :param path: 字符串，SQLite 数据库文件路径。
+        :param retention_days: 整数，保留记录的天数。
+        """
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS completed_tasks ("
+                "account TEXT, day TEXT, task TEXT, completed_at REAL, PRIMARY KEY (account, day, task))")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS post_actions ("
+                "account TEXT, day TEXT, action TEXT, post_id TEXT, PRIMARY KEY (account, day, action, post_id))")
+        self.evict(retention_days)
+
+    def evict(self, retention_days=STATE_RETENTION_DAYS):
+        """删除早于保留天数的记录。"""
+        oldest_day = server_day(datetime.now(timezone.utc) - timedelta(days=retention_days))
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM completed_tasks WHERE day < ?", (oldest_day,))
+            self.conn.execute("DELETE FROM post_actions WHERE day < ?", (oldest_day,))
+
+    def mark_tasks_done(self, account, tasks, day=None):
+        """记录账号在某一天完成的任务。"""
+        day = day or server_day()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO completed_tasks VALUES (?, ?, ?, ?)",
+                [(account, day, task, time.time()) for task in tasks])
+
+    def completed_tasks(self, account, day=None):
+        """:return: 账号在某一天已完成的任务名称集合。"""
+        day = day or server_day()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT task FROM completed_tasks WHERE account = ? AND day = ?", (account, day)).fetchall()
+        return {row[0] for row in rows}
+
+    def record_posts(self, account, action, post_ids, day=None):
+        """记录账号在某一天对哪些帖子执行过某个操作（"like"、"comment" 或 "browse"）。"""
+        day = day or server_day()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO post_actions VALUES (?, ?, ?, ?)",
+                [(account, day, action, post_id) for post_id in post_ids])
+
+    def post_ids(self, account, action, day=None):
+        """:return: 账号在某一天已执行过某个操作的帖子 ID 集合。"""
+        day = day or server_day()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT post_id FROM post_actions WHERE account = ? AND day = ? AND action = ?",
+                (account, day, action)).fetchall()
+        return {row[0] for row in rows}
+
+
+_state_store = None
+_state_store_lock = threading.Lock()
+
+
+def get_state_store():
+    """
+    :return: 全局共享的 RunStateStore 实例，首次调用时创建。
+    """
+    global _state_store
+    with _state_store_lock:
+        if _state_store is None:
+            _state_store = RunStateStore(STATE_DB_PATH)
+        return _state_store
+
+
+def setup_driver(profile_path, browser_options=None):
     """
     配置并初始化 Chrome 浏览器驱动。
 
     该函数会设置 Chrome 的用户数据目录，使得浏览器可以加载指定的配置文件（如已登录的会话），
-    并添加了一些优化选项来启动浏览器。
+    并根据 BROWSER_OPTIONS 添加屏蔽资源、（可选的）无头等精简选项来启动浏览器，以降低内存占用并加快页面加载。
 
     :param profile_path: 字符串，Chrome 用户配置文件的路径。
+    :param browser_options: 字典，可选，用于覆盖 BROWSER_OPTIONS 中的部分选项。
     :return: 初始化后的 WebDriver 实例。
     """
     print("--- 正在启动浏览器 ---")
+    launch_options = dict(BROWSER_OPTIONS)
+    if browser_options:
+        launch_options.update(browser_options)
+
+    load_selenium()
     options = Options()
     # 使用指定的 Chrome 用户配置文件，这样可以免去登录过程
     options.add_argument(f"user-data-dir={profile_path}")
     # 以下选项有助于避免一些潜在问题
     options.add_argument("--disable-extensions")
-    options.add_argument("--start-maximized")
+
+    if launch_options.get("headless"):
+        options.add_argument("--headless=new")
+    if launch_options.get("window_size"):
+        width, height = launch_options["window_size"]
+        options.add_argument(f"--window-size={width},{height}")
+    else:
+        options.add_argument("--start-maximized")
+    if launch_options.get("disable_background_networking"):
+        options.add_argument("--disable-background-networking")
+    if launch_options.get("disable_gpu"):
+        options.add_argument("--disable-gpu")
+    if launch_options.get("block_images"):
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if launch_options.get("page_load_strategy"):
+        options.page_load_strategy = launch_options["page_load_strategy"]
+    for argument in launch_options.get("extra_arguments") or []:
+        options.add_argument(argument)
+    if NETWORK_WAITS:
+        # 只记录网络事件，供 NetworkMonitor 读取
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
 
     driver = webdriver.Chrome(options=options)
+
+    if launch_options.get("block_media"):
+        try:
+            # 通过 CDP 在网络层屏蔽音视频和字体请求
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"🟡 设置资源屏蔽规则失败，将加载全部资源: {e}")
+
     print("浏览器启动成功。")
     return driver
 
 
+def load_session(driver, cookies):
+    """
+    将浏览器切换到另一个账号的会话：清空所有 Cookie 和站点存储，再写入该账号的 Cookie。
+
+    通过 CDP 一次性完成，不需要先导航到站点页面。
+
+    :param driver: WebDriver 实例。
+    :param cookies: Cookie 字典列表，格式与 driver.get_cookies() 的返回值相同。
+    """
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+        "origin": SITE_BASE_URL,
+        "storageTypes": "local_storage,session_storage,indexeddb,cache_storage,service_workers",
+    })
+    cdp_cookies = []
+    for cookie in cookies:
+        cdp_cookie = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly")
+                      if key in cookie}
+        if "expiry" in cookie:
+            cdp_cookie["expires"] = cookie["expiry"]
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            cdp_cookie["sameSite"] = cookie["sameSite"]
+        cdp_cookies.append(cdp_cookie)
+    driver.execute_cdp_cmd("Network.setCookies", {"cookies": cdp_cookies})
+
+
+class DriverPool:
+    """
+    常驻浏览器池。每个浏览器使用独立的临时配置目录，在多个账号之间复用，切换账号时通过 load_session 替换会话。
+
+    浏览器在第一次被取用时才启动，数量不超过 size。
+    """
+
+    def __init__(self, size, browser_options=None):
+        """
+        :param size: 整数，浏览器数量上限，通常与工作线程数相同。
+        :param browser_options: 字典，传给 setup_driver 的启动选项。
+        """
+        self.size = size
+        self.browser_options = browser_options
+        # 空闲的浏览器和已启动的数量都由 condition 保护；归还或回收浏览器时唤醒等待的线程
+        self.condition = threading.Condition()
+        self.idle = []
+        self.launched = 0
+        self.profile_dirs = {}
+
+    def acquire(self):
+        """
+        :return: 一个空闲的浏览器，没有空闲浏览器且未达到上限时启动一个新的。
+                 两者都不满足时等待，直到有浏览器被归还，或故障浏览器被回收后腾出启动名额。
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.idle or self.launched < self.size)
+            if self.idle:
+                return self.idle.pop()
+            self.launched += 1
+        try:
+            profile_dir = tempfile.mkdtemp(prefix="autocheckin-pool-")
+            driver = setup_driver(profile_dir, self.browser_options)
+        except Exception:
+            with self.condition:
+                self.launched -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.profile_dirs[id(driver)] = profile_dir
+        return driver
+
+    def release(self, driver, broken=False):
+        """
+        归还浏览器。浏览器出现故障时将其关闭，之后按需重新启动。
+
+        :param driver: WebDriver 实例。
+        :param broken: 布尔值，浏览器是否已不可用。
+        """
+        if broken:
+            self._discard(driver)
+            return
+        with self.condition:
+            self.idle.append(driver)
+            self.condition.notify()
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self.condition:
+            profile_dir = self.profile_dirs.pop(id(driver), "")
+            self.launched -= 1
+            self.condition.notify()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def close(self):
+        """关闭池中所有空闲的浏览器。"""
+        with self.condition:
+            drivers, self.idle = self.idle, []
+        for driver in drivers:
+            self._discard(driver)
+
+
+class ResourceGovernor:
+    """
+    根据本机的可用内存和 CPU 决定何时允许新的浏览器会话开始。
+
+    每个浏览器会话开始前调用 acquire：只有可用内存在扣除 GOVERNOR_MEMORY_RESERVE_MB 后还能容纳一个浏览器、
+    且系统 CPU 占用不超过 GOVERNOR_CPU_LIMIT 时才放行，否则等待其他会话结束。没有正在运行的会话时总是放行。
+    会话结束时调用 release，测量该浏览器（chromedriver 及其全部子进程）的内存和 CPU 占用，
+    作为之后放行判断和容量估计的依据；内存超过 BROWSER_MEMORY_CEILING_MB 时提示调用方回收该浏览器。
+    未安装 psutil 或未开启 GOVERNOR_ENABLED 时只做计数，不做限制。同一个实例可以被多个线程共享。
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.active = 0  # 已放行、尚未结束的会话数
+        self.launching = 0  # 已放行、浏览器尚未启动完成的会话数，它们的内存还没有体现在可用内存中
+        self.admitted = 0  # 累计放行的会话数，acquire 据此判断锁外的测量期间是否有其他会话被放行
+        self.memory_samples = []  # 每个会话结束时浏览器的内存占用（MB）
+        self.cpu_samples = []  # 每个会话期间浏览器平均占用的 CPU 核数
+        self.session_times = []  # 每个会话的耗时（秒）
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # 建立 CPU 占用的采样基准
+
+    @staticmethod
+    def measure(driver):
+        """
+        :param driver: WebDriver 实例。
+        :return: (内存 MB, 累计 CPU 秒数)；无法测量时为 None。
+        """
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return None
+        rss = cpu = 0.0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system
+            except psutil.Error:
+                pass
+        return rss / 2 ** 20, cpu
+
+    def browser_mb(self):
+        """:return: 单个浏览器的预计内存占用（MB），取已测量会话的中位数。"""
+        with self.condition:
+            samples = list(self.memory_samples)
+        return statistics.median(samples) if samples else GOVERNOR_DEFAULT_BROWSER_MB
+
+    @staticmethod
+    def _headroom(active, launching, samples):
+        """
+        测量本机资源，判断能否再放行一个会话。调用方不应持有 condition：
+        psutil 的测量需要读取系统信息，持锁测量会阻塞其他线程的 launched 和 release。
+
+        :param active: 整数，已放行、尚未结束的会话数。
+        :param launching: 整数，已放行、浏览器尚未启动完成的会话数。
+        :param samples: 列表，已测量的浏览器内存占用（MB）。
+        :return: (是否放行, 不放行的原因)。
+        """
+        if not GOVERNOR_ENABLED or psutil is None or active == 0:
+            return True, ""
+        available_mb = psutil.virtual_memory().available / 2 ** 20
+        browser_mb = statistics.median(samples) if samples else GOVERNOR_DEFAULT_BROWSER_MB
+        needed_mb = browser_mb * (1 + launching) + GOVERNOR_MEMORY_RESERVE_MB
+        if available_mb < needed_mb:
+            return False, f"可用内存 {available_mb:.0f} MB，需要 {needed_mb:.0f} MB"
+        cpu = psutil.cpu_percent(interval=None)
+        if cpu > GOVERNOR_CPU_LIMIT:
+            return False, f"CPU 占用 {cpu:.0f}% 超过 {GOVERNOR_CPU_LIMIT}%"
+        return True, ""
+
+    def acquire(self, name):
+        """
+        等待资源允许后放行一个新的浏览器会话。
+
+        :param name: 字符串，账号名称，用于日志。
+        :return: 会话字典，之后传给 launched 和 release。
+        """
+        reported = False
+        while True:
+            with self.condition:
+                admitted = self.admitted
+                counts = (self.active, self.launching, list(self.memory_samples))
+            # 在锁外测量；测量期间其他线程放行了新的会话时，测量结果已过时，需要重新测量
+            ok, reason = self._headroom(*counts)
+            with self.condition:
+                if ok and self.admitted == admitted:
+                    self.admitted += 1
+                    self.active += 1
+                    self.launching += 1
+                    break
+                if ok:
+                    continue
+                if not reported:
+                    print(f"⏳ 账号 {name} 等待资源释放（{reason}）...")
+                    reported = True
+                self.condition.wait(GOVERNOR_ADMIT_INTERVAL)
+        return {"name": name, "start": time.time(), "launched": False, "cpu_start": None}
+
+    def launched(self, session, driver):
+        """
+        浏览器启动完成后调用，此后它的内存已体现在系统的可用内存中。
+
+        :param session: acquire 返回的会话字典。
+        :param driver: WebDriver 实例。
+        """
+        usage = self.measure(driver)
+        with self.condition:
+            if not session["launched"]:
+                session["launched"] = True
+                self.launching -= 1
+            session["cpu_start"] = usage[1] if usage else None
+            session["launch_time"] = time.time()
+            self.condition.notify_all()
+
+    def release(self, session, driver=None):
+        """
+        会话结束时调用（应在关闭浏览器之前），记录浏览器的资源占用并放行等待中的会话。
+
+        :param session: acquire 返回的会话字典。
+        :param driver: WebDriver 实例，浏览器未能启动时为 None。
+        :return: 布尔值，浏览器内存超过 BROWSER_MEMORY_CEILING_MB、应当回收时为 True。
+        """
+        usage = self.measure(driver) if driver is not None else None
+        over_ceiling = False
+        with self.condition:
+            self.active -= 1
+            if not session["launched"]:
+                self.launching -= 1
+            if usage:
+                memory_mb, cpu_seconds = usage
+                self.memory_samples.append(memory_mb)
+                over_ceiling = memory_mb > BROWSER_MEMORY_CEILING_MB
+                elapsed = time.time() - session.get("launch_time", session["start"])
+                if session["cpu_start"] is not None and elapsed > 0:
+                    self.cpu_samples.append((cpu_seconds - session["cpu_start"]) / elapsed)
+            self.session_times.append(time.time() - session["start"])
+            self.condition.notify_all()
+        if over_ceiling:
+            print(f"🟡 账号 {session['name']} 的浏览器占用 {usage[0]:.0f} MB，超过上限 {BROWSER_MEMORY_CEILING_MB} MB，将被回收。")
+        return over_ceiling
+
+    def capacity(self):
+        """
+        根据已测量的会话估计本机的处理能力。
+
+        :return: 字典，包含 "concurrency"（可同时运行的浏览器数）、"limited_by"、"accounts_per_hour"、
+                 "browser_mb" 和 "browser_cpu"（每个浏览器平均占用的 CPU 核数）；未安装 psutil 或尚无样本时为 None。
+        """
+        with self.condition:
+            if psutil is None or not self.memory_samples:
+                return None
+            browser_mb = statistics.median(self.memory_samples)
+            browser_cpu = statistics.median(self.cpu_samples) if self.cpu_samples else 0.0
+            session_time = statistics.median(self.session_times)
+            active = self.active
+        memory_mb = psutil.virtual_memory().available / 2 ** 20 + active * browser_mb - GOVERNOR_MEMORY_RESERVE_MB
+        by_memory = memory_mb / browser_mb
+        by_cpu = (psutil.cpu_count() or 1) * GOVERNOR_CPU_LIMIT / 100 / browser_cpu if browser_cpu > 0 else float("inf")
+        concurrency = max(1, int(min(by_memory, by_cpu)))
+        return {
+            "concurrency": concurrency,
+            "limited_by": "memory" if by_memory <= by_cpu else "cpu",
+            "accounts_per_hour": concurrency * 3600 / session_time if session_time > 0 else None,
+            "browser_mb": round(browser_mb, 1),
+            "browser_cpu": round(browser_cpu, 2),
+        }
+
+    def print_capacity(self):
+        """打印容量估计。"""
+        estimate = self.capacity()
+        if not estimate:
+            return
+        limited_by = "内存" if estimate["limited_by"] == "memory" else "CPU"
+        line = (f"\n--- 资源估计：每个浏览器约 {estimate['browser_mb']:.0f} MB、{estimate['browser_cpu']:.2f} 个 CPU 核，"
+                f"本机最多可同时运行 {estimate['concurrency']} 个（受{limited_by}限制）")
+        if estimate["accounts_per_hour"]:
+            line += f"，约每小时 {estimate['accounts_per_hour']:.0f} 个账号"
+        print(line + " ---")
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_governor():
+    """
+    :return: 全局共享的 ResourceGovernor 实例，首次调用时创建。
+    """
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = ResourceGovernor()
+        return _governor
+
+
+class NetworkMonitor:
+    """
+    通过 Chrome 的性能日志（goog:loggingPrefs）观察页面发出的后端接口请求。
+
+    任务在点击按钮后等待对应接口（签到、点赞、评论、列表刷新）的响应，而不是轮询 DOM 的变化，
+    既能在响应到达时立即继续，也能根据 HTTP 状态码和接口返回的 code 准确判断操作是否成功。
+    性能日志只能读取一次，因此每个浏览器只应有一个 NetworkMonitor，由 attach_network_monitor 创建。
+    """
+
+    def __init__(self, driver):
+        """
+        :param driver: WebDriver 实例，需由开启了 NETWORK_WAITS 的 setup_driver 启动。
+        """
+        self.driver = driver
+        self.requests = []  # 按发出顺序排列的接口请求
+        self.by_id = {}
+        # 额外的事件监听函数 listener(method, params)，收到每一条网络事件（不限于关注的接口）时调用，
+        # 供需要完整网络记录的工具使用（见 replay.py）
+        self.listeners = []
+        # 清空此前积累的日志（浏览器池中的浏览器可能刚为其他账号服务过）
+        self.driver.get_log("performance")
+
+    @staticmethod
+    def endpoint_for(url):
+        """
+        :param url: 字符串，请求地址。
+        :return: API_ENDPOINTS 中匹配的键名，不是关注的接口时为 None。
+        """
+        for name, path in API_ENDPOINTS.items():
+            if path in url:
+                return name
+        return None
+
+    def poll(self):
+        """读取新的性能日志，记录关注的接口请求的发出、响应和结束。"""
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            for listener in self.listeners:
+                listener(method, params)
+            if method == "Network.requestWillBeSent":
+                endpoint = self.endpoint_for(params.get("request", {}).get("url", ""))
+                if endpoint and params.get("request", {}).get("method") != "OPTIONS":
+                    request = {"endpoint": endpoint, "request_id": params["requestId"], "status": None,
+                               "finished": False, "failed": False}
+                    self.requests.append(request)
+                    self.by_id[params["requestId"]] = request
+            elif params.get("requestId") in self.by_id:
+                request = self.by_id[params["requestId"]]
+                if method == "Network.responseReceived":
+                    request["status"] = params["response"]["status"]
+                elif method == "Network.loadingFinished":
+                    request["finished"] = True
+                elif method == "Network.loadingFailed":
+                    request["finished"] = request["failed"] = True
+
+    def mark(self):
+        """
+        :return: 当前的日志位置，之后通过 wait_for 只等待此后发出的请求。
+        """
+        self.poll()
+        return len(self.requests)
+
+    def wait_for(self, wait, endpoint, since, count=1):
+        """
+        等待指定接口在 since 之后发出的 count 个请求全部结束。
+
+        :param wait: WebDriverWait 实例。
+        :param endpoint: 字符串，API_ENDPOINTS 中的键名。
+        :param since: mark 返回的日志位置。
+        :param count: 整数，需要等待的请求数量。
+        :return: 请求字典列表（按发出顺序），每项包含 "status"、"failed" 等字段。
+        :raises TimeoutException: 超时仍未等到足够的请求结束时抛出。
+        """
+        if count <= 0:
+            return []
+
+        def finished(_):
+            matched = self.matching(endpoint, since)
+            return len(matched) >= count and all(r["finished"] for r in matched[:count]) and matched[:count]
+
+        return wait.until(finished)
+
+    def matching(self, endpoint, since):
+        """
+        :return: since 之后发出的、属于指定接口的请求字典列表。
+        """
+        self.poll()
+        return [r for r in self.requests[since:] if r["endpoint"] == endpoint]
+
+    def outcomes(self, wait, endpoint, since, count=1):
+        """
+        等待请求结束并逐个判断是否成功。超时时，已结束的请求照常判断，其余视为失败。
+
+        :return: 布尔值列表，长度为 count，按请求发出顺序排列；
+                 NETWORK_REQUEST_GRACE 秒内没有出现任何匹配的请求时为 None
+                 （接口路径与站点不符或操作未触发请求），由调用方退回页面元素判断。
+        """
+        if count <= 0:
+            return []
+        try:
+            make_wait(self.driver, NETWORK_REQUEST_GRACE).until(lambda _: self.matching(endpoint, since))
+        except TimeoutException:
+            print(f"🟡 未观察到接口 {endpoint} 的请求，改用页面元素判断。")
+            return None
+        try:
+            requests = self.wait_for(wait, endpoint, since, count)
+        except TimeoutException:
+            print(f"🟡 等待接口 {endpoint} 的响应超时。")
+            requests = [r for r in self.requests[since:] if r["endpoint"] == endpoint and r["finished"]][:count]
+        results = [self.succeeded(request) for request in requests]
+        return results + [False] * (count - len(results))
+
+    def succeeded(self, request):
+        """
+        判断一个接口请求是否成功：HTTP 状态码为 200，且响应体中的 code 为 0（与 ApiClient.call 的判断一致）。
+
+        :param request: wait_for 返回的请求字典。
+        :return: 布尔值。
+        """
+        if request["failed"] or request["status"] != 200:
+            return False
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request["request_id"]})
+            return json.loads(body.get("body") or "{}").get("code", 0) == 0
+        except Exception:
+            # 响应体已被浏览器释放或不是 JSON 时，只能以状态码为准
+            return True
+
+
+def attach_network_monitor(driver):
+    """
+    为 driver 创建 NetworkMonitor，并保存为 driver.network_monitor。
+
+    :param driver: WebDriver 实例。
+    :return: NetworkMonitor 实例；未开启 NETWORK_WAITS 或浏览器不支持性能日志时为 None，任务退回 DOM 等待。
+    """
+    monitor = None
+    if NETWORK_WAITS:
+        try:
+            monitor = NetworkMonitor(driver)
+        except Exception as e:
+            print(f"🟡 无法读取浏览器性能日志，将使用页面元素等待: {e}")
+    driver.network_monitor = monitor
+    return monitor
+
+
+def network_monitor(driver):
+    """
+    :return: driver 上的 NetworkMonitor，没有时为 None。
+    """
+    return getattr(driver, "network_monitor", None)
+
+
+def network_mark(driver):
+    """
+    在触发接口请求的操作之前调用，记录当前的日志位置。
+
+    :return: 日志位置；没有 NetworkMonitor 时为 None。
+    """
+    monitor = network_monitor(driver)
+    return monitor.mark() if monitor else None
+
+
+def network_outcomes(driver, wait, endpoint, since, count=1):
+    """
+    等待 network_mark 之后发出的接口请求结束，并判断是否成功。
+
+    :return: 布尔值列表（见 NetworkMonitor.outcomes）；没有 NetworkMonitor 或未观察到对应的请求时为 None，
+             由调用方退回 DOM 等待。
+    """
+    monitor = network_monitor(driver)
+    if monitor is None or since is None:
+        return None
+    return monitor.outcomes(wait, endpoint, since, count)
+
+
+@timed_task
 def daily_check_in(driver, wait):
     """
     智能判断签到状态并执行相应操作。
-    - 使用高精度XPath，避免與其他任務混淆。
+    - 使用 SELECTORS 中的高精度定位器，避免與其他任務混淆。
     - V3版：根據回饋，直接點擊icon-gift.png圖標元素，而非其父容器。
+
+    :return: 布尔值，今日已签到或签到成功时为 True。
     """
-    time.sleep(2)
     print("\n--- 开始检查“每日签到”状态 ---")
+    success = False
     try:
-        # 1. 檢查“已完成”圖標是否存在。此邏輯保持不變，因為它已經很精確。
-        #    XPath含義: 在'每日簽到'所在的任務行中，尋找class包含 'icon-gift-true.png' 的div。
-        already_checked_in_icon_locator = (
-            By.XPATH,
-            "//div[@data-cname='index' and .//div[contains(text(), '每日簽到')]]//div[contains(@class, 'icon-gift-true.png')]"
-        )
+        # 0. 等待“每日簽到”任务行渲染完成，代替固定的等待时间
+        check_in_row = wait.until(SELECTORS.present("check_in_row"))
 
-        already_checked_in_elements = driver.find_elements(*already_checked_in_icon_locator)
+        # 1. 檢查“已完成”圖標是否存在。此邏輯保持不變，因為它已經很精確。
+        #    含義: 在'每日簽到'所在的任務行中，尋找class包含 'icon-gift-true.png' 的div。
+        already_checked_in_elements = SELECTORS.find_all(driver, "check_in_done_icon", check_in_row)
 
         # 2. 根據是否找到“已签到”圖標來執行不同邏輯
         if len(already_checked_in_elements) > 0:
             print("✅ 检测到 'icon-gift-true.png'，今日已签到，无需重复操作。")
             highlight_element(driver, already_checked_in_elements[0])
-            return
+            return True
         else:
             print("检测到 'icon-gift.png' 或未找到完成圖標，准备执行签到操作...")
 
-            # 3. 【核心修改】構造一個XPath，直接指向“每日簽到”這一行中需要點擊的 “未完成” 圖標div。
-            #    XPath含義：在'每日簽到'所在的任務行(div[@data-cname='index'])中，
+            # 3. 【核心修改】直接指向“每日簽到”這一行中需要點擊的 “未完成” 圖標div。
+            #    含義：在'每日簽到'所在的任務行(div[data-cname='index'])中，
             #    找到那個class屬性包含 'icon-gift.png' 的div元素。
-            button_to_click_locator = (
-                By.XPATH,
-                "//div[@data-cname='index' and .//div[contains(text(), '每日簽到')]]//div[contains(@class, 'icon-gift.png')]"
-            )
-
             # 等待這個具體的圖標元素變為可點擊狀態
-            confirmElement = wait.until(
-                EC.element_to_be_clickable(button_to_click_locator)
-            )
+            confirmElement = wait.until(SELECTORS.clickable("check_in_button", check_in_row))
 
             highlight_element(driver, confirmElement)
+            since = network_mark(driver)
             driver.execute_script("arguments[0].click();", confirmElement)
             print("成功点击签到图标 (icon-gift.png)。")
+            # 有网络监控时，以签到接口的响应判断是否成功
+            outcomes = network_outcomes(driver, wait, "check_in", since)
+            success = outcomes is None or outcomes[0]
+            if not success:
+                print("❌ 签到接口返回失败。")
 
     except TimeoutException:
         print("❌ 页面上未找到“每日签到”功能区或其相关按钮，跳过此任务。")
     except Exception as e:
         print(f"❌ 执行“每日签到”检查时出现意外错误: {e}")
 
-    time.sleep(TIMESLEEP)
+    pace()
+    return success
 
 
+@timed_task
 def navigate_to_outpost(driver, wait):
     """
     导航到“前哨基地”。
 
     :param driver: WebDriver 实例。
     :param wait: WebDriverWait 实例。
-    :return: None
+    :return: 布尔值，导航成功时为 True。
     """
     print("\n--- 开始导航至“前哨基地” ---")
+    success = False
 
     try:
-        navigate_to_outpost_url = "https://www.blablalink.com/?plate_type=outpost"
+        navigate_to_outpost_url = OUTPOST_URL
         driver.get(navigate_to_outpost_url)
+        # 等待帖子列表出现，确认页面已可操作
+        wait.until(SELECTORS.present("post_card"))
         print(f"成功导航到前哨基地")
+        success = True
     except Exception as e:
         print(f"执行“导航到前哨基地”出现意外错误: {e}")
 
-    time.sleep(TIMESLEEP)
+    pace()
+    return success
 
 
+@timed_task
 def switch_to_latest_posts(driver, wait):
     """
     将帖子列表从默认排序“热门”切换到“最新”排序。
     此版本使用文本内容定位，增强了脚本的稳定性。
+
+    :return: 布尔值，切换成功时为 True。
     """
     print("\n--- 开始切换帖子排序为“最新” ---")
+    success = False
 
-    post_xpath = "//div[contains(@class, 'card-item')]"
     try:
         # 记录切换前的第一个帖子元素，用于后续判断列表是否已刷新
         try:
-            first_post_before_click = wait.until(EC.presence_of_element_located((By.XPATH, post_xpath)))
+            first_post_before_click = wait.until(SELECTORS.present("post_card"))
         except TimeoutException:
             first_post_before_click = None
             print("切换前未能定位到帖子，将仅执行切换操作。")
 
         # 1. 定位“热门”按钮：通过其包含的文本“熱門”来查找。
-        #    这个XPath寻找一个<button>元素，其内部任何位置(.)包含了文本'熱門'。
-        hot_button_xpath = "//button[contains(., '熱門')]"
-        hot_button = wait.until(EC.element_to_be_clickable((By.XPATH, hot_button_xpath)))
+        #    这个定位器寻找一个<button>元素，其内部任何位置包含了文本'熱門'。
+        hot_button = wait.until(SELECTORS.clickable("sort_hot_button"))
         highlight_element(driver, hot_button)  # 高亮点击的元素
         hot_button.click()
         print("成功点击排序方式按钮（通过文本'熱門'定位）。")
 
         # 2. 在弹出的列表中选择“最新”。
-        #    这个XPath寻找一个<li>元素（列表项），其内部任何位置包含了文本'最新'。
-        latest_button_xpath = "//li[contains(., '最新')]"
-        latest_button = wait.until(
-            EC.element_to_be_clickable((By.XPATH, latest_button_xpath))
-        )
+        #    这个定位器寻找一个<li>元素（列表项），其内部任何位置包含了文本'最新'。
+        latest_button = wait.until(SELECTORS.clickable("sort_latest_option"))
         highlight_element(driver, latest_button)  # 高亮点击的元素
+        since = network_mark(driver)
         latest_button.click()
         print("成功点击切换为“最新”排序（通过文本'最新'定位）。")
 
+        # 有网络监控时先等待列表接口返回：失败时无需再等待列表刷新；成功时列表随即重新渲染
+        outcomes = network_outcomes(driver, wait, "post_list", since)
+        if outcomes is not None and not outcomes[0]:
+            print("❌ 帖子列表接口返回失败，未能切换为“最新”。")
+            pace()
+            return success
+
         # 等待列表刷新
         if first_post_before_click:
             print("等待帖子列表刷新...")
             wait.until(EC.staleness_of(first_post_before_click))
 
         # 确认新列表已加载
-        wait.until(EC.presence_of_element_located((By.XPATH, post_xpath)))
+        wait.until(SELECTORS.present("post_card"))
         print("帖子列表已成功刷新为“最新”。")
+        success = True
 
     except TimeoutException as e:
         print(f"❌ 切换到“最新”帖子时超时: 可能是未能找到'熱門'或'最新'按钮。错误: {e}")
     except Exception as e:
         print(f"❌ 切换到“最新”帖子时出现意外错误: {e}")
-    time.sleep(TIMESLEEP)
+    pace()
+    return success
 
 
-def like_posts(driver, wait, num_to_like=5):
+def _like_count_changes(driver, targets, timeout=None):
     """
-    对帖子列表中的前 N 个帖子执行点赞操作。
-    此版本经过审查，确认XPath稳定，并增加了高亮显示功能。
+    一次验证：等待被点击帖子的点赞数发生变化。点赞数随点击更新，不依赖尚未在真实页面上确认的已点赞样式。
 
-    :param driver: WebDriver 实例。
-    :param wait: WebDriverWait 实例。
-    :param num_to_like: 整数，希望点赞的帖子数量。
-    :return: None
+    :param targets: 已点击的帖子字典列表，"likes" 为点击前的点赞数。
+    :param timeout: 最多等待的秒数，默认为 LIKE_COUNT_TIMEOUT；能读取点赞数的帖子都已变化时立即返回。
+    :return: 列表，与 targets 一一对应：点赞数增加为 1、减少为 -1、未变化为 0，点击前后读不到点赞数时为 None。
     """
-    print(f"\n--- 开始执行“点赞”任务（目标：{num_to_like}个） ---")
-    # 这个XPath非常稳定，因为它依赖于一个专门用于标识的 data-cname 属性
-    like_button_xpath = "//span[@data-cname='like']"
-    post_xpath = "//div[contains(@class, 'card-item')]"
+    buttons = [post["like"] for post in targets]
+    changes = [None] * len(targets)
+
+    def all_changed(d):
+        counts = d.execute_script(_LIKE_COUNTS_JS, buttons) or []
+        changes[:] = [None if post.get("likes") is None or after is None
+                      else (after > post["likes"]) - (after < post["likes"])
+                      for post, after in zip(targets, counts)]
+        return 0 not in changes
 
     try:
-        # 等待帖子列表加载完成
-        wait.until(EC.presence_of_element_located((By.XPATH, post_xpath)))
+        make_wait(driver, LIKE_COUNT_TIMEOUT if timeout is None else timeout).until(all_changed)
+    except TimeoutException:
+        pass
+    return changes
 
-        # 查找所有点赞按钮
-        initial_likes = wait.until(EC.presence_of_all_elements_located((By.XPATH, like_button_xpath)))
 
-        # 确定实际要点击的数量
-        num_to_click = min(num_to_like, len(initial_likes))
+def fetch_liked_states(driver, limit):
+    """
+    点击之前通过帖子列表接口读取“前哨基地”最新帖子的点赞状态，使用浏览器当前会话的 Cookie。
 
-        if num_to_click == 0:
-            print("页面上没有找到可点赞的按钮。")
-            return  # 提前返回，避免不必要的循环
+    :param driver: WebDriver 实例。
+    :param limit: 整数，读取的帖子数量。
+    :return: 字典，帖子 ID → 是否已点赞；只包含接口确实返回了点赞状态的帖子，
+             接口不可用时为空字典，调用方沿用页面上的状态。
+    """
+    try:
+        client = ApiClient(driver.get_cookies(), timeout=LIKE_STATE_API_TIMEOUT, retries=0)
+        return {post["id"]: post["liked"] for post in client.list_posts(limit) if post["liked"] is not None}
+    except Exception as e:
+        print(f"🟡 无法通过接口读取点赞状态，沿用页面上的状态: {e}")
+        return {}
 
-        print(f"找到了 {len(initial_likes)} 个点赞按钮，准备点击其中的 {num_to_click} 个。")
 
-        liked_count = 0
-        for i in range(num_to_click):
-            try:
-                # 每次循环重新查找所有按钮，这是避免 StaleElementReferenceException 的好习惯
-                all_like_buttons = wait.until(EC.presence_of_all_elements_located((By.XPATH, like_button_xpath)))
+def _restore_unliked(driver, targets, changes):
+    """
+    点赞数方向检查：点击后点赞数比点击前少，说明该帖子原本已点赞、这次点击取消了点赞，再点击一次恢复。
 
-                if i >= len(all_like_buttons):
-                    print(f"无法找到第 {i + 1} 个点赞按钮，可能列表已刷新或数量不足。")
-                    break
+    :param targets: 已点击的帖子字典列表。
+    :param changes: _like_count_changes 返回的点赞数变化列表。
+    :return: 列表，恢复了点赞的帖子 ID，这些帖子不计入本次点赞。
+    """
+    undone = [post for post, change in zip(targets, changes) if change == -1]
+    if undone:
+        print(f"🟡 {len(undone)} 个帖子的点赞数在点击后减少（原本已点赞），再次点击以恢复点赞。")
+        click_elements(driver, [post["like"] for post in undone])
+    return [post["id"] for post in undone]
 
-                button_to_click = all_like_buttons[i]
 
-                # --- 新增代码：高亮将要点击的元素 ---
-                highlight_element(driver, button_to_click)
-                # 使用 JavaScript 点击，可以避免元素被遮挡等问题
-                driver.execute_script("arguments[0].click();", button_to_click)
-                print(f"成功点击第 {i + 1} 个点赞按钮。")
-                liked_count += 1
+@timed_task
+def like_posts(driver, wait, num_to_like=5, skip_post_ids=(), feed=None):
+    """
+    对帖子列表中尚未点赞的前 N 个帖子执行点赞操作。
+    此版本经过审查，确认定位器稳定，并增加了高亮显示功能。
+
+    已点赞的帖子再次点击会取消点赞，因此从 FeedReader 的索引中只选择未点赞的帖子；
+    当前列表中不足 N 个时由 FeedReader 向下滚动加载更多。
+    开启 LIKE_STATE_FROM_API 时，点击前先以帖子列表接口返回的点赞状态为准。
+    全部点击在一次脚本调用中完成，之后只做一次验证，确认各帖子的点赞数已增加；
+    点赞数在点击后减少的帖子说明原本已点赞，会再点击一次恢复。
 
-                time.sleep(0.5)  # 等待0.5秒，让点赞操作生效，也避免操作过快
+    :param driver: WebDriver 实例。
+    :param wait: WebDriverWait 实例。
+    :param num_to_like: 整数，希望点赞的帖子数量。
+    :param skip_post_ids: 今日已经点赞过的帖子 ID，再次点击会取消点赞，因此跳过。
+    :param feed: FeedReader 实例，与其他任务共用；为 None 时新建一个。
+    :return: 列表，本次成功点赞的帖子 ID。
+    """
+    print(f"\n--- 开始执行“点赞”任务（目标：{num_to_like}个） ---")
+    liked_post_ids = []
+    if num_to_like <= 0:
+        return liked_post_ids
 
-            except StaleElementReferenceException:
-                print(f"🟡 点击第 {i + 1} 个点赞按钮时元素已过时，将在下一次循环中尝试重新定位。")
-                continue  # 跳过本次循环，在下一次循环中会重新获取按钮列表
-            except Exception as e:
-                print(f"❌ 点击第 {i + 1} 个点赞按钮时出错: {e}")
+    try:
+        # 等待点赞按钮加载完成。这个定位器非常稳定，因为它依赖于一个专门用于标识的 data-cname 属性
+        wait.until(SELECTORS.present("like_button"))
 
-        print(f"--- “点赞”任务完成，共成功操作 {liked_count} 次 ---")
+        # 从帖子索引中选择未点赞的帖子，不足时由 FeedReader 滚动加载，只读取新出现的帖子
+        feed = feed or FeedReader(driver)
+        if LIKE_STATE_FROM_API:
+            feed.sync_liked_states(fetch_liked_states(driver, max(20, (num_to_like + len(skip_post_ids)) * 2)))
+        targets = feed.take(num_to_like, lambda post: post["like"] is not None and not post["liked"]
+                            and post["id"] not in skip_post_ids)
 
+        if not targets:
+            print("页面上没有找到可点赞的按钮。")
+            return liked_post_ids  # 提前返回，避免不必要的操作
+
+        posts = [post for post in feed.visible_posts() if post["like"] is not None]
+        already_liked = sum(1 for post in posts if post["liked"] or post["id"] in skip_post_ids)
+        print(f"找到了 {len(posts)} 个点赞按钮（其中 {already_liked} 个已点赞），准备点击其中的 {len(targets)} 个。")
+
+        for post in targets:
+            highlight_element(driver, post["like"])
+        # 在一次脚本调用中依次点击，点击间隔在页面内完成，让点赞操作生效，也避免操作过快
+        buttons = [post["like"] for post in targets]
+        since = network_mark(driver)
+        clicked = click_elements(driver, buttons)
+        targets = targets[:clicked]
+
+        # 有网络监控时，以点赞接口的响应逐个判断是否成功（请求按点击顺序发出）
+        # 否则以点赞数的变化判断；读不到点赞数的帖子只能以点击结果为准
+        outcomes = network_outcomes(driver, wait, "like", since, clicked)
+        changes = _like_count_changes(driver, targets)
+        if outcomes is None:
+            outcomes = [change != 0 for change in changes]
+        liked_post_ids = [post["id"] for post, ok in zip(targets, outcomes) if ok]
+        restored = _restore_unliked(driver, targets, changes)
+        liked_post_ids = [post_id for post_id in liked_post_ids if post_id not in restored]
+        feed.update(restored, liked=True)
+        feed.update(liked_post_ids, liked=True)
+
+        print(f"--- “点赞”任务完成，共成功点赞 {len(liked_post_ids)} 个（点击 {clicked} 次） ---")
+
+    except StaleElementReferenceException:
+        print("🟡 点赞按钮在点击前已过时，列表可能已刷新。")
     except Exception as e:
         print(f"❌ “点赞”任务执行过程中出现严重错误: {e}")
 
-    time.sleep(TIMESLEEP)
+    pace()
+    return liked_post_ids
+
+
+# 在评论面板内依次点击“最近”分类、第一个表情和“發送”按钮，每一步都在页面内轮询等待目标出现，
+# 整个流程只需一次 execute_async_script。各定位器的规格来自 SELECTORS.spec（带有上次命中的策略），
+# 发送后在页面内等待评论面板关闭，作为发送成功的 DOM 判断。
+# 返回 {ok, sent, step, strategies}：ok 为评论面板已关闭，sent 为已点击“發送”，step 为失败时卡住的步骤，
+# strategies 为各定位器实际命中的策略，用于回写统计。
+_COMMENT_IN_PANEL_JS = _RESOLVE_SELECTOR_FN_JS + """
+var panel = arguments[0], specs = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeout, strategies = {}, sent = false;
+function finish(ok, step) { done({ok: ok, sent: sent, step: step, strategies: strategies}); }
+function poll(check, next, step) {
+    var found = check();
+    if (found) { next(found); return; }
+    if (Date.now() > deadline) { finish(false, step); return; }
+    setTimeout(function () { poll(check, next, step); }, 50);
+}
+function clickable(name) {
+    return function () {
+        var result = resolveSelector(specs[name], panel, 'clickable');
+        if (!result.elements.length) { return null; }
+        strategies[name] = result.strategy;
+        return result.elements[0];
+    };
+}
+function panelClosed() {
+    return !panel.isConnected || !(panel.offsetWidth || panel.offsetHeight || panel.getClientRects().length);
+}
+poll(clickable('recent_emoji_tab'), function (tab) {
+    tab.click();
+    poll(clickable('emoji'), function (emoji) {
+        emoji.click();
+        poll(clickable('send_button'), function (send) {
+            send.click();
+            sent = true;
+            poll(panelClosed, function () { finish(true, 'comment_panel'); }, 'comment_panel');
+        }, 'send_button');
+    }, 'emoji');
+}, 'recent_emoji_tab');
+"""
+_COMMENT_PANEL_SELECTORS = ("recent_emoji_tab", "emoji", "send_button")
+
+
+def _comment_on_open_post(driver, wait):
+    """
+    在当前已打开的帖子详情页中发布一个表情评论。
 
+    先定位评论面板再在面板内部操作，解决了遮罩层拦截点击的问题；面板内的三次点击合并为一次异步脚本调用。
 
-def post_emoji_comment(driver, wait):
+    :param driver: WebDriver 实例。
+    :param wait: WebDriverWait 实例。
+    :return: (sent, ok) 元组：sent 为已点击“發送”（评论可能已经发出），ok 为确认发送成功。
     """
-    进入第一个帖子的详情页，并发布一个表情作为评论。
-    此版本通过先定位评论面板，然后在面板内部进行操作，解决了遮罩层拦截点击的问题。
-    同时使用JavaScript点击以提高稳定性。
+    # 点击“发布我的看法”以弹出评论面板
+    publish_view_button = wait.until(SELECTORS.clickable("publish_view_button"))
+    highlight_element(driver, publish_view_button)
+    driver.execute_script("arguments[0].click();", publish_view_button)
+    # 这个面板有唯一的“評論”标题和“發送”按钮，以此作为定位依据
+    comment_panel = wait.until(SELECTORS.visible("comment_panel"))
+
+    since = network_mark(driver)
+    start = time.perf_counter()
+    with script_timeout(driver, WAIT_TIMEOUT + 10):
+        result = driver.execute_async_script(
+            _COMMENT_IN_PANEL_JS, comment_panel, {name: SELECTORS.spec(name) for name in _COMMENT_PANEL_SELECTORS},
+            int(WAIT_TIMEOUT * 1000)) or {}
+    elapsed = time.perf_counter() - start
+    strategies = result.get("strategies") or {}
+    for name in _COMMENT_PANEL_SELECTORS:
+        if name in strategies or name == result.get("step"):
+            SELECTORS.record(name, strategies.get(name), elapsed)
+    if not result.get("sent"):
+        print(f"❌ 评论面板中的“{result.get('step')}”未能在 {WAIT_TIMEOUT} 秒内出现。")
+        return False, False
+
+    # 以评论面板关闭为准；评论接口的响应只作为补充判断（面板未关闭但接口确认成功时同样视为成功）
+    outcomes = network_outcomes(driver, wait, "comment", since)
+    api_ok = bool(outcomes) and outcomes[0]
+    if result.get("ok"):
+        if outcomes and not api_ok:
+            print("🟡 评论接口返回失败，但评论面板已关闭，以页面为准。")
+        return True, True
+    if api_ok:
+        print("🟡 评论面板未关闭，但评论接口已确认发送成功。")
+        return True, True
+    print(f"❌ 点击“發送”后评论面板未在 {WAIT_TIMEOUT} 秒内关闭。")
+    return True, False
+
+
+@timed_task
+def post_emoji_comment(driver, wait, num_to_comment=1, skip_post_ids=(), feed=None):
+    """
+    为列表中的若干个帖子各发布一个表情评论。
+
+    所有帖子都在同一个新标签页中依次打开，列表页保持不动，帖子索引中的元素引用始终有效；
+    每个帖子只需一次点击弹出评论面板和一次脚本调用完成表情选择与发送，并在同一次调用中确认评论面板关闭。
+    帖子没有链接时退回到点击标题进入详情页、评论后返回列表的方式（只评论一个帖子）。
+    已点击过“發送”的帖子即使未能确认成功也会在帖子索引中标记，重试时不再选择，避免重复评论。
+    已读取的帖子多于所需数量时，优先选择评论数较少的帖子：详情页需要渲染的评论更少，打开和弹出评论面板更快。
 
     :param driver: WebDriver 实例。
     :param wait: WebDriverWait 实例。
-    :return: None
+    :param num_to_comment: 整数，要评论的帖子数量。
+    :param skip_post_ids: 今日已评论过的帖子 ID 集合，跳过这些帖子。
+    :param feed: FeedReader 实例，与其他任务共用；为 None 时新建一个。
+    :return: 列表，评论成功的帖子 ID。
     """
-    print("\n--- 开始执行“撰写评论（发送表情）”任务 ---")
+    print(f"\n--- 开始执行“撰写评论（发送表情）”任务，目标 {num_to_comment} 个帖子 ---")
+    commented_post_ids = []
+    if num_to_comment <= 0:
+        return commented_post_ids
+    feed = feed or FeedReader(driver)
     try:
-        # 1. 点击第一个帖子的标题进入帖子
-        first_post_title_locator = (
-            By.XPATH,
-            "(//div[contains(@class, 'card-item')]//div[contains(@class, 'font-bold') and contains(@class, 'line-clamp-2')])[1]"
-        )
-        first_post_title = wait.until(EC.element_to_be_clickable(first_post_title_locator))
-        highlight_element(driver, first_post_title)
-        driver.execute_script("arguments[0].click();", first_post_title)
-        print("步骤 1: 成功点击标题，进入帖子详情页面。")
-
-        # 2. 点击“发布我的看法”以弹出评论面板
-        # 这个定位器查找一个可点击的div，它内部包含"發佈我的看法"这个文本
-        publish_view_button_locator = (By.XPATH, "//div[contains(text(), '發佈我的看法')]")
-        publish_view_button = wait.until(EC.element_to_be_clickable(publish_view_button_locator))
-        highlight_element(driver, publish_view_button)
-        driver.execute_script("arguments[0].click();", publish_view_button)
-        print("步骤 2: 已点击“發佈我的看法”，等待评论面板加载...")
-
-        # --- 核心改动：先定位到整个评论面板 ---
-        # 策略：这个面板有唯一的“評論”标题和“發送”按钮，以此作为定位依据。
-        comment_panel_locator = (By.XPATH, "//div[.//div[text()='評論'] and .//span[text()='發送']]")
-        comment_panel = wait.until(EC.visibility_of_element_located(comment_panel_locator))
-
-        # 3. 在评论面板内部，点击"最近"按钮
-        # 策略：在已定位的 comment_panel 内部查找。注意XPath开头的 "." 代表从当前元素开始搜索。
-        recent_emoji_tab_locator = (
-        By.XPATH, ".//div[contains(@class, 'overflow-x-auto')]//div[contains(@class, 'cursor-pointer')][1]")
-        recent_emoji_tab = wait.until(EC.element_to_be_clickable(comment_panel.find_element(*recent_emoji_tab_locator)))
-        highlight_element(driver, recent_emoji_tab)
-        driver.execute_script("arguments[0].click();", recent_emoji_tab)
-        print("步骤 3: 已点击“最近”分类。")
-        time.sleep(TIMESLEEP)  # 等待表情列表加载
-
-        # 4. 在评论面板内部，选择第一个表情
-        # 策略：同样在 comment_panel 内部查找。
-        first_emoji_locator = (By.XPATH,
-                               ".//div[contains(@class, 'overflow-y-auto') and contains(@class, 'flex-wrap')]//div[contains(@class, 'cursor-pointer')][1]")
-        first_emoji = wait.until(EC.element_to_be_clickable(comment_panel.find_element(*first_emoji_locator)))
-        highlight_element(driver, first_emoji)
-        driver.execute_script("arguments[0].click();", first_emoji)
-        print("步骤 4: 已选择第一个表情。")
-        time.sleep(TIMESLEEP)
-
-        # 5. 在评论面板内部，点击"發送"来发送
-        # 策略：同样在 comment_panel 内部查找。
-        send_button_locator = (By.XPATH, ".//span[text()='發送']")
-        send_button = wait.until(EC.element_to_be_clickable(comment_panel.find_element(*send_button_locator)))
-        highlight_element(driver, send_button)
-        driver.execute_script("arguments[0].click();", send_button)
-        print("步骤 5: 评论已成功发送。")
-
-        # 等待评论面板关闭
-        wait.until(EC.invisibility_of_element_located(comment_panel_locator))
-
-        # 从帖子页面返回列表
-        driver.back()
-        # 增加一个等待，确保返回后的列表页面已加载完成
-        # 这是一个好习惯，能确保下一个任务开始时，页面元素已准备就绪
-        post_list_locator = (By.XPATH, "//div[contains(@class, 'card-item')]")
-        wait.until(EC.presence_of_element_located(post_list_locator))
-        print("--- “撰写评论”任务完成 ---")
+        wait.until(SELECTORS.present("post_title"))
+        def eligible(post):
+            return post["title"] is not None and post["id"] not in skip_post_ids and not post.get("comment_sent")
+
+        targets = feed.take(num_to_comment, eligible)
+        # 只在已读取的帖子中挑选，不会为此额外滚动；评论数未知的帖子排在最后，同样的评论数保持列表顺序
+        candidates = [post for post in feed.visible_posts() if eligible(post)]
+        if len(candidates) > len(targets):
+            candidates.sort(key=lambda post: (post["comments"] is None, post["comments"] or 0))
+            targets = candidates[:num_to_comment]
+        if not targets:
+            print("❌ 页面上未能找到任何帖子。")
+            return commented_post_ids
+
+        if all(post["url"] for post in targets):
+            sent_post_ids, commented_post_ids = _comment_posts_in_tab(driver, wait, targets)
+        else:
+            sent_post_ids, commented_post_ids = _comment_post_by_clicking(driver, wait, targets[0], feed)
+        feed.update(sent_post_ids, comment_sent=True)
+
+        for post in targets:
+            if post["id"] in commented_post_ids and post["comments"] is not None:
+                feed.update([post["id"]], comments=post["comments"] + 1)
+        print(f"--- “撰写评论”任务完成，成功评论 {len(commented_post_ids)} 个帖子 ---")
 
     except TimeoutException as e:
         print(f"❌ 执行“撰写评论”任务时超时，未能找到目标元素。请检查页面结构或文本是否已更改。错误: {e}")
-        try:
-            print("尝试通过浏览器后退功能恢复...")
-            driver.back()
-            time.sleep(1)
-        except Exception as back_e:
-            print(f"浏览器后退失败: {back_e}")
     except Exception as e:
         print(f"❌ 执行“撰写评论”任务时出现意外错误: {e}")
 
-    time.sleep(TIMESLEEP)
+    pace()
+    return commented_post_ids
 
 
-def browse_posts(driver, wait, num_to_browse=3):
+def _comment_posts_in_tab(driver, wait, posts):
     """
-    循环浏览指定数量的帖子。
-    此版本已重构，使用更稳定的XPath来定位帖子标题，并增加了高亮。
+    在一个新标签页中依次打开每个帖子并发布评论，结束后关闭该标签页并切回列表页。
 
-    函数会依次点击进入每个帖子的详情页，停留片刻后返回列表页。
-
-    :param driver: WebDriver 实例。
-    :param wait: WebDriverWait 实例。
-    :param num_to_browse: 整数，要浏览的帖子数量。
-    :return: None
+    :param posts: 要评论的帖子字典列表（来自 FeedReader，必须带有 "url"）。
+    :return: (已点击“發送”的帖子 ID 列表, 评论成功的帖子 ID 列表)。
     """
-    print(f"\n--- 开始执行“循环阅读{num_to_browse}个帖子”的任务 ---")
-
-    post_title_base_xpath = "//div[contains(@class, 'card-item')]//div[contains(@class, 'font-bold') and contains(@class, 'line-clamp-2')]"
-
+    sent_post_ids, commented_post_ids = [], []
+    list_handle = driver.current_window_handle
+    driver.switch_to.new_window("tab")
     try:
-        # 确认帖子列表存在，并获取标题总数
-        all_titles = wait.until(EC.presence_of_all_elements_located((By.XPATH, post_title_base_xpath)))
-        num_to_actually_browse = min(num_to_browse, len(all_titles))
+        for i, post in enumerate(posts):
+            if i:
+                pace()
+            try:
+                driver.get(post["url"])
+                sent, ok = _comment_on_open_post(driver, wait)
+                if sent:
+                    sent_post_ids.append(post["id"])
+                if ok:
+                    commented_post_ids.append(post["id"])
+                    print(f"成功评论第 {i + 1} 个帖子。")
+            except TimeoutException:
+                print(f"❌ 第 {i + 1} 个帖子的评论面板未能加载，将继续下一个。")
+    finally:
+        driver.close()
+        driver.switch_to.window(list_handle)
+    return sent_post_ids, commented_post_ids
 
-        if num_to_actually_browse == 0:
-            print("页面上未能找到任何帖子。")
-            return
 
-        print(f"共找到 {len(all_titles)} 个帖子，准备依次点击浏览前 {num_to_actually_browse} 个。")
+def _comment_post_by_clicking(driver, wait, post, feed):
+    """
+    点击标题进入帖子详情页发布评论，然后返回列表页。
 
-        for i in range(num_to_actually_browse):
-            try:
-                # 每次循环都重新定位当前要点击的帖子标题，这是最关键的一步
-                # 构造指向第 i+1 个标题的XPath
-                current_title_xpath = f"({post_title_base_xpath})[{i + 1}]"
-                post_title_to_click = wait.until(EC.element_to_be_clickable((By.XPATH, current_title_xpath)))
-
-                highlight_element(driver, post_title_to_click)
-                driver.execute_script("arguments[0].click();", post_title_to_click)
-
-                time.sleep(1)
-                # 从帖子详情页返回
-                driver.back()
-
-                print(f"成功阅读并返回第 {i + 1} 个帖子。")
-                # 等待列表页完全加载，为下一次循环做准备
-                time.sleep(1)
-
-            except StaleElementReferenceException:
-                print(f"🟡 处理第 {i + 1} 个帖子时元素已过时，列表可能已刷新，将继续下一个。")
-                # 元素过时通常意味着页面已跳转或刷新，直接继续下一次循环通常是安全的
-                time.sleep(1)
+    :param post: 要评论的帖子字典。
+    :param feed: FeedReader 实例，返回列表页后其中的元素引用全部失效，需要重新读取。
+    :return: (已点击“發送”的帖子 ID 列表, 评论成功的帖子 ID 列表)，均最多包含该帖子的 ID。
+    """
+    try:
+        highlight_element(driver, post["title"])
+        driver.execute_script("arguments[0].click();", post["title"])
+        sent, ok = _comment_on_open_post(driver, wait)
+        driver.back()
+        wait.until(SELECTORS.present("post_card"))
+        return [post["id"]] if sent else [], [post["id"]] if ok else []
+    except TimeoutException:
+        print("尝试通过浏览器后退功能恢复...")
+        try:
+            driver.back()
+            wait_for_page_ready(driver, wait)
+        except Exception as back_e:
+            print(f"浏览器后退失败: {back_e}")
+        raise
+    finally:
+        # 进入过帖子详情页，列表页已重新加载，之前读取的元素引用全部失效
+        feed.invalidate()
+
+
+# 在后台标签页中打开帖子，并把窗口引用保存在列表页中，之后无需切换窗口即可检查加载状态和关闭
+_OPEN_TABS_JS = """
+window.__autocheckinTabs = arguments[0].map(function (url) { return window.open(url, '_blank'); });
+return window.__autocheckinTabs.filter(function (tab) { return tab !== null; }).length;
+"""
+# 新打开的标签页在开始导航之前是一个已加载完成（readyState 为 complete）的 about:blank，
+# 因此只有地址已变为帖子页面且其文档加载完成时才算加载完成
+_TAB_LOADED_FN_JS = """
+function tabLoaded(tab) {
+    if (tab === null || tab.closed) { return false; }
+    try { return tab.location.href !== 'about:blank' && tab.document.readyState === 'complete'; }
+    catch (e) { return true; }  // about:blank 与列表页同源；无法读取说明已导航到其他域名的页面
+}
+"""
+_TABS_LOADED_JS = _TAB_LOADED_FN_JS + """
+return (window.__autocheckinTabs || []).every(function (tab) {
+    return tab === null || tab.closed || tabLoaded(tab);
+});
+"""
+# 关闭前记录每个标签页是否已加载完成，只有加载完成的帖子才计为已浏览
+_CLOSE_TABS_JS = _TAB_LOADED_FN_JS + """
+var tabs = window.__autocheckinTabs || [];
+var loaded = tabs.map(tabLoaded);
+tabs.forEach(function (tab) { if (tab !== null && !tab.closed) { tab.close(); } });
+window.__autocheckinTabs = [];
+return loaded;
+"""
+
+
+def _browse_posts_in_tabs(driver, wait, posts):
+    """
+    在后台标签页中同时打开多个帖子，停留后一并关闭。列表页始终保持不动，不会重新渲染。
+
+    :param driver: WebDriver 实例。
+    :param wait: WebDriverWait 实例。
+    :param posts: 要浏览的帖子字典列表（来自 query_posts，必须带有 "url"）。
+    :return: 列表，详情页加载完成的帖子 ID。
+    """
+    opened = driver.execute_script(_OPEN_TABS_JS, [post["url"] for post in posts])
+    print(f"已在后台标签页中打开 {opened} 个帖子，等待加载完成...")
+    try:
+        wait.until(lambda d: d.execute_script(_TABS_LOADED_JS))
+        # 停留一段时间，让详情页的浏览请求发出
+        pace(BROWSE_DWELL)
+        if FAST_MODE:
+            time.sleep(TAB_MIN_DWELL)
+    except TimeoutException:
+        print("🟡 部分帖子的标签页未能加载完成，只计入已加载完成的帖子。")
+    finally:
+        loaded = driver.execute_script(_CLOSE_TABS_JS) or []
+    return [post["id"] for post, ok in zip(posts, loaded) if ok]
+
+
+def _browse_posts_by_clicking(driver, wait, target_ids, feed):
+    """
+    依次点击进入每个帖子的详情页，停留片刻后返回列表页。
+
+    :param feed: FeedReader 实例，用于在返回列表页后按 ID 找回目标帖子。
+    :return: 列表，成功浏览的帖子 ID。
+    """
+    browsed_post_ids = []
+    list_url = driver.current_url
+
+    for i, post_id in enumerate(target_ids):
+        try:
+            # 返回列表页后旧的元素引用会失效（见循环末尾的 invalidate），由 FeedReader 重新读取并按 ID 找回目标帖子
+            post = feed.find(post_id)
+            if post is None or post["title"] is None:
+                print(f"无法找到第 {i + 1} 个帖子，可能列表已刷新。")
                 continue
-            except Exception as e:
-                print(f"❌ 处理第 {i + 1} 个帖子时出现错误: {e}")
-                print("尝试使用浏览器后退功能恢复，并继续下一个...")
-                driver.back()  # 如果点击返回按钮失败，尝试使用浏览器自带的后退
-                time.sleep(1.5)  # 等待页面稳定
+            post_title_to_click = post["title"]
+
+            highlight_element(driver, post_title_to_click)
+            driver.execute_script("arguments[0].click();", post_title_to_click)
+
+            # 等待进入详情页，并停留一段时间
+            wait.until(EC.url_changes(list_url))
+            pace(BROWSE_DWELL)
+            # 从帖子详情页返回
+            driver.back()
+
+            # 等待列表页完全加载，为下一次循环做准备
+            wait.until(EC.url_to_be(list_url))
+            wait.until(SELECTORS.present("post_title"))
+            browsed_post_ids.append(post_id)
+            print(f"成功阅读并返回第 {i + 1} 个帖子。")
+
+        except StaleElementReferenceException:
+            print(f"🟡 处理第 {i + 1} 个帖子时元素已过时，列表可能已刷新，将继续下一个。")
+            # 元素过时通常意味着页面已跳转或刷新，等待页面就绪后继续下一次循环
+            wait_for_page_ready(driver, wait)
+            continue
+        except Exception as e:
+            print(f"❌ 处理第 {i + 1} 个帖子时出现错误: {e}")
+            print("尝试使用浏览器后退功能恢复，并继续下一个...")
+            driver.back()  # 如果点击返回按钮失败，尝试使用浏览器自带的后退
+            wait_for_page_ready(driver, wait)  # 等待页面稳定
+        finally:
+            feed.invalidate()
+
+    return browsed_post_ids
+
+
+@timed_task
+def browse_posts(driver, wait, num_to_browse=3, skip_post_ids=(), feed=None):
+    """
+    浏览指定数量的帖子。
+    此版本已重构，使用更稳定的定位器来定位帖子标题，并增加了高亮。
+
+    BROWSE_MODE 为 "tabs" 时，从列表中一次性提取帖子链接并在后台标签页中同时打开，停留后关闭；
+    否则（或帖子没有链接时）依次点击进入每个帖子的详情页，停留片刻后返回列表页。
+
+    :param driver: WebDriver 实例。
+    :param wait: WebDriverWait 实例。
+    :param num_to_browse: 整数，要浏览的帖子数量。
+    :param skip_post_ids: 今日已经浏览过的帖子 ID，优先浏览其他帖子。
+    :param feed: FeedReader 实例，与其他任务共用；为 None 时新建一个。
+    :return: 列表，本次成功浏览的帖子 ID。
+    """
+    print(f"\n--- 开始执行“循环阅读{num_to_browse}个帖子”的任务 ---")
+
+    browsed_post_ids = []
+    feed = feed or FeedReader(driver)
+
+    try:
+        # 确认帖子列表存在，并从帖子索引中选择目标，不足时由 FeedReader 滚动加载
+        wait.until(SELECTORS.present("post_title"))
+        targets = feed.take(num_to_browse, lambda post: post["title"] is not None
+                            and post["id"] not in skip_post_ids)
+        posts = [post for post in feed.visible_posts() if post["title"] is not None]
+
+        if not targets:
+            print("页面上未能找到任何帖子。")
+            return browsed_post_ids
+
+        if BROWSE_MODE == "tabs" and all(post["url"] for post in targets):
+            print(f"共找到 {len(posts)} 个帖子，准备在后台标签页中同时浏览其中的 {len(targets)} 个。")
+            browsed_post_ids = _browse_posts_in_tabs(driver, wait, targets)
+        else:
+            print(f"共找到 {len(posts)} 个帖子，准备依次点击浏览其中的 {len(targets)} 个。")
+            browsed_post_ids = _browse_posts_by_clicking(
+                driver, wait, [post["id"] for post in targets], feed)
 
         print("\n--- 所有帖子的浏览任务已完成 ---")
 
     except Exception as e:
         print(f"\n❌ 执行浏览任务过程中出现严重错误: {e}")
 
-    time.sleep(TIMESLEEP)
+    pace()
+    return browsed_post_ids
+
+
+@dataclass
+class PointsTask:
+    """积分页面上的一个任务行。"""
+    identifier: str  # 任务标题，例如 "按讚5個貼文"
+    current: Optional[int]  # 当前进度，没有 "x / y" 进度文本时为 None
+    target: Optional[int]  # 目标进度，没有 "x / y" 进度文本时为 None
+    completed: bool
+
+
+@dataclass
+class PointsSnapshot:
+    """积分页面所有任务行的进度快照。"""
+    tasks: Dict[str, PointsTask] = field(default_factory=dict)
+
+    def find(self, identifier_text):
+        """
+        按标识文本查找任务行。
+
+        :param identifier_text: 字符串，任务标题中包含的文本。
+        :return: PointsTask，找不到时返回 None。
+        """
+        for identifier, task in self.tasks.items():
+            if identifier_text in identifier:
+                return task
+        return None
+
+    def completed_tasks(self):
+        """
+        :return: 已完成的任务函数名称集合（见 POINTS_TASK_IDENTIFIERS）。
+        """
+        completed = set()
+        for task_name, identifier_text in POINTS_TASK_IDENTIFIERS.items():
+            task = self.find(identifier_text)
+            if task and task.completed:
+                completed.add(task_name)
+        return completed
+
+
+# 在页面内一次性提取所有任务行：标题、"x / y" 进度文本以及是否存在签到完成图标。
+# 只保留最内层的任务行，避免外层容器重复计入。
+_SCRAPE_POINTS_JS = """
+var progressPattern = /^\\s*\\d+\\s*\\/\\s*\\d+\\s*$/;
+var candidates = Array.prototype.filter.call(
+    document.querySelectorAll("div[class*='justify-between']"),
+    function (row) {
+        return row.querySelector("div[class*='icon-gift']") !== null ||
+            Array.prototype.some.call(row.querySelectorAll('div'), function (el) {
+                return el.children.length === 0 && progressPattern.test(el.textContent);
+            });
+    });
+var rows = candidates.filter(function (row) {
+    return !candidates.some(function (other) { return other !== row && row.contains(other); });
+});
+return rows.map(function (row) {
+    var leaves = Array.prototype.filter.call(row.querySelectorAll('*'), function (el) {
+        return el.children.length === 0 && el.textContent.trim() !== '';
+    });
+    var progress = leaves.filter(function (el) { return progressPattern.test(el.textContent); })[0];
+    var title = leaves.filter(function (el) { return el !== progress; })[0];
+    return {
+        identifier: title ? title.textContent.trim() : row.textContent.trim(),
+        progress: progress ? progress.textContent.trim() : '',
+        check_in_done: row.querySelector("div[class*='icon-gift-true.png']") !== null
+    };
+});
+"""
+
+
+def parse_progress(text):
+    """
+    解析形如 "3 / 5" 的进度文本。
+
+    :param text: 字符串，进度文本。
+    :return: (当前进度, 目标进度)，无法解析时返回 (None, None)。
+    """
+    match = re.match(r"^\s*(\d+)\s*/\s*(\d+)\s*$", text or "")
+    if not match:
+        return None, None
+    return int(match.group(1)), int(match.group(2))
 
 
+def expand_points_tasks(driver):
+    """
+    在积分页面上点击“展开”按钮，显示全部任务。找不到按钮时假设所有任务已显示。
+
+    :param driver: WebDriver 实例。
+    """
+    try:
+        short_wait = make_wait(driver, 5)
+        expand_button = short_wait.until(SELECTORS.clickable("points_expand_button"))
+
+        print("检测到“展开”按钮，准备点击...")
+        highlight_element(driver, expand_button)
+        # 折叠的任务行已经存在于页面中，只是被隐藏，因此按可见的任务行计数
+        rows_before = len(SELECTORS.find_all(driver, "points_progress_row", mode="visible"))
+        # 使用JS点击更可靠
+        driver.execute_script("arguments[0].click();", expand_button)
+        print("✅ 已成功点击“展开”按钮。")
+        # 等待展开出的任务行显示出来，而不是等待按钮消失；没有新的任务行显示时最多等待 EXPAND_REVEAL_TIMEOUT 秒
+        try:
+            make_wait(driver, EXPAND_REVEAL_TIMEOUT).until(
+                lambda d: len(SELECTORS.find_all(d, "points_progress_row", mode="visible")) > rows_before)
+        except TimeoutException:
+            print("ℹ️ 点击“展开”后没有新的任务行显示出来，继续读取当前的任务。")
+    except TimeoutException:
+        # 如果在5秒内找不到这个按钮，我们合理地假设所有任务已经显示，或者页面布局已更改。
+        print("ℹ️ 未找到“展开”按钮或按钮不可点击，假设所有任务已显示。")
+    except Exception as e:
+        print(f"❌ 点击“展开”按钮时出现意外错误: {e}")
+
+
+@timed_task
+def scrape_points_progress(driver, wait):
+    """
+    在积分页面上展开全部任务，并通过一次页面内提取读取所有任务行的进度。
+
+    调用前浏览器需要已经位于积分页面。
+
+    :param driver: WebDriver 实例。
+    :param wait: WebDriverWait 实例。
+    :return: PointsSnapshot 实例；页面上没有任务行时为空快照。
+    """
+    expand_points_tasks(driver)
+
+    try:
+        wait.until(SELECTORS.present("points_progress_row"))
+    except TimeoutException:
+        print("❌ 积分页面上未找到任何任务进度。")
+        return PointsSnapshot()
+
+    snapshot = PointsSnapshot()
+    for row in driver.execute_script(_SCRAPE_POINTS_JS) or []:
+        current, target = parse_progress(row["progress"])
+        if current is not None:
+            completed = current >= target
+        else:
+            completed = row["check_in_done"]
+        snapshot.tasks[row["identifier"]] = PointsTask(row["identifier"], current, target, completed)
+    return snapshot
+
+
+@timed_task
 def check_points_page(driver, wait):
     """
     检查积分页面上各个任务的完成状态。
-    此版本使用基于文本的相对定位法，并能智能点击“展开”按钮。
+    此版本一次性提取所有任务行的进度，并能智能点击“展开”按钮。
 
     :param driver: WebDriver 实例。
     :param wait: WebDriverWait 实例。
-    :return: None
+    :return: PointsSnapshot 实例，出现严重错误时为 None。
     """
     print("\n--- 开始执行“检查积分页面”任务 ---")
+    snapshot = None
     try:
-        points_page_url = "https://www.blablalink.com/points"
+        points_page_url = TARGET_URL
         driver.get(points_page_url)
         print(f"已导航到积分页面: {points_page_url}")
 
-        try:
-            expand_button_xpath = "//div[contains(@class, 'btn-mask') and contains(@class, 'cursor-pointer') and .//span[contains(@class, 'rotate-180')]]"
-
-            short_wait = WebDriverWait(driver, 5)
-            expand_button = short_wait.until(
-                EC.element_to_be_clickable((By.XPATH, expand_button_xpath))
-            )
-
-            print("检测到“展开”按钮，准备点击...")
-            highlight_element(driver, expand_button)
-            # 使用JS点击更可靠
-            driver.execute_script("arguments[0].click();", expand_button)
-            print("✅ 已成功点击“展开”按钮。")
-            time.sleep(1)  # 等待展开动画完成
-        except TimeoutException:
-            # 如果在5秒内找不到这个按钮，我们合理地假设所有任务已经显示，或者页面布局已更改。
-            print("ℹ️ 未找到“展开”按钮或按钮不可点击，假设所有任务已显示。")
-        except Exception as e:
-            print(f"❌ 点击“展开”按钮时出现意外错误: {e}")
-
-        progress_checks = [
-            {
-                "task_name": "每日签到",
-                "identifier_text": "每日簽到",
-                "check_type": "presence_and_attribute",
-                "target_xpath_relative": ".//div[contains(@class, 'icon-gift-true.png')]",
-                "attribute_name": "class",
-                "expected_value": "icon-gift-true.png"
-            },
-            {
-                "task_name": "浏览帖子",
-                "identifier_text": "瀏覽3個貼文",
-                "check_type": "text",
-                "target_xpath_relative": ".//div[contains(text(), '/')]",
-                "expected_progress": "3 / 3"
-            },
-            {
-                "task_name": "点赞内容",
-                "identifier_text": "按讚5個貼文",
-                "check_type": "text",
-                "target_xpath_relative": ".//div[contains(text(), '/')]",
-                "expected_progress": "5 / 5"
-            },
-            {
-                "task_name": "发表评论",
-                "identifier_text": "發布1條評論",
-                "check_type": "text",
-                "target_xpath_relative": ".//div[contains(text(), '/')]",
-                "expected_progress": "1 / 1"
-            }
-        ]
+        snapshot = scrape_points_progress(driver, wait)
 
         all_checks_passed = True
-
-        for check in progress_checks:
-            task_name = check["task_name"]
-            identifier_text = check["identifier_text"]
-            print(f"  正在检查 '{task_name}'...")
-
-            try:
-                task_row_xpath = f"//div[contains(@class, 'justify-between') and .//*[contains(text(), '{identifier_text}')]]"
-                task_row = wait.until(
-                    EC.visibility_of_element_located((By.XPATH, task_row_xpath))
-                )
-
-                highlight_element(driver, task_row, duration=0.7)
-
-                check_type = check["check_type"]
-                target_xpath = check["target_xpath_relative"]
-
-                target_element = task_row.find_element(By.XPATH, target_xpath)
-
-                if check_type == "text":
-                    actual_progress = target_element.text.strip()
-                    expected_progress = check["expected_progress"]
-                    if actual_progress == expected_progress:
-                        print(f"  检查通过: '{task_name}' 进度为 '{actual_progress}'，符合预期。")
-                    else:
-                        print(
-                            f"  ❌ 检查失败: '{task_name}' 期望进度为 '{expected_progress}'，实际为 '{actual_progress}'。")
-                        all_checks_passed = False
-
-                elif check_type == "presence_and_attribute":
-                    attribute_name = check["attribute_name"]
-                    expected_value = check["expected_value"]
-                    actual_attribute = target_element.get_attribute(attribute_name)
-                    if expected_value in actual_attribute:
-                        print(f"  检查通过: '{task_name}' 已完成（找到 '{expected_value}'）。")
-                    else:
-                        print(f"  ❌ 检查失败: '{task_name}' 未完成状态或状态异常。")
-                        all_checks_passed = False
-
-            except TimeoutException:
-                print(f"  ❌ 检查失败: 无法在页面上找到 '{task_name}' 的任务行或其状态元素。")
+        for task_name, identifier_text in POINTS_TASK_IDENTIFIERS.items():
+            print(f"  正在检查 '{identifier_text}'...")
+            task = snapshot.find(identifier_text)
+            if task is None:
+                print(f"  ❌ 检查失败: 无法在页面上找到 '{identifier_text}' 的任务行或其状态元素。")
                 all_checks_passed = False
-            except Exception as e:
-                print(f"  ❌ 检查出错: 验证 '{task_name}' 时发生意外错误: {e}")
+            elif task.completed:
+                progress = f"进度为 '{task.current} / {task.target}'" if task.target is not None else "已完成"
+                print(f"  检查通过: '{identifier_text}' {progress}。")
+            else:
+                progress = f"当前进度为 '{task.current} / {task.target}'" if task.target is not None else "未完成"
+                print(f"  ❌ 检查失败: '{identifier_text}' {progress}。")
                 all_checks_passed = False
 
         if all_checks_passed:
@@ -519,59 +2491,1241 @@ def check_points_page(driver, wait):
 
     except Exception as e:
         print(f"执行“检查积分页面”任务时出现严重错误: {e}")
-    time.sleep(TIMESLEEP)
+    pace()
+    return snapshot
+
+
+class ApiError(Exception):
+    """后端接口返回错误或请求失败时抛出。"""
+
+
+class ApiClient:
+    """
+    直接调用 blablalink 后端接口的轻量客户端。
+
+    使用 urllib3 的连接池复用 HTTPS 连接（urllib3 随 selenium 一同安装，无需额外依赖），
+    并携带从浏览器配置文件导出的会话 Cookie，因此无需启动浏览器即可完成签到、点赞、评论和浏览。
+    """
+
+    def __init__(self, cookies, base_url=None, timeout=API_TIMEOUT, pool_size=API_POOL_SIZE, retries=2):
+        """
+        :param cookies: Cookie 字典列表，格式与 driver.get_cookies() 的返回值相同。
+        :param base_url: 字符串，接口地址，默认使用 API_BASE_URL。
+        :param timeout: 单个请求的超时时间（秒）。
+        :param pool_size: 连接池大小。
+        :param retries: 整数，连接失败或网关错误时的重试次数。
+        """
+        self.base_url = (base_url or API_BASE_URL).rstrip("/")
+        self.http = urllib3.PoolManager(
+            maxsize=pool_size,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+        )
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Origin": SITE_BASE_URL,
+            "Referer": f"{SITE_BASE_URL}/",
+            "Cookie": "; ".join(f"{c['name']}={c['value']}" for c in cookies),
+        }
+
+    def call(self, endpoint_name, payload=None):
+        """
+        调用一个后端接口并返回其 data 字段。
+
+        :param endpoint_name: 字符串，API_ENDPOINTS 中的键名。
+        :param payload: 字典，请求体。
+        :return: 接口返回的 data 字段。
+        :raises ApiError: 请求失败、HTTP 状态码异常或接口返回非零 code 时抛出。
+        """
+        url = self.base_url + API_ENDPOINTS[endpoint_name]
+        try:
+            response = self.http.request("POST", url, body=json.dumps(payload or {}).encode("utf-8"),
+                                         headers=self.headers)
+        except urllib3.exceptions.HTTPError as e:
+            raise ApiError(f"请求 {endpoint_name} 失败: {e}") from e
+
+        if response.status != 200:
+            raise ApiError(f"请求 {endpoint_name} 返回 HTTP {response.status}")
+        try:
+            body = json.loads(response.data.decode("utf-8"))
+        except ValueError as e:
+            raise ApiError(f"请求 {endpoint_name} 返回的不是 JSON") from e
+        if body.get("code", 0) != 0:
+            raise ApiError(f"请求 {endpoint_name} 返回错误 {body.get('code')}: {body.get('msg')}")
+        return body.get("data") or {}
+
+    def daily_check_in(self):
+        """执行每日签到。"""
+        self.call("check_in")
+
+    def list_posts(self, limit=10):
+        """
+        获取“前哨基地”板块按最新排序的帖子列表。
+
+        :param limit: 整数，获取的帖子数量。
+        :return: 帖子字典列表，包含 "id"、"title" 和 "liked"（返回中没有 my_upvote 字段时为 None）。
+        """
+        data = self.call("post_list", {"plate_id": API_OUTPOST_PLATE_ID, "order_by": 1, "limit": limit})
+        posts = []
+        for item in data.get("list", []):
+            posts.append({
+                "id": item.get("post_uuid"),
+                "title": item.get("title", ""),
+                "liked": bool(item["my_upvote"]) if "my_upvote" in item else None,
+            })
+        return [p for p in posts if p["id"]]
+
+    def like_post(self, post_id):
+        """为指定帖子点赞。"""
+        self.call("like", {"post_uuid": post_id, "type": 1, "like_type": 1})
+
+    def comment_post(self, post_id, content=API_COMMENT_CONTENT):
+        """在指定帖子下发表评论。"""
+        self.call("comment", {"post_uuid": post_id, "content": content, "type": 1})
+
+    def browse_post(self, post_id):
+        """打开帖子详情，计入一次浏览。"""
+        self.call("post_detail", {"post_uuid": post_id})
+
+
+def export_cookies(account):
+    """
+    启动浏览器加载账号的配置文件，导出会话 Cookie 并缓存到 COOKIES_DIR。
+
+    :param account: 账号字典。
+    :return: Cookie 字典列表。
+    """
+    driver = setup_driver(account["profile_path"])
+    try:
+        driver.get(SITE_BASE_URL)
+        cookies = driver.get_cookies()
+    finally:
+        driver.quit()
 
+    os.makedirs(COOKIES_DIR, exist_ok=True)
+    with open(os.path.join(COOKIES_DIR, f"{account['name']}.json"), "w", encoding="utf-8") as f:
+        json.dump(cookies, f, ensure_ascii=False)
+    print(f"已从浏览器配置文件导出账号 {account['name']} 的 {len(cookies)} 个 Cookie。")
+    return cookies
 
 
-def main():
+def load_account_cookies(account, refresh=False):
     """
-    主函数，按顺序执行所有自动化任务。
+    读取账号的会话 Cookie，缓存不存在或已过期时从浏览器配置文件重新导出。
+
+    :param account: 账号字典。
+    :param refresh: 布尔值，为 True 时忽略缓存，强制重新导出。
+    :return: Cookie 字典列表。
+    """
+    cookies_file = os.path.join(COOKIES_DIR, f"{account['name']}.json")
+    if not refresh and os.path.exists(cookies_file) \
+            and time.time() - os.path.getmtime(cookies_file) < COOKIES_MAX_AGE:
+        with open(cookies_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return export_cookies(account)
+
+
+@dataclass
+class ApiTaskPlan:
+    """接口模式下一个帖子任务的执行计划，HTTP 与 async 两种引擎共用。"""
+    task: str
+    action: str  # 运行状态中记录的操作类型
+    method: str  # ApiClient 方法名
+    label: str  # 日志中的动作名称
+    target: int  # 今日需要完成的总数量
+    previous: Set[str]  # 今日已完成的帖子 ID
+    post_ids: list  # 本次需要调用接口的帖子 ID
+
+
+def _plan_api_task(state, name, task, posts):
+    """
+    为接口模式下的一个帖子任务挑选目标帖子。
+
+    :param state: RunStateStore 实例。
+    :param name: 字符串，账号名称。
+    :param task: 字符串，API_FEED_TASKS 中的任务名称。
+    :param posts: ApiClient.list_posts 返回的帖子列表。
+    :return: ApiTaskPlan 实例。
+    """
+    action, method, label = API_FEED_TASKS[task]
+    target = {"like_posts": NUM_TO_LIKE, "post_emoji_comment": NUM_TO_COMMENT, "browse_posts": NUM_TO_BROWSE}[task]
+    previous = state.post_ids(name, action)
+    # 跳过已点赞的帖子，避免再次点击导致取消点赞
+    candidates = [p["id"] for p in posts
+                  if p["id"] not in previous and not (task == "like_posts" and p["liked"])]
+    return ApiTaskPlan(task, action, method, label, target, previous,
+                       candidates[:max(0, target - len(previous))])
+
+
+def _verify_api_tasks_in_browser():
+    """:return: 布尔值，通过接口完成的任务是否需要在浏览器中由积分页面确认（见 API_VERIFY_IN_BROWSER）。"""
+    return API_VERIFY_IN_BROWSER and "check_points_page" in ENABLED_TASKS
+
+
+def _api_task_completed(state, name, task):
+    """
+    记录一个已通过接口完成的任务。
+
+    需要在浏览器中确认时，任务交给积分页面验证，由验证结果记为已完成；否则直接记为今日已完成。
+    """
+    if not _verify_api_tasks_in_browser():
+        state.mark_tasks_done(name, [task])
+
+
+def _finish_api_task(state, name, plan, results, prefix):
+    """
+    记录一个帖子任务的接口调用结果。
+
+    :param state: RunStateStore 实例。
+    :param name: 字符串，账号名称。
+    :param plan: ApiTaskPlan 实例。
+    :param results: 与 plan.post_ids 一一对应的调用结果，失败的位置为异常对象。
+    :param prefix: 字符串，日志前缀。
+    :return: 布尔值，今日完成的数量是否达到目标。
+    """
+    succeeded = [post_id for post_id, r in zip(plan.post_ids, results) if not isinstance(r, Exception)]
+    errors = [r for r in results if isinstance(r, Exception)]
+    state.record_posts(name, plan.action, succeeded)
+    if plan.post_ids:
+        print(f"✅ {prefix} 成功{plan.label} {len(succeeded)} 个帖子。")
+    if errors:
+        print(f"❌ {prefix} {len(errors)} 个帖子{plan.label}失败: {errors[0]}")
+    if len(plan.previous) + len(succeeded) < plan.target:
+        return False
+    _api_task_completed(state, name, plan.task)
+    return True
+
+
+def _call_each(func, post_ids):
+    """
+    逐个调用接口，单个帖子失败时继续处理其余帖子。
+
+    :param func: 可调用对象，接收帖子 ID。
+    :param post_ids: 帖子 ID 列表。
+    :return: 与 post_ids 一一对应的结果列表，失败的位置为 ApiError。
+    """
+    results = []
+    for post_id in post_ids:
+        try:
+            results.append(func(post_id))
+        except ApiError as e:
+            results.append(e)
+    return results
+
+
+def run_account_http(account, client=None):
     """
-    # --- 配置区 ---
-    chrome_profile_path = r"E:\AutoCheckin_chrome_profile"
-    # chrome_profile_path = r"C:\Users\jyr\Desktop\AutoCheckin_chrome_profile"
-    target_url = 'https://www.blablalink.com/points'
+    使用 HTTP 接口模式为单个账号执行每日任务。
+
+    :param account: 账号字典。
+    :param client: ApiClient 实例，可选，默认根据账号的 Cookie 创建。
+    :return: (执行失败、需要退回浏览器执行的任务名称集合, 已通过接口完成的任务名称集合)。
+    """
+    name = account["name"]
+    failed_tasks = set()
+    completed_tasks = set()
+    print(f"\n--- 账号 {name} 使用 HTTP 接口模式执行任务 ---")
+
+    state = get_state_store()
+    # 未选择的任务按已完成处理，不会通过接口执行
+    done = state.completed_tasks(name) | (set(BROWSER_TASKS) - set(ENABLED_TASKS))
+    if not set(POINTS_TASK_IDENTIFIERS) - done:
+        print(f"账号 {name} 今日的任务均已完成。")
+        return failed_tasks, completed_tasks
+
+    try:
+        client = client or ApiClient(load_account_cookies(account))
+    except Exception as e:
+        print(f"❌ 账号 {name} 无法创建接口客户端: {e}")
+        return set(ENABLED_TASKS), completed_tasks
+
+    if "daily_check_in" not in done:
+        try:
+            client.daily_check_in()
+            _api_task_completed(state, name, "daily_check_in")
+            completed_tasks.add("daily_check_in")
+            print("✅ [HTTP] 每日签到成功。")
+        except ApiError as e:
+            print(f"❌ [HTTP] 每日签到失败: {e}")
+            failed_tasks.add("daily_check_in")
+
+    if not FEED_TASKS - done:
+        return failed_tasks, completed_tasks
+
+    try:
+        posts = client.list_posts(limit=max(NUM_TO_LIKE, NUM_TO_BROWSE, NUM_TO_COMMENT) * 2)
+    except ApiError as e:
+        print(f"❌ [HTTP] 获取帖子列表失败: {e}")
+        failed_tasks.update(FEED_TASKS - done)
+        return failed_tasks, completed_tasks
+
+    for task in API_FEED_TASKS:
+        if task in done:
+            continue
+        plan = _plan_api_task(state, name, task, posts)
+        results = _call_each(getattr(client, plan.method), plan.post_ids)
+        if _finish_api_task(state, name, plan, results, "[HTTP]"):
+            completed_tasks.add(task)
+        else:
+            failed_tasks.add(task)
+
+    return failed_tasks, completed_tasks
 
+
+def _browser_followup(name, failed_tasks, completed_tasks):
+    """
+    计算接口模式执行后需要交给浏览器的任务。
+
+    接口执行失败的任务退回浏览器执行，选择了 check_points_page 时由积分页面确认补做的结果。
+    开启 API_VERIFY_IN_BROWSER 时，已通过接口完成的任务也一并交给浏览器，
+    由积分页面确认其进度，积分页面显示未完成时在浏览器中补做。
+
+    :param name: 字符串，账号名称。
+    :param failed_tasks: 接口执行失败的任务名称集合。
+    :param completed_tasks: 已通过接口完成的任务名称集合。
+    :return: 需要在浏览器中执行的任务名称集合，无需启动浏览器时为空集合。
+    """
+    if failed_tasks:
+        print(f"🟡 账号 {name} 有 {len(failed_tasks)} 个任务需要退回浏览器执行: {', '.join(sorted(failed_tasks))}")
+    tasks = set(failed_tasks)
+    if _verify_api_tasks_in_browser():
+        tasks |= set(completed_tasks)
+    if tasks and "check_points_page" in ENABLED_TASKS:
+        tasks.add("check_points_page")
+    return tasks
+
+
+async def _call_api(func, *args, account_semaphore, global_semaphore):
+    """
+    在线程池中执行一个阻塞的接口调用，同时受账号级和全局并发信号量限制。
+
+    先获取账号级信号量，避免在等待同一账号的请求时占用全局名额。
+    """
+    async with account_semaphore:
+        async with global_semaphore:
+            return await asyncio.to_thread(func, *args)
+
+
+async def run_account_async(account, global_semaphore, browser_semaphore, driver_pool=None):
+    """
+    在事件循环中为单个账号执行任务流水线：
+    签到 → 前哨基地最新列表 → 点赞 → 评论 → 浏览 → 浏览器兜底失败的任务并检查积分页面。
+
+    同一账号内相互独立的请求（多个点赞、多个浏览）会并发发出，不同账号之间的网络等待也会相互重叠。
+
+    :param account: 账号字典。
+    :param global_semaphore: asyncio.Semaphore，全局接口请求并发上限。
+    :param browser_semaphore: asyncio.Semaphore，同时运行的浏览器数量上限。
+    :param driver_pool: DriverPool 实例，可选，浏览器兜底执行时使用，见 run_account。
+    :return: 与 run_account 相同格式的结果字典。
+    """
+    name = account["name"]
+    start_time = time.time()
+    account_semaphore = asyncio.Semaphore(ASYNC_ACCOUNT_CONCURRENCY)
+    failed_tasks = set()
+    completed_tasks = set()
+
+    async def call(func, *args):
+        return await _call_api(func, *args, account_semaphore=account_semaphore, global_semaphore=global_semaphore)
+
+    state = get_state_store()
+    # 未选择的任务按已完成处理，不会通过接口执行
+    done = state.completed_tasks(name) | (set(BROWSER_TASKS) - set(ENABLED_TASKS))
+    if not set(POINTS_TASK_IDENTIFIERS) - done:
+        # 在导出 Cookie 之前返回：缓存过期时导出 Cookie 需要启动浏览器
+        print(f"[async] 账号 {name} 今日的任务均已完成。")
+        return {"name": name, "success": True, "error": None, "elapsed": time.time() - start_time}
+
+    try:
+        # 导出 Cookie 可能需要启动浏览器，因此同样受浏览器并发上限约束
+        async with browser_semaphore:
+            cookies = await asyncio.to_thread(load_account_cookies, account)
+        client = ApiClient(cookies)
+    except Exception as e:
+        print(f"❌ 账号 {name} 无法创建接口客户端: {e}")
+        failed_tasks = set(ENABLED_TASKS)
+        client = None
+
+    if client and "daily_check_in" not in done:
+        try:
+            await call(client.daily_check_in)
+            _api_task_completed(state, name, "daily_check_in")
+            completed_tasks.add("daily_check_in")
+            print(f"✅ [async] 账号 {name} 每日签到成功。")
+        except ApiError as e:
+            print(f"❌ [async] 账号 {name} 每日签到失败: {e}")
+            failed_tasks.add("daily_check_in")
+
+    if client and FEED_TASKS - done:
+        try:
+            posts = await call(client.list_posts, max(NUM_TO_LIKE, NUM_TO_BROWSE, NUM_TO_COMMENT) * 2)
+        except ApiError as e:
+            print(f"❌ [async] 账号 {name} 获取帖子列表失败: {e}")
+            posts = None
+            failed_tasks.update(FEED_TASKS - done)
+
+        for task in API_FEED_TASKS:
+            if posts is None or task in done:
+                continue
+            plan = _plan_api_task(state, name, task, posts)
+            results = await asyncio.gather(*(call(getattr(client, plan.method), post_id) for post_id in plan.post_ids),
+                                           return_exceptions=True)
+            if _finish_api_task(state, name, plan, results, f"[async] 账号 {name}"):
+                completed_tasks.add(task)
+            else:
+                failed_tasks.add(task)
+
+    browser_tasks = _browser_followup(name, failed_tasks, completed_tasks)
+    if not browser_tasks:
+        return {"name": name, "success": True, "error": None, "elapsed": time.time() - start_time}
+
+    async with browser_semaphore:
+        result = await asyncio.to_thread(run_account, account, browser_tasks, driver_pool)
+    result["elapsed"] = time.time() - start_time
+    return result
+
+
+async def _run_single_account_async(account, driver_pool=None):
+    """在新的事件循环中只处理一个账号，信号量在该事件循环内创建。"""
+    return await run_account_async(account, asyncio.Semaphore(ASYNC_GLOBAL_CONCURRENCY), asyncio.Semaphore(1),
+                                   driver_pool)
+
+
+async def run_all_accounts_async(accounts, max_browsers=MAX_WORKERS):
+    """
+    在单个事件循环中并发处理所有账号。
+
+    :param accounts: 账号字典列表。
+    :param max_browsers: 整数，兜底执行时同时运行的浏览器数量上限。
+    :return: 每个账号的结果字典列表，顺序与 accounts 一致。
+    """
+    print(f"--- 共 {len(accounts)} 个账号，async 模式（全局请求并发 {ASYNC_GLOBAL_CONCURRENCY}，"
+          f"单账号请求并发 {ASYNC_ACCOUNT_CONCURRENCY}，浏览器并发 {max_browsers}） ---")
+    # 阻塞的接口调用在默认线程池中执行，线程数需要覆盖全局并发上限
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=ASYNC_GLOBAL_CONCURRENCY + max_browsers))
+
+    global_semaphore = asyncio.Semaphore(ASYNC_GLOBAL_CONCURRENCY)
+    browser_semaphore = asyncio.Semaphore(max(1, max_browsers))
+    results = await asyncio.gather(
+        *(run_account_async(account, global_semaphore, browser_semaphore) for account in accounts),
+        return_exceptions=True)
+
+    return [
+        r if not isinstance(r, Exception)
+        else {"name": account["name"], "success": False, "error": str(r), "elapsed": 0.0}
+        for account, r in zip(accounts, results)
+    ]
+
+
+def load_accounts(accounts_file=ACCOUNTS_FILE):
+    """
+    读取多账号配置文件。
+
+    配置文件为一个 JSON 列表，每一项包含账号名称和对应的 Chrome 用户配置文件路径，例如：
+    [{"name": "main", "profile_path": "E:\\AutoCheckin_chrome_profile"}]
+    如果配置文件不存在，则退回到单账号的默认配置。
+
+    :param accounts_file: 字符串，账号配置文件的路径。
+    :return: 账号字典列表，每个字典至少包含 "name" 和 "profile_path"。
+    """
+    if not os.path.exists(accounts_file):
+        print(f"未找到账号配置文件 {accounts_file}，使用默认的单账号配置。")
+        return [{"name": "default", "profile_path": DEFAULT_CHROME_PROFILE_PATH}]
+
+    with open(accounts_file, "r", encoding="utf-8") as f:
+        accounts = json.load(f)
+
+    seen_profiles = set()
+    seen_names = set()
+    for index, account in enumerate(accounts):
+        if "profile_path" not in account:
+            raise ValueError(f"账号配置第 {index + 1} 项缺少 'profile_path'。")
+        account.setdefault("name", f"account-{index + 1}")
+        # 运行状态、Cookie 缓存和常驻计划都以账号名称区分，重名的账号会共用这些数据
+        if account["name"] in seen_names:
+            raise ValueError(f"账号名称 '{account['name']}' 重复，每个账号的名称必须唯一。")
+        seen_names.add(account["name"])
+        # 同一个用户配置文件不能被两个 Chrome 实例同时打开
+        if account["profile_path"] in seen_profiles:
+            raise ValueError(f"账号 '{account['name']}' 的配置文件路径与其他账号重复: {account['profile_path']}")
+        seen_profiles.add(account["profile_path"])
+
+    return accounts
+
+
+class TaskTimeoutError(Exception):
+    """任务单次尝试超过硬超时时抛出。此时浏览器可能仍在执行该任务，不能再继续使用。"""
+
+
+@dataclass
+class TaskContext:
+    """任务图执行时共享的上下文。"""
+    driver: object
+    account: str
+    state: RunStateStore
+    feed: Optional[FeedReader] = None  # 切换到“最新”排序后创建，点赞、评论、浏览任务共用
+    # 积分页面验证未通过的任务：重新执行时不再把本地记录的帖子计入进度（这些操作可能并未生效），
+    # 但仍然跳过这些帖子，避免重复点赞导致取消点赞或重复评论
+    recount: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class TaskNode:
+    """任务图中的一个节点。"""
+    name: str
+    action: Callable  # action(ctx, wait) -> 布尔值，表示任务是否成功
+    depends_on: Tuple[str, ...] = ()
+    retries: Optional[int] = None  # 为 None 时在执行时读取 TASK_RETRIES，命令行或配置的修改因此能够生效
+    timeout: Optional[float] = None  # 为 None 时在执行时读取 TASK_TIMEOUT
+
+
+def _progress(ctx, task, action, target):
+    """
+    计算帖子类任务还需要完成的数量。
+
+    :param ctx: TaskContext 实例。
+    :param task: 字符串，任务名称。
+    :param action: 字符串，RunStateStore 中记录的操作名称（"like"、"comment" 或 "browse"）。
+    :param target: 整数，今日需要完成的总数量。
+    :return: (还需完成的数量, 计入进度的帖子 ID 集合, 需要跳过的帖子 ID 集合)。
+    """
+    recorded = ctx.state.post_ids(ctx.account, action)
+    counted = set() if task in ctx.recount else recorded
+    return max(0, target - len(counted)), counted, recorded
+
+
+def _check_in_action(ctx, wait):
+    ok = daily_check_in(ctx.driver, wait)
+    if ok:
+        ctx.state.mark_tasks_done(ctx.account, ["daily_check_in"])
+    return ok
+
+
+def _like_action(ctx, wait):
+    # 今日已点赞过的帖子也计入进度，只需补足剩余数量，且不能再次点击
+    remaining, previously_liked, skip = _progress(ctx, "like_posts", "like", NUM_TO_LIKE)
+    liked = like_posts(ctx.driver, wait, num_to_like=remaining, skip_post_ids=skip, feed=ctx.feed)
+    ctx.state.record_posts(ctx.account, "like", liked)
+    ok = len(previously_liked) + len(liked) >= NUM_TO_LIKE
+    if ok:
+        ctx.state.mark_tasks_done(ctx.account, ["like_posts"])
+    return ok
+
+
+def _comment_action(ctx, wait):
+    remaining, previously_commented, skip = _progress(ctx, "post_emoji_comment", "comment", NUM_TO_COMMENT)
+    commented = post_emoji_comment(ctx.driver, wait, num_to_comment=remaining, skip_post_ids=skip, feed=ctx.feed)
+    ctx.state.record_posts(ctx.account, "comment", commented)
+    ok = len(previously_commented) + len(commented) >= NUM_TO_COMMENT
+    if ok:
+        ctx.state.mark_tasks_done(ctx.account, ["post_emoji_comment"])
+    return ok
+
+
+def _browse_action(ctx, wait):
+    remaining, previously_browsed, skip = _progress(ctx, "browse_posts", "browse", NUM_TO_BROWSE)
+    browsed = browse_posts(ctx.driver, wait, num_to_browse=remaining, skip_post_ids=skip, feed=ctx.feed)
+    ctx.state.record_posts(ctx.account, "browse", browsed)
+    ok = len(previously_browsed) + len(browsed) >= NUM_TO_BROWSE
+    if ok:
+        ctx.state.mark_tasks_done(ctx.account, ["browse_posts"])
+    return ok
+
+
+def _latest_action(ctx, wait):
+    ok = switch_to_latest_posts(ctx.driver, wait)
+    # 列表已重新渲染，之后的任务共用一个新的帖子索引
+    ctx.feed = FeedReader(ctx.driver) if ok else None
+    return ok
+
+
+# 声明式任务图：点赞、评论、浏览都依赖于“前哨基地”和“最新”排序。节点按执行顺序排列。
+TASK_GRAPH = {
+    node.name: node for node in (
+        TaskNode("daily_check_in", _check_in_action, timeout=30),
+        TaskNode("navigate_to_outpost", lambda ctx, wait: navigate_to_outpost(ctx.driver, wait), timeout=30),
+        TaskNode("switch_to_latest_posts", _latest_action, depends_on=("navigate_to_outpost",), timeout=30),
+        TaskNode("like_posts", _like_action, depends_on=("navigate_to_outpost", "switch_to_latest_posts")),
+        TaskNode("post_emoji_comment", _comment_action,
+                 depends_on=("navigate_to_outpost", "switch_to_latest_posts")),
+        TaskNode("browse_posts", _browse_action, depends_on=("navigate_to_outpost", "switch_to_latest_posts"),
+                 timeout=90),
+    )
+}
+
+
+def _with_dependencies(graph, tasks):
+    """:return: tasks 及其所有（递归）依赖的任务名称集合。"""
+    selected = set()
+    pending = [t for t in tasks if t in graph]
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(graph[name].depends_on)
+    return selected
+
+
+def _run_node(ctx, node, executor):
+    """
+    执行一个任务节点：失败时按带抖动的指数退避重试，每次尝试都有硬超时。
+
+    :return: 布尔值，任务最终是否成功。
+    :raises TaskTimeoutError: 某次尝试超过硬超时。
+    """
+    retries = TASK_RETRIES if node.retries is None else node.retries
+    timeout = TASK_TIMEOUT if node.timeout is None else node.timeout
+    for attempt in range(retries + 1):
+        if attempt > 0:
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            print(f"🟡 任务 {node.name} 第 {attempt} 次重试，{delay:.1f} 秒后开始...")
+            time.sleep(delay)
+
+        # 显式等待不超过任务的硬超时，让大多数超时以普通失败的方式结束
+        wait = make_wait(ctx.driver, min(WAIT_TIMEOUT, timeout))
+        future = executor.submit(node.action, ctx, wait)
+        try:
+            if future.result(timeout=timeout):
+                return True
+        except FutureTimeoutError:
+            raise TaskTimeoutError(f"任务 {node.name} 超过 {timeout} 秒仍未完成")
+        except Exception as e:
+            print(f"❌ 任务 {node.name} 出现未处理的异常: {e}")
+    return False
+
+
+def run_task_graph(ctx, tasks, graph=None):
+    """
+    按依赖关系执行任务图中的指定任务（自动包含其依赖）。依赖失败的任务不会执行。
+
+    :param ctx: TaskContext 实例。
+    :param tasks: 需要执行的任务名称集合。
+    :param graph: 任务图，默认使用 TASK_GRAPH。
+    :return: 字典，任务名称 → "success" / "failed" / "skipped"。
+    """
+    graph = graph or TASK_GRAPH
+    selected = _with_dependencies(graph, tasks)
+    statuses = {}
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"task-{ctx.account}")
+    try:
+        for name, node in graph.items():
+            if name not in selected:
+                continue
+            failed_deps = [dep for dep in node.depends_on if statuses.get(dep) != "success"]
+            if failed_deps:
+                print(f"⏭️ 任务 {name} 的依赖 {', '.join(failed_deps)} 未成功，跳过。")
+                statuses[name] = "skipped"
+                continue
+            statuses[name] = "success" if _run_node(ctx, node, executor) else "failed"
+    finally:
+        # 超时的任务可能仍在执行，不等待它结束（调用方会关闭浏览器使其退出）
+        executor.shutdown(wait=False)
+    return statuses
+
+
+def run_tasks_with_verification(ctx, tasks):
+    """
+    执行任务图，并以积分页面的进度作为最终验证：验证未通过的任务（连同其依赖）会被重新执行。
+
+    :param ctx: TaskContext 实例。
+    :param tasks: 需要执行的任务名称集合，包含 "check_points_page" 时才进行验证。
+    :return: 字典，任务名称 → "success" / "failed" / "skipped"（只包含 tasks 中的任务）。
+    """
+    requested = {t for t in tasks if t in TASK_GRAPH}
+    statuses = run_task_graph(ctx, requested)
+
+    if "check_points_page" in tasks:
+        for verify_round in range(VERIFY_ROUNDS + 1):
+            snapshot = check_points_page(ctx.driver, make_wait(ctx.driver))
+            if not snapshot or not snapshot.tasks:
+                statuses["check_points_page"] = "failed"
+                break
+            ctx.state.mark_tasks_done(ctx.account, snapshot.completed_tasks())
+            statuses["check_points_page"] = "success"
+            unverified = {t for t in requested if t in POINTS_TASK_IDENTIFIERS} - snapshot.completed_tasks()
+            for name in unverified:
+                statuses[name] = "failed"
+            if not unverified or verify_round == VERIFY_ROUNDS:
+                break
+            print(f"🟡 积分页面显示以下任务尚未完成，仅重新执行这些任务: {', '.join(sorted(unverified))}")
+            # 本地记录的帖子没有让积分页面的进度完成，重新执行时按完整数量补做
+            ctx.recount.update(unverified)
+            statuses.update(run_task_graph(ctx, unverified))
+
+    return {name: status for name, status in statuses.items() if name in tasks}
+
+
+def _unfinished_tasks(tasks, statuses):
+    """
+    根据每个任务的执行结果找出未完成的任务。没有执行结果的任务（例如未知的任务名称）同样视为未完成，
+    账号只有在所有请求的任务都明确成功时才算成功。
+
+    :param tasks: 请求执行的任务名称集合。
+    :param statuses: 字典，任务名称 → "success" / "failed" / "skipped"。
+    :return: 未完成的任务名称列表（已排序）。
+    """
+    return sorted(t for t in tasks if statuses.get(t) != "success")
+
+
+def run_account(account, tasks=None, driver_pool=None):
+    """
+    为单个账号启动浏览器并按顺序执行自动化任务。
+
+    所有异常都在本函数内部处理，保证一个账号的失败不会影响其他账号。
+
+    :param account: 账号字典，包含 "name" 和 "profile_path"。
+    :param tasks: 需要执行的任务名称集合，默认执行 ENABLED_TASKS 中的任务。
+    :param driver_pool: DriverPool 实例，可选。提供时从池中取用常驻浏览器并切换到该账号的会话，
+                        否则用账号的配置文件启动一个新的浏览器。
+    :return: 字典，包含账号名称、是否成功、错误信息和耗时（秒）。
+    """
+    tasks = set(ENABLED_TASKS if tasks is None else tasks)
+    name = account["name"]
+    result = {"name": name, "success": False, "error": None, "elapsed": 0.0}
+    start_time = time.time()
+    print(f"\n===== 开始处理账号: {name} =====")
+
+    # 根据本地运行状态跳过今日已完成的任务，从上次中断的地方继续
+    state = get_state_store()
+    cached_completed = state.completed_tasks(name) & tasks
+    if cached_completed:
+        print(f"ℹ️ 本地记录显示以下任务今日已完成，将跳过: {', '.join(sorted(cached_completed))}")
+        tasks -= cached_completed
+        if not tasks - {"check_points_page"}:
+            print(f"账号 {name} 今日的任务均已完成，无需启动浏览器。")
+            result["success"] = True
+            return result
+
+    metrics = RunMetrics(name)
     driver = None  # 初始化 driver 变量
+    driver_broken = False
+    # 等待本机资源允许后再启动浏览器
+    governor = get_governor()
+    session = governor.acquire(name)
     try:
         # 1. 初始化浏览器
-        driver = setup_driver(chrome_profile_path)
-        driver.get(target_url)
-        wait = WebDriverWait(driver, 20)  # 设置一个全局的显式等待
+        launch_entry = metrics.start_task("setup_driver")
+        try:
+            if driver_pool is not None:
+                cookies = load_account_cookies(account)
+                driver = driver_pool.acquire()
+                load_session(driver, cookies)
+            else:
+                driver = setup_driver(account["profile_path"])
+        finally:
+            metrics.end_task(launch_entry, driver is not None)
+        governor.launched(session, driver)
+        instrument_driver(driver, metrics)
+        attach_network_monitor(driver)
+        driver.get(TARGET_URL)
+        wait = make_wait(driver)  # 设置一个全局的显式等待
+
+        # 在执行任务前读取积分页面的进度快照，跳过已经完成的任务
+        snapshot = scrape_points_progress(driver, wait)
+        state.mark_tasks_done(name, snapshot.completed_tasks())
+        already_completed = snapshot.completed_tasks() & tasks
+        if already_completed:
+            print(f"ℹ️ 以下任务今日已完成，将跳过: {', '.join(sorted(already_completed))}")
+            tasks -= already_completed
 
         # 留足够的时间让你手动登录
         # time.sleep(1000)
 
-        # 2. 执行每日签到
-        daily_check_in(driver, wait)
+        # 2. 按任务图执行签到、前哨基地、最新排序、点赞、评论、浏览，并在积分页面验证
+        statuses = run_tasks_with_verification(TaskContext(driver, name, state), tasks)
+        unfinished = _unfinished_tasks(tasks, statuses)
+        if unfinished:
+            result["error"] = f"未完成的任务: {', '.join(unfinished)}"
+        else:
+            print(f"\n账号 {name} 的所有任务已成功执行完毕！")
+            result["success"] = True
 
-        # 3. 导航到前哨基地
-        navigate_to_outpost(driver, wait)
+    except Exception as e:
+        print(f"\n账号 {name} 在主流程中捕获到未处理的异常: {e}")
+        result["error"] = str(e)
+        driver_broken = True
+    finally:
+        # 在关闭浏览器之前测量其资源占用；浏览器池中内存超过上限的浏览器会被回收
+        over_ceiling = governor.release(session, driver)
+        if driver and driver_pool is not None:
+            try:
+                # 去掉本账号的计时包装，再把浏览器交给下一个账号。切换会话失败时浏览器尚未被包装
+                if hasattr(driver, "_unwrapped_execute"):
+                    driver.execute = driver._unwrapped_execute
+                    driver.run_metrics = None
+            finally:
+                # 无论如何都要归还，否则池中的启动名额不会释放，之后取用浏览器的线程会一直等待
+                driver_pool.release(driver, broken=driver_broken or over_ceiling)
+            print(f"--- 账号 {name} 的浏览器已归还到浏览器池 ---")
+        elif driver:
+            driver.quit()
+            print(f"--- 账号 {name} 的浏览器已关闭 ---")
 
-        # 4. 切换到最新帖子
-        switch_to_latest_posts(driver, wait)
+    result["elapsed"] = time.time() - start_time
+    result["report"] = metrics.to_dict()
+    try:
+        report_path = metrics.save(REPORTS_DIR)
+        print(f"账号 {name} 的计时报告已保存到 {report_path}")
+    except OSError as e:
+        print(f"🟡 保存账号 {name} 的计时报告失败: {e}")
+    return result
 
-        # 5. 点赞 5 个帖子
-        like_posts(driver, wait, num_to_like=5)
 
-        # 6. 发表一个表情评论
-        post_emoji_comment(driver, wait)
+def process_account(account, driver_pool=None):
+    """
+    按 ENGINE 配置处理单个账号。
 
-        # 7. 浏览 3 个帖子
-        browse_posts(driver, wait, num_to_browse=3)
+    HTTP 接口模式下，接口执行失败的任务会退回浏览器重新执行，并在浏览器中检查积分页面，
+    确认通过接口完成的任务确实计入了积分进度。async 模式下（常驻模式按账号调度时）
+    在当前线程的事件循环中运行该账号的 async 流水线，同一账号内的接口请求仍并发发出。
 
-        print("\n所有任务已成功执行完毕！")
+    :param account: 账号字典。
+    :param driver_pool: DriverPool 实例，可选，见 run_account。
+    :return: 与 run_account 相同格式的结果字典。
+    :raises ValueError: ENGINE 不是 "browser"、"http" 或 "async" 时抛出。
+    """
+    if ENGINE == "browser":
+        return run_account(account, driver_pool=driver_pool)
+    if ENGINE == "async":
+        return asyncio.run(_run_single_account_async(account, driver_pool))
+    if ENGINE != "http":
+        raise ValueError(f"未知的任务引擎 ENGINE={ENGINE!r}，可选: browser、http、async")
 
-        # 8. 检查积分页面
-        check_points_page(driver, wait)
+    start_time = time.time()
+    browser_tasks = _browser_followup(account["name"], *run_account_http(account))
+    if not browser_tasks:
+        print(f"\n账号 {account['name']} 的所有任务已通过 HTTP 接口完成！")
+        return {"name": account["name"], "success": True, "error": None, "elapsed": time.time() - start_time}
 
-    except Exception as e:
-        print(f"\n在主流程中捕获到未处理的异常: {e}")
+    result = run_account(account, tasks=browser_tasks, driver_pool=driver_pool)
+    result["elapsed"] = time.time() - start_time
+    return result
+
+
+def run_all_accounts(accounts, max_workers=MAX_WORKERS):
+    """
+    使用有上限的线程池并发处理多个账号。
+
+    每个账号在独立的线程中运行，并拥有自己的浏览器进程，
+    因此总耗时约为 ceil(账号数 / max_workers) 个单账号耗时。
+
+    :param accounts: 账号字典列表。
+    :param max_workers: 整数，同时运行的浏览器数量上限。
+    :return: 每个账号的结果字典列表，顺序与 accounts 一致。
+    """
+    max_workers = max(1, min(max_workers, len(accounts)))
+    print(f"--- 共 {len(accounts)} 个账号，并发数: {max_workers}，会话模式: {SESSION_MODE} ---")
+
+    # cookies 模式下每个工作线程复用一个常驻浏览器
+    driver_pool = DriverPool(max_workers) if SESSION_MODE == "cookies" else None
+
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="account") as executor:
+            futures = [executor.submit(process_account, account, driver_pool) for account in accounts]
+            for account, future in zip(accounts, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # process_account 内部已处理异常，这里只是最后的保护
+                    results.append({"name": account["name"], "success": False, "error": str(e), "elapsed": 0.0})
     finally:
-        if driver:
-            time.sleep(5)
-            driver.quit()
-            print("--- 浏览器已关闭 ---")
+        if driver_pool is not None:
+            driver_pool.close()
+
+    return results
+
+
+def print_summary(results, total_elapsed):
+    """
+    打印所有账号的运行汇总。
+
+    :param results: run_all_accounts 返回的结果列表。
+    :param total_elapsed: 浮点数，整体运行耗时（秒）。
+    """
+    succeeded = sum(1 for r in results if r["success"])
+    print("\n========== 运行汇总 ==========")
+    for r in results:
+        status = "✅ 成功" if r["success"] else f"❌ 失败: {r['error']}"
+        print(f"  {r['name']}: {status}（耗时 {r['elapsed']:.1f} 秒）")
+    print(f"共 {len(results)} 个账号，成功 {succeeded} 个，失败 {len(results) - succeeded} 个，总耗时 {total_elapsed:.1f} 秒。")
+
+
+def next_server_reset(now=None):
+    """
+    计算下一次服务器每日重置的时刻。
+
+    :param now: 带时区的 datetime，默认为当前时间。
+    :return: 带时区的 datetime（UTC）。
+    """
+    now = now or datetime.now(timezone.utc)
+    server_now = now.astimezone(timezone(timedelta(hours=SERVER_UTC_OFFSET_HOURS)))
+    reset = server_now.replace(hour=SERVER_RESET_HOUR, minute=0, second=0, microsecond=0)
+    if reset <= server_now:
+        reset += timedelta(days=1)
+    return reset.astimezone(timezone.utc)
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """常驻模式的只读状态接口，GET /status 返回与状态文件相同的 JSON。"""
+
+    scheduler = None
+
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/status"):
+            self.send_error(404)
+            return
+        body = json.dumps(self.scheduler.status(), ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DaemonScheduler:
+    """
+    常驻模式的调度器。
+
+    每个服务器日在重置后 DAEMON_START_DELAY_MINUTES 分钟开始，把各账号的开始时间在 DAEMON_WINDOW_MINUTES
+    内均匀错开，同时运行的账号不超过 max_workers 个，以平滑 CPU、内存和请求压力。失败的账号在
+    DAEMON_RETRY_DELAY_MINUTES 分钟后重试，每天最多 DAEMON_MAX_ATTEMPTS 次。
+    每次状态变化都会写入 DAEMON_STATUS_FILE。
+    """
+
+    def __init__(self, accounts, max_workers=MAX_WORKERS):
+        """
+        :param accounts: 账号字典列表。
+        :param max_workers: 整数，同时运行的账号（浏览器）数量上限。
+        """
+        self.accounts = {account["name"]: account for account in accounts}
+        self.max_workers = max(1, min(max_workers, len(accounts)))
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.started_at = datetime.now(timezone.utc)
+        self.day = None
+        self.entries = {}
+        self.running = {}  # Future -> (服务器日, 账号名称)
+
+    def plan_day(self, now):
+        """
+        为当前服务器日安排每个账号的开始时间。启动时已经过了计划窗口的开始时刻，则从现在开始错开。
+
+        :param now: 带时区的 datetime。
+        """
+        get_governor().print_capacity()
+        window_start = next_server_reset(now) - timedelta(days=1) + timedelta(minutes=DAEMON_START_DELAY_MINUTES)
+        start = max(window_start, now)
+        step = timedelta(minutes=DAEMON_WINDOW_MINUTES) / len(self.accounts)
+        with self.lock:
+            self.day = server_day(now)
+            self.entries = {
+                name: {"status": "pending", "due": start + step * i, "attempts": 0, "last_error": None,
+                       "last_elapsed": None, "finished_at": None}
+                for i, name in enumerate(self.accounts)
+            }
+        print(f"\n--- 服务器日 {self.day}：{len(self.accounts)} 个账号将从 "
+              f"{start.astimezone():%H:%M:%S} 起每隔 {step.total_seconds():.0f} 秒依次开始 ---")
+
+    def _due_entries(self, now):
+        running_names = {name for _, name in self.running.values()}
+        with self.lock:
+            return sorted(
+                (name for name, entry in self.entries.items()
+                 if entry["status"] in ("pending", "retry") and entry["due"] <= now and name not in running_names),
+                key=lambda name: self.entries[name]["due"])
+
+    def _finish(self, day, name, result):
+        """
+        记录一个账号的运行结果，失败且未达到尝试上限时安排重试。
+        """
+        now = datetime.now(timezone.utc)
+        with self.lock:
+            if day != self.day:
+                return  # 跨日时上一日仍在运行的账号，结果不再影响新一天的计划
+            entry = self.entries[name]
+            entry.update(last_error=result.get("error"), last_elapsed=result.get("elapsed"), finished_at=now)
+            if result.get("success"):
+                entry["status"] = "done"
+            elif entry["attempts"] < DAEMON_MAX_ATTEMPTS:
+                entry["status"] = "retry"
+                entry["due"] = now + timedelta(minutes=DAEMON_RETRY_DELAY_MINUTES)
+            else:
+                entry["status"] = "failed"
+        if entry["status"] == "retry":
+            print(f"🟡 账号 {name} 第 {entry['attempts']} 次运行失败，将于 {entry['due'].astimezone():%H:%M:%S} 重试。")
+        elif entry["status"] == "failed":
+            print(f"❌ 账号 {name} 今日已尝试 {entry['attempts']} 次，均未成功，等待下一个服务器日。")
+
+    def status(self):
+        """
+        :return: 可序列化为 JSON 的状态字典。
+        """
+        def iso(value):
+            return value.isoformat() if value else None
+
+        with self.lock:
+            accounts = {
+                name: {**entry, "due": iso(entry["due"]), "finished_at": iso(entry["finished_at"])}
+                for name, entry in self.entries.items()
+            }
+            day = self.day
+        return {
+            "started_at": iso(self.started_at),
+            "updated_at": iso(datetime.now(timezone.utc)),
+            "server_day": day,
+            "next_reset": iso(next_server_reset()),
+            "running": len(self.running),
+            "max_workers": self.max_workers,
+            "capacity": get_governor().capacity(),
+            "accounts": accounts,
+        }
+
+    def write_status(self):
+        """把状态原子地写入 DAEMON_STATUS_FILE。"""
+        if not DAEMON_STATUS_FILE:
+            return
+        tmp_path = f"{DAEMON_STATUS_FILE}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.status(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, DAEMON_STATUS_FILE)
+        except OSError as e:
+            print(f"🟡 写入状态文件失败: {e}")
+
+    def _next_wakeup(self, now):
+        """
+        :return: 距离下一个需要处理的时刻（下一个到期账号或下一次服务器重置）的秒数。
+        """
+        with self.lock:
+            waiting = [entry["due"] for entry in self.entries.values() if entry["status"] in ("pending", "retry")]
+        next_time = min(waiting + [next_server_reset(now)])
+        return max(0.0, (next_time - now).total_seconds())
+
+    def stop(self):
+        """请求调度器在当前运行的账号结束后退出。"""
+        self.stop_event.set()
+
+    def run_forever(self):
+        """
+        持续运行，直到调用 stop 或收到 KeyboardInterrupt。
+        """
+        print(f"--- 常驻模式启动：共 {len(self.accounts)} 个账号，并发上限 {self.max_workers}，"
+              f"状态文件 {DAEMON_STATUS_FILE} ---")
+        status_server = None
+        if DAEMON_STATUS_PORT:
+            _StatusHandler.scheduler = self
+            status_server = ThreadingHTTPServer(("127.0.0.1", DAEMON_STATUS_PORT), _StatusHandler)
+            threading.Thread(target=status_server.serve_forever, daemon=True).start()
+            print(f"状态接口: http://127.0.0.1:{DAEMON_STATUS_PORT}/status")
+
+        # cookies 模式下常驻浏览器在多个账号之间复用，没有账号运行时关闭以释放内存
+        driver_pool = DriverPool(self.max_workers) if SESSION_MODE == "cookies" else None
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="account")
+        try:
+            while not self.stop_event.is_set():
+                now = datetime.now(timezone.utc)
+                if server_day(now) != self.day:
+                    self.plan_day(now)
+                    self.write_status()
+
+                for name in self._due_entries(now)[:self.max_workers - len(self.running)]:
+                    with self.lock:
+                        entry = self.entries[name]
+                        entry["status"] = "running"
+                        entry["attempts"] += 1
+                    future = executor.submit(process_account, self.accounts[name], driver_pool)
+                    self.running[future] = (self.day, name)
+                    self.write_status()
+
+                # 并发已满时只需等待有账号结束；设置最短等待时间，避免到期账号无法启动时空转
+                if len(self.running) < self.max_workers:
+                    timeout = self._next_wakeup(now)
+                else:
+                    timeout = (next_server_reset(now) - now).total_seconds()
+                timeout = max(timeout, 0.2)
+                if self.running:
+                    done, _ = futures_wait(list(self.running), timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        day, name = self.running.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            # process_account 内部已处理异常，这里只是最后的保护
+                            result = {"name": name, "success": False, "error": str(e), "elapsed": 0.0}
+                        self._finish(day, name, result)
+                    if done:
+                        self.write_status()
+                    if not self.running and driver_pool is not None:
+                        driver_pool.close()
+                else:
+                    self.stop_event.wait(timeout)
+        except KeyboardInterrupt:
+            print("\n收到中断信号，等待正在运行的账号结束后退出...")
+        finally:
+            executor.shutdown(wait=True)
+            if driver_pool is not None:
+                driver_pool.close()
+            if status_server is not None:
+                status_server.shutdown()
+            self.running.clear()
+            self.write_status()
+
+
+def run_daemon(accounts, max_workers=MAX_WORKERS):
+    """
+    以常驻模式运行：每个服务器日自动错开执行所有账号，见 DaemonScheduler。
+
+    :param accounts: 账号字典列表。
+    :param max_workers: 整数，同时运行的账号数量上限。
+    """
+    DaemonScheduler(accounts, max_workers).run_forever()
+
+
+def dry_run(accounts_file=ACCOUNTS_FILE):
+    """
+    只检查配置，不导入 selenium、也不启动浏览器：账号配置文件、每个账号的配置文件目录和 Cookie 缓存，
+    以及所需的依赖是否已安装。
+
+    :param accounts_file: 字符串，账号配置文件的路径。
+    :return: 布尔值，没有发现错误时为 True。
+    """
+    start = time.perf_counter()
+    print(f"--- 检查配置（引擎: {ENGINE}，会话模式: {SESSION_MODE}，任务: {', '.join(ENABLED_TASKS)}） ---")
+    try:
+        accounts = load_accounts(accounts_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ 账号配置无效: {e}")
+        return False
+
+    errors = 0
+    if importlib.util.find_spec("selenium") is None:
+        # HTTP 接口模式只有在导出 Cookie 或退回浏览器时才需要 selenium
+        if ENGINE == "browser":
+            print("❌ 未安装 selenium。")
+            errors += 1
+        else:
+            print("🟡 未安装 selenium，导出 Cookie 和失败任务退回浏览器执行时将不可用。")
+    if MAX_WORKERS < 1:
+        print(f"❌ MAX_WORKERS 必须大于 0，当前为 {MAX_WORKERS}。")
+        errors += 1
+
+    # 以下情况需要账号的会话 Cookie：HTTP / async 引擎，或浏览器池复用模式
+    needs_cookies = ENGINE != "browser" or SESSION_MODE == "cookies"
+    for account in accounts:
+        profile_ok = os.path.isdir(account["profile_path"])
+        cookies_file = os.path.join(COOKIES_DIR, f"{account['name']}.json")
+        cookies_fresh = os.path.exists(cookies_file) \
+            and time.time() - os.path.getmtime(cookies_file) < COOKIES_MAX_AGE
+        if needs_cookies and cookies_fresh:
+            print(f"✅ {account['name']}: Cookie 缓存有效。")
+        elif profile_ok:
+            print(f"✅ {account['name']}: 配置文件目录 {account['profile_path']}")
+        else:
+            print(f"❌ {account['name']}: 配置文件目录不存在: {account['profile_path']}")
+            errors += 1
+
+    elapsed = (time.perf_counter() - start) * 1000
+    if errors:
+        print(f"共 {len(accounts)} 个账号，发现 {errors} 个问题（检查耗时 {elapsed:.0f} 毫秒）。")
+    else:
+        print(f"共 {len(accounts)} 个账号，配置检查通过（检查耗时 {elapsed:.0f} 毫秒）。")
+    return errors == 0
+
+
+def parse_args(argv=None):
+    """
+    解析命令行参数。未指定的参数沿用文件顶部的全局常量。
+
+    :param argv: 参数列表，默认为 sys.argv[1:]。
+    :return: argparse.Namespace，其中 tasks 已解析为任务名称元组。
+    """
+    parser = argparse.ArgumentParser(description="blablalink 每日任务自动化。")
+    parser.add_argument("--accounts", default=ACCOUNTS_FILE, help="账号配置文件路径")
+    parser.add_argument("--account", action="append", dest="account_names", metavar="NAME",
+                        help="只处理指定名称的账号，可重复指定")
+    parser.add_argument("--tasks", help=f"逗号分隔的任务列表，默认全部执行。可选: {', '.join(BROWSER_TASKS)}")
+    parser.add_argument("--num-to-like", type=int, default=NUM_TO_LIKE, help="需要点赞的帖子数量")
+    parser.add_argument("--num-to-browse", type=int, default=NUM_TO_BROWSE, help="需要浏览的帖子数量")
+    parser.add_argument("--num-to-comment", type=int, default=NUM_TO_COMMENT, help="需要评论的帖子数量")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="同时运行的浏览器数量上限")
+    parser.add_argument("--engine", choices=("browser", "http", "async"), default=ENGINE, help="任务引擎")
+    parser.add_argument("--fast", action="store_true", help="开启 FAST_MODE，去掉所有装饰性的停留")
+    parser.add_argument("--headless", action="store_true", help="以无头模式启动浏览器（配置文件需已登录）")
+    parser.add_argument("--daemon", action="store_true", help="常驻运行，每天服务器重置后自动错开执行")
+    parser.add_argument("--dry-run", action="store_true", help="只检查配置，不导入 selenium、也不启动浏览器")
+    args = parser.parse_args(argv)
+
+    if args.tasks:
+        tasks = tuple(t.strip() for t in args.tasks.split(",") if t.strip())
+        unknown = [t for t in tasks if t not in BROWSER_TASKS]
+        if unknown:
+            parser.error(f"未知的任务: {', '.join(unknown)}。可选: {', '.join(BROWSER_TASKS)}")
+        # 保持 BROWSER_TASKS 中的执行顺序
+        args.tasks = tuple(t for t in BROWSER_TASKS if t in tasks)
+    else:
+        args.tasks = ENABLED_TASKS
+    if args.workers < 1:
+        parser.error("--workers 必须大于 0")
+    if min(args.num_to_like, args.num_to_browse, args.num_to_comment) < 0:
+        parser.error("--num-to-like、--num-to-browse、--num-to-comment 不能为负数")
+    return args
+
+
+def main(argv=None):
+    """
+    主函数，解析命令行参数，读取账号配置并并发执行所有账号的自动化任务；DAEMON_MODE 开启时改为常驻运行。
+
+    :param argv: 命令行参数列表，默认为 sys.argv[1:]。
+    """
+    global ENABLED_TASKS, NUM_TO_LIKE, NUM_TO_BROWSE, NUM_TO_COMMENT, MAX_WORKERS, ENGINE, FAST_MODE, DAEMON_MODE
+    global BROWSER_OPTIONS
+    args = parse_args(argv)
+    ENABLED_TASKS = args.tasks
+    NUM_TO_LIKE = args.num_to_like
+    NUM_TO_BROWSE = args.num_to_browse
+    NUM_TO_COMMENT = args.num_to_comment
+    MAX_WORKERS = args.workers
+    ENGINE = args.engine
+    FAST_MODE = FAST_MODE or args.fast
+    DAEMON_MODE = DAEMON_MODE or args.daemon
+    if args.headless:
+        BROWSER_OPTIONS = dict(BROWSER_OPTIONS, headless=True)
+
+    if args.dry_run:
+        sys.exit(0 if dry_run(args.accounts) else 1)
+
+    accounts = load_accounts(args.accounts)
+    if args.account_names:
+        unknown = set(args.account_names) - {account["name"] for account in accounts}
+        if unknown:
+            sys.exit(f"❌ 账号配置中没有以下账号: {', '.join(sorted(unknown))}")
+        accounts = [account for account in accounts if account["name"] in args.account_names]
+
+    # 上次运行中各定位器命中的策略，所有账号共用
+    SELECTORS.load_cache()
+    if DAEMON_MODE:
+        try:
+            run_daemon(accounts, max_workers=MAX_WORKERS)
+        finally:
+            SELECTORS.save_cache()
+        return
+
+    start_time = time.time()
+    if ENGINE == "async":
+        results = asyncio.run(run_all_accounts_async(accounts, max_browsers=MAX_WORKERS))
+    else:
+        results = run_all_accounts(accounts, max_workers=MAX_WORKERS)
+    print_summary(results, time.time() - start_time)
+    print_latency_summary([r["report"] for r in results if r.get("report")])
+    SELECTORS.print_stats()
+    SELECTORS.save_cache()
+    get_governor().print_capacity()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,384 @@
+"""
+离线基准测试：在本地模拟 blablalink 的页面，用无头 Chrome 端到端运行 AutoCheckin.py 中的各个任务函数，
+输出每个任务的耗时、WebDriver 往返次数和浏览器内存峰值。
+
+页面模板位于 bench_fixtures/ 目录，复现了各定位器依赖的 DOM 结构：
+- 积分页面（/points）：“每日簽到”任务行、“x / y”进度和“展开”按钮
+- 前哨基地（/?plate_type=outpost）：熱門/最新 排序菜单、card-item 帖子和点赞按钮
+- 帖子详情（/post/<id>）：“發佈我的看法”、評論/發送 评论面板和表情列表
+本地服务器同时实现了页面调用的后端接口（与 AutoCheckin.API_ENDPOINTS 路径相同），因此 HTTP 接口模式也可以指向它测试。
+
+用法:
+    python benchmark.py --runs 3 --output bench_results.json
+    python benchmark.py --runs 3 --baseline bench_results.json   # 与之前的结果比较，发现性能回退
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import AutoCheckin
+
+try:
+    import psutil  # 可选依赖，用于统计浏览器进程的内存峰值
+except ImportError:
+    psutil = None
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures")
+NUM_POSTS = 12  # 模拟的帖子数量
+
+
+class MockSiteState:
+    """模拟站点的服务端状态，每一轮基准测试开始前重置。"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.checked_in = False
+            self.posts = [
+                {"id": f"post-{i:03d}", "title": f"前哨基地測試貼文 {i}", "likes": i, "comments": 0, "liked": False}
+                for i in range(NUM_POSTS)
+            ]
+            self.liked_ids = set()
+            self.browsed_ids = set()
+            self.comments = 0
+
+    def post(self, post_id):
+        return next((p for p in self.posts if p["id"] == post_id), None)
+
+
+class MockSiteHandler(BaseHTTPRequestHandler):
+    """按路径返回页面模板或模拟的接口响应。"""
+
+    state = None  # MockSiteState 实例，由 start_mock_server 设置
+
+    def log_message(self, format, *args):
+        pass  # 保持基准测试输出整洁
+
+    def _send(self, status, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _render(self, name, replacements):
+        with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+            html = f.read()
+        for key, value in replacements.items():
+            html = html.replace("{{" + key + "}}", str(value))
+        self._send(200, html, "text/html; charset=utf-8")
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        state = self.state
+        with state.lock:
+            if path == "/points":
+                self._render("points.html", {
+                    "CHECK_IN_ICON": "icon-gift-true.png" if state.checked_in else "icon-gift.png",
+                    "LIKES": min(len(state.liked_ids), 5),
+                    "BROWSES": min(len(state.browsed_ids), 3),
+                    "COMMENTS": min(state.comments, 1),
+                })
+            elif path == "/":
+                self._render("outpost.html", {"POSTS_JSON": json.dumps(state.posts, ensure_ascii=False)})
+            elif path.startswith("/post/"):
+                post = state.post(path[len("/post/"):])
+                if post is None:
+                    self._send(404, "not found", "text/plain")
+                else:
+                    self._render("post.html", {"POST_TITLE": post["title"],
+                                               "POST_ID_JSON": json.dumps(post["id"])})
+            else:
+                self._send(404, "not found", "text/plain")
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            payload = {}
+
+        state = self.state
+        endpoints = {v: k for k, v in AutoCheckin.API_ENDPOINTS.items()}
+        endpoint = endpoints.get(path)
+        data = {}
+        with state.lock:
+            if path == "/__reset":
+                state.reset()
+            elif endpoint == "check_in":
+                state.checked_in = True
+            elif endpoint == "post_list":
+                posts = list(state.posts)
+                if payload.get("order_by") == 1:
+                    posts.reverse()
+                data = {"list": [{"post_uuid": p["id"], "title": p["title"], "my_upvote": int(p["liked"])}
+                                 for p in posts[:payload.get("limit", len(posts))]]}
+            elif endpoint == "like":
+                post = state.post(payload.get("post_uuid"))
+                if post is None:
+                    return self._send(200, json.dumps({"code": 404, "msg": "post not found"}), "application/json")
+                # 与真实站点一致：再次点赞会取消点赞
+                post["liked"] = not post["liked"]
+                post["likes"] += 1 if post["liked"] else -1
+                if post["liked"]:
+                    state.liked_ids.add(post["id"])
+                data = {"liked": post["liked"]}
+            elif endpoint == "comment":
+                state.comments += 1
+            elif endpoint == "post_detail":
+                state.browsed_ids.add(payload.get("post_uuid"))
+            else:
+                return self._send(404, json.dumps({"code": 404, "msg": "unknown endpoint"}), "application/json")
+        self._send(200, json.dumps({"code": 0, "msg": "ok", "data": data}, ensure_ascii=False), "application/json")
+
+
+def start_mock_server(port=0):
+    """
+    在后台线程中启动模拟站点。
+
+    :param port: 整数，监听端口，0 表示随机端口。
+    :return: (ThreadingHTTPServer 实例, 站点地址)。
+    """
+    handler = type("BoundMockSiteHandler", (MockSiteHandler,), {"state": MockSiteState()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def point_autocheckin_at(base_url):
+    """让 AutoCheckin 中的所有站点地址指向本地模拟站点。"""
+    AutoCheckin.SITE_BASE_URL = base_url
+    AutoCheckin.TARGET_URL = f"{base_url}/points"
+    AutoCheckin.OUTPOST_URL = f"{base_url}/?plate_type=outpost"
+    AutoCheckin.API_BASE_URL = base_url
+
+
+class MemorySampler:
+    """在后台线程中定期采样 chromedriver 及其所有子进程（即浏览器）的内存占用。"""
+
+    def __init__(self, root_pid, interval=0.05):
+        self.root_pid = root_pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        try:
+            root = psutil.Process(self.root_pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            self._stop.wait(self.interval)
+
+    def reset_peak(self):
+        self.peak = self._sample()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_once(base_url, browser_options, profile_path=None, observer=None):
+    """
+    启动一个全新的无头浏览器，按 run_account 的顺序执行全部任务一次。
+
+    :param base_url: 字符串，模拟站点地址。
+    :param browser_options: 字典，传给 setup_driver 的启动选项。
+    :param profile_path: 字符串，使用已有的 Chrome 配置文件（运行后保留），默认使用临时目录。
+    :param observer: 可选，带有 attach(driver) 和 after_step(driver, name, result) 方法的对象，
+                     在浏览器启动后和每个任务结束后调用（见 replay.py）。
+    :return: 字典，包含 RunMetrics 报告、各任务的返回值、内存峰值（字节）和启动耗时。
+    """
+    profile_dir = profile_path or tempfile.mkdtemp(prefix="autocheckin-bench-")
+    metrics = AutoCheckin.RunMetrics("benchmark")
+    driver = None
+    sampler = None
+    peaks = {}
+    results = {}
+    try:
+        launch_start = time.perf_counter()
+        driver = AutoCheckin.setup_driver(profile_dir, browser_options)
+        launch_time = time.perf_counter() - launch_start
+        AutoCheckin.instrument_driver(driver, metrics)
+        AutoCheckin.attach_network_monitor(driver)
+        if observer:
+            observer.attach(driver)
+        wait = AutoCheckin.make_wait(driver)
+
+        if psutil is not None:
+            sampler = MemorySampler(driver.service.process.pid)
+            sampler.start()
+
+        steps = [
+            ("daily_check_in", lambda: (driver.get(AutoCheckin.TARGET_URL),
+                                        AutoCheckin.daily_check_in(driver, wait))[1]),
+            ("navigate_to_outpost", lambda: AutoCheckin.navigate_to_outpost(driver, wait)),
+            ("switch_to_latest_posts", lambda: AutoCheckin.switch_to_latest_posts(driver, wait)),
+            ("like_posts", lambda: AutoCheckin.like_posts(driver, wait, num_to_like=AutoCheckin.NUM_TO_LIKE)),
+            ("post_emoji_comment", lambda: AutoCheckin.post_emoji_comment(
+                driver, wait, num_to_comment=AutoCheckin.NUM_TO_COMMENT)),
+            ("browse_posts", lambda: AutoCheckin.browse_posts(driver, wait, num_to_browse=AutoCheckin.NUM_TO_BROWSE)),
+            ("check_points_page", lambda: AutoCheckin.check_points_page(driver, wait)),
+        ]
+        for name, step in steps:
+            if sampler:
+                sampler.reset_peak()
+            results[name] = step()
+            if sampler:
+                peaks[name] = sampler.peak
+            if observer:
+                observer.after_step(driver, name, results[name])
+    finally:
+        if sampler:
+            sampler.stop()
+        if driver:
+            driver.quit()
+        if not profile_path:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    return {"report": metrics.to_dict(), "results": results, "peaks": peaks, "launch_time": launch_time}
+
+
+def aggregate(runs):
+    """
+    汇总多轮结果：每个任务的耗时中位数、往返次数中位数和内存峰值。
+
+    :param runs: run_once 的返回值列表。
+    :return: 字典，键为任务名称。
+    """
+    results = {}
+    for run in runs:
+        for task in run["report"]["tasks"]:
+            entry = results.setdefault(task["task"], {"wall_time": [], "round_trips": [], "wait_time": [], "peak_rss": []})
+            entry["wall_time"].append(task["wall_time"])
+            entry["round_trips"].append(task["round_trips"])
+            entry["wait_time"].append(task["wait_time"])
+            if task["task"] in run["peaks"]:
+                entry["peak_rss"].append(run["peaks"][task["task"]])
+    return {
+        name: {
+            "wall_time": statistics.median(entry["wall_time"]),
+            "wait_time": statistics.median(entry["wait_time"]),
+            "round_trips": statistics.median(entry["round_trips"]),
+            "peak_rss_mb": max(entry["peak_rss"]) / 1024 / 1024 if entry["peak_rss"] else None,
+        }
+        for name, entry in results.items()
+    }
+
+
+def print_results(results, launch_time):
+    print("\n========== 基准测试结果（中位数） ==========")
+    print(f"  浏览器启动: {launch_time:.2f} 秒")
+    print(f"  {'任务':<24}{'耗时(秒)':>10}{'等待(秒)':>10}{'往返次数':>10}{'内存峰值(MB)':>14}")
+    for name, stats in results.items():
+        peak = f"{stats['peak_rss_mb']:.0f}" if stats["peak_rss_mb"] is not None else "-"
+        print(f"  {name:<24}{stats['wall_time']:>10.2f}{stats['wait_time']:>10.2f}"
+              f"{stats['round_trips']:>10.0f}{peak:>14}")
+    if psutil is None:
+        print("ℹ️ 未安装 psutil，无法统计内存峰值。")
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    与之前保存的结果比较，找出耗时或往返次数明显增加的任务。
+
+    :param results: 本次 aggregate 的结果。
+    :param baseline: 之前保存的结果。
+    :param tolerance: 浮点数，允许的耗时增幅（例如 0.2 表示 20%）。
+    :return: 性能回退描述的列表，为空表示没有回退。
+    """
+    regressions = []
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        if stats["wall_time"] > old["wall_time"] * (1 + tolerance):
+            regressions.append(f"{name}: 耗时 {old['wall_time']:.2f} → {stats['wall_time']:.2f} 秒")
+        if stats["round_trips"] > old["round_trips"]:
+            regressions.append(f"{name}: 往返次数 {old['round_trips']:.0f} → {stats['round_trips']:.0f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在本地模拟站点上对 AutoCheckin 的任务函数进行基准测试。")
+    parser.add_argument("--runs", type=int, default=3, help="重复运行的轮数，结果取中位数")
+    parser.add_argument("--fast", action="store_true", help="开启 FAST_MODE，去掉所有装饰性的停留")
+    parser.add_argument("--headed", action="store_true", help="显示浏览器窗口（默认无头）")
+    parser.add_argument("--no-sandbox", action="store_true", help="以 --no-sandbox 启动 Chrome（容器中以 root 运行时需要）")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    parser.add_argument("--baseline", help="与之前保存的 JSON 结果比较，发现回退时以非零状态码退出")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的耗时增幅，默认 0.2（20%%）")
+    args = parser.parse_args()
+
+    AutoCheckin.FAST_MODE = args.fast
+    AutoCheckin.HIGHLIGHT_ELEMENTS = False
+    # 模拟站点实现了 API_ENDPOINTS 中的全部接口，可以放心使用网络等待
+    AutoCheckin.NETWORK_WAITS = True
+    browser_options = {"headless": not args.headed}
+    if args.no_sandbox:
+        browser_options["extra_arguments"] = ["--no-sandbox"]
+
+    server, base_url = start_mock_server()
+    point_autocheckin_at(base_url)
+    print(f"--- 本地模拟站点已启动: {base_url} ---")
+
+    runs = []
+    try:
+        for i in range(args.runs):
+            print(f"\n===== 第 {i + 1}/{args.runs} 轮 =====")
+            server.RequestHandlerClass.state.reset()
+            runs.append(run_once(base_url, browser_options))
+    finally:
+        server.shutdown()
+
+    results = aggregate(runs)
+    print_results(results, statistics.median(run["launch_time"] for run in runs))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ 发现性能回退:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✅ 与基准结果相比没有性能回退。")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,639 @@
+"""
+录制与回放：把一次真实运行（从 daily_check_in 到 check_points_page）的 HTTP 流量和每个任务结束时的页面 DOM
+保存为磁盘上的存档，之后由本地回放服务器提供这些响应，不访问网络即可重复运行同样的任务函数，
+检查任务结果是否与录制时一致，并像 benchmark.py 一样比较各任务的耗时和往返次数。
+
+录制（使用已登录的账号配置文件，会在真实站点上执行签到、点赞、评论和浏览）:
+    python replay.py record --account main --archive recordings/main
+回放（浏览器的所有域名解析都被禁止，只能访问本地回放服务器；默认零延迟）:
+    python replay.py replay --archive recordings/main --runs 3 --fast --output replay_results.json
+    python replay.py replay --archive recordings/main --latency recorded   # 按录制时的响应耗时回放
+    python replay.py replay --archive recordings/main --baseline replay_results.json
+
+存档目录结构:
+- manifest.json：录制时的站点地址、任务参数、计时报告，以及每个任务的返回值、页面地址和定位器匹配数量
+- traffic.jsonl：每行一个响应（方法、地址、请求体、状态码、Content-Type、响应体、耗时），按请求发出顺序排列
+- snapshots/：每个任务结束时的页面 DOM（outerHTML）
+- cookies.json：录制开始时站点的 Cookie，回放前写入浏览器，使页面脚本看到相同的登录状态
+存档中包含账号的会话数据，请勿提交或分享。
+
+回放时，存档中出现过的所有域名都被改写为本地服务器上的路径（站点本身对应根路径，其他域名对应 /__replay/<域名>/），
+同一地址的多次请求按录制顺序依次返回对应的响应，因此签到前后的积分页面等会返回不同的内容。
+"""
+import argparse
+import base64
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import AutoCheckin
+import benchmark
+
+ARCHIVE_FORMAT = 1
+REPLAY_PREFIX = "/__replay/"  # 站点以外的域名在回放服务器上的路径前缀
+RECORD_BUFFER_BYTES = 200 * 1024 * 1024  # 录制时浏览器为响应体保留的缓冲区，避免在读取前被释放
+# 回放时禁止浏览器解析任何域名，只允许访问本地回放服务器，保证运行完全离线
+OFFLINE_RESOLVER_RULES = "--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE 127.0.0.1"
+# 需要改写其中域名的文本类型响应
+TEXT_CONTENT_TYPES = ("text/", "javascript", "json", "xml", "svg")
+
+# 统计每个定位器在当前页面上匹配的元素数量，一次 execute_script 完成，作为页面结构的指纹
+_SELECTOR_CENSUS_JS = AutoCheckin._RESOLVE_SELECTOR_FN_JS + """
+var specs = arguments[0], counts = {};
+for (var name in specs) {
+    try { counts[name] = resolveSelector(specs[name], null, 'present').elements.length; }
+    catch (e) { counts[name] = -1; }
+}
+return counts;
+"""
+
+
+@contextmanager
+def untracked(driver):
+    """
+    在此期间的 WebDriver 命令绕过 instrument_driver 和录制器的包装：
+    录制和校验本身发出的命令不计入任务的往返次数，录制与回放的计时报告因此可以直接比较。
+    """
+    previous = driver.execute
+    driver.execute = getattr(driver, "_unwrapped_execute", previous)
+    try:
+        yield driver
+    finally:
+        driver.execute = previous
+
+
+def selector_census(driver):
+    """
+    :return: 字典，SELECTORS 中每个定位器在当前页面上匹配的元素数量（不受上次命中策略的影响）。
+    """
+    specs = {name: dict(AutoCheckin.SELECTORS.spec(name), prefer=None) for name in AutoCheckin.SELECTORS.selectors}
+    with untracked(driver):
+        return driver.execute_script(_SELECTOR_CENSUS_JS, specs) or {}
+
+
+def to_jsonable(result):
+    """
+    :return: 任务返回值的 JSON 兼容形式（PointsSnapshot 等 dataclass 转为字典）。
+    """
+    if is_dataclass(result):
+        return asdict(result)
+    if isinstance(result, (list, tuple, set)):
+        return [to_jsonable(item) for item in result]
+    return result
+
+
+class TrafficRecorder:
+    """
+    通过 NetworkMonitor 的事件监听记录浏览器的全部 HTTP 流量。
+
+    每个 WebDriver 命令结束后读取一次性能日志，在请求结束（loadingFinished）时立即通过 CDP 取回响应体，
+    此时响应所在的页面仍然存在，响应体不会因页面跳转而被释放。
+    """
+
+    def __init__(self):
+        self.driver = None
+        self.monitor = None
+        self.entries = []  # 已结束的响应
+        self.pending = {}  # requestId -> 尚未结束的响应
+        self.sequence = 0
+        self._flushing = False
+
+    def attach(self, driver):
+        """
+        开始记录 driver 的网络流量。
+
+        :param driver: 已调用过 instrument_driver 和 attach_network_monitor 的 WebDriver 实例。
+        """
+        self.monitor = AutoCheckin.network_monitor(driver)
+        if self.monitor is None:
+            raise RuntimeError("录制需要浏览器性能日志，请确认 NETWORK_WAITS 已开启且浏览器支持性能日志。")
+        self.driver = driver
+        with untracked(driver):
+            driver.execute_cdp_cmd("Network.enable", {"maxTotalBufferSize": RECORD_BUFFER_BYTES,
+                                                      "maxResourceBufferSize": RECORD_BUFFER_BYTES // 4})
+            # 配置文件中的 HTTP 缓存会产生 304 响应，回放时的全新浏览器没有对应的缓存，因此录制时禁用缓存
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+        self.monitor.listeners.append(self.on_event)
+
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            result = original_execute(driver_command, params)
+            # NetworkMonitor 自己读取日志（getLog）时不能再嵌套读取，否则事件顺序会被打乱
+            if driver_command not in ("getLog", "quit"):
+                self.flush()
+            return result
+
+        driver.execute = execute
+
+    def flush(self):
+        """读取新的性能日志，记录其中的网络事件。"""
+        if self._flushing:
+            return
+        self._flushing = True
+        try:
+            with untracked(self.driver):
+                self.monitor.poll()
+        except Exception as e:
+            print(f"🟡 读取性能日志失败: {e}")
+        finally:
+            self._flushing = False
+
+    def on_event(self, method, params):
+        """NetworkMonitor 的事件监听函数。"""
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            redirect = params.get("redirectResponse")
+            if redirect and request_id in self.pending:
+                # 重定向与后续请求共用同一个 requestId，先把重定向响应作为一条独立的记录结束
+                entry = self.pending.pop(request_id)
+                entry["status"] = redirect.get("status")
+                entry["location"] = _header(redirect.get("headers"), "location")
+                self.entries.append(entry)
+            request = params.get("request", {})
+            if not request.get("url", "").startswith(("http://", "https://")):
+                return
+            self.sequence += 1
+            self.pending[request_id] = {
+                "seq": self.sequence, "method": request.get("method", "GET"), "url": request["url"],
+                "post_data": request.get("postData"), "type": params.get("type"),
+                "status": None, "content_type": None, "location": None, "body": None, "base64": False,
+                "elapsed": 0.0, "_start": params.get("timestamp", 0.0),
+            }
+        elif request_id not in self.pending:
+            return
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            entry = self.pending[request_id]
+            entry["status"] = response.get("status")
+            entry["content_type"] = _header(response.get("headers"), "content-type") or response.get("mimeType")
+        elif method == "Network.loadingFinished":
+            entry = self.pending.pop(request_id)
+            entry["elapsed"] = max(0.0, params.get("timestamp", 0.0) - entry["_start"])
+            try:
+                with untracked(self.driver):
+                    body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                entry["body"] = body.get("body")
+                entry["base64"] = bool(body.get("base64Encoded"))
+            except Exception:
+                pass  # 没有响应体（例如 204 或被浏览器缓存的重定向），回放时返回空响应
+            self.entries.append(entry)
+        elif method == "Network.loadingFailed":
+            # 失败或被取消的请求不进入存档，回放时同样得不到响应
+            self.pending.pop(request_id)
+
+    def save(self, path):
+        """
+        按请求发出顺序写入 traffic.jsonl。
+
+        :return: 整数，写入的响应数量。
+        """
+        entries = sorted(self.entries, key=lambda e: e["seq"])
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                record = {key: value for key, value in entry.items() if not key.startswith("_") and key != "seq"}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(entries)
+
+
+def _header(headers, name):
+    """:return: 不区分大小写地读取响应头，不存在时为 None。"""
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class SessionRecorder:
+    """
+    benchmark.run_once 的 observer：记录全部网络流量，并在每个任务结束时保存页面 DOM 快照和定位器匹配数量。
+    """
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        self.traffic = TrafficRecorder()
+        self.steps = []
+        self.cookies = []
+        os.makedirs(os.path.join(archive_dir, "snapshots"), exist_ok=True)
+
+    def attach(self, driver):
+        self.traffic.attach(driver)
+        # 在访问任何页面之前读取配置文件中站点的 Cookie，即运行开始时的登录状态
+        site_domain = ".".join(urlsplit(AutoCheckin.SITE_BASE_URL).hostname.split(".")[-2:])
+        with untracked(driver):
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        self.cookies = [{"name": c["name"], "value": c["value"], "path": c.get("path", "/")}
+                        for c in cookies if c.get("domain", "").lstrip(".").endswith(site_domain)]
+
+    def after_step(self, driver, name, result):
+        self.traffic.flush()
+        snapshot = os.path.join("snapshots", f"{len(self.steps) + 1:02d}-{name}.html")
+        with untracked(driver):
+            html = driver.execute_script("return document.documentElement.outerHTML;")
+            url = driver.current_url
+        with open(os.path.join(self.archive_dir, snapshot), "w", encoding="utf-8") as f:
+            f.write(html or "")
+        self.steps.append({"task": name, "result": to_jsonable(result), "url": url,
+                           "census": selector_census(driver), "snapshot": snapshot})
+
+    def save(self, account, report):
+        """
+        写入 manifest.json、traffic.jsonl 和 cookies.json。
+
+        :param account: 字符串，录制使用的账号名称。
+        :param report: 录制运行的 RunMetrics 报告字典；录制中途出错时为 None，存档标记为不完整。
+        """
+        count = self.traffic.save(os.path.join(self.archive_dir, "traffic.jsonl"))
+        with open(os.path.join(self.archive_dir, "cookies.json"), "w", encoding="utf-8") as f:
+            json.dump(self.cookies, f, ensure_ascii=False, indent=2)
+        manifest = {
+            "format": ARCHIVE_FORMAT,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "account": account,
+            "site_base_url": AutoCheckin.SITE_BASE_URL,
+            "api_base_url": AutoCheckin.API_BASE_URL,
+            "num_to_like": AutoCheckin.NUM_TO_LIKE,
+            "num_to_comment": AutoCheckin.NUM_TO_COMMENT,
+            "num_to_browse": AutoCheckin.NUM_TO_BROWSE,
+            "steps": self.steps,
+            "report": report,
+            "complete": report is not None,
+        }
+        with open(os.path.join(self.archive_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return count
+
+
+class ReplayArchive:
+    """
+    读取录制的存档，为回放服务器按请求查找响应，并负责在原始地址和本地地址之间改写。
+
+    查找顺序：方法 + 地址 + 请求体完全相同 → 方法 + 地址 → 方法 + 路径（忽略查询参数中的时间戳等）。
+    同一个键的多次请求按录制顺序依次返回，用完后重复返回最后一个响应。
+    """
+
+    def __init__(self, archive_dir):
+        self.archive_dir = archive_dir
+        with open(os.path.join(archive_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"不支持的存档格式: {self.manifest.get('format')}")
+        if not self.manifest.get("complete", True):
+            print("🟡 该存档在录制中途出错，回放结果可能与录制时不一致。")
+        with open(os.path.join(archive_dir, "traffic.jsonl"), "r", encoding="utf-8") as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        try:
+            with open(os.path.join(archive_dir, "cookies.json"), "r", encoding="utf-8") as f:
+                self.cookies = json.load(f)
+        except OSError:
+            self.cookies = []
+
+        site = urlsplit(self.manifest["site_base_url"])
+        self.site_origin = f"{site.scheme}://{site.netloc}"
+        self.origins = {self.site_origin}
+        self.index = {}
+        for entry in self.entries:
+            url = urlsplit(entry["url"])
+            self.origins.add(f"{url.scheme}://{url.netloc}")
+            for key in self._keys(entry["method"], entry["url"], entry.get("post_data")):
+                self.index.setdefault(key, []).append(entry)
+        hosts = "|".join(re.escape(urlsplit(origin).netloc) for origin in
+                         sorted(self.origins, key=len, reverse=True))
+        # 匹配带协议或协议相对的地址，包括 JSON 中转义的形式（https:\/\/host）
+        self._origin_pattern = re.compile(r"(?:https?:)?(\\?/\\?/)(" + hosts + r")(?![\w.-])")
+        self.base_url = None
+        self.lock = threading.Lock()
+        self.reset()
+
+    @staticmethod
+    def _keys(method, url, post_data):
+        path = urlsplit(url)._replace(query="", fragment="").geturl()
+        return ("body", method, url, post_data or ""), ("url", method, url), ("path", method, path)
+
+    def reset(self):
+        """每轮回放开始前调用，从头开始按录制顺序返回响应。"""
+        with self.lock:
+            self.served = {}
+            self.misses = []
+
+    def lookup(self, method, url, post_data):
+        """
+        :return: 录制的响应字典，没有匹配时为 None（并记录到 misses）。
+        """
+        with self.lock:
+            for key in self._keys(method, url, post_data):
+                candidates = self.index.get(key)
+                if candidates:
+                    count = self.served.get(key, 0)
+                    self.served[key] = count + 1
+                    return candidates[min(count, len(candidates) - 1)]
+            self.misses.append(f"{method} {url}")
+            return None
+
+    def original_url(self, path):
+        """
+        :param path: 本地回放服务器收到的请求路径（含查询参数）。
+        :return: 录制时的原始地址。
+        """
+        if path.startswith(REPLAY_PREFIX):
+            netloc, _, rest = path[len(REPLAY_PREFIX):].partition("/")
+            for origin in self.origins:
+                if urlsplit(origin).netloc == netloc:
+                    return f"{origin}/{rest}"
+        return self.site_origin + path
+
+    def local_url(self, url):
+        """:return: 原始地址在本地回放服务器上对应的地址。"""
+        return self.rewrite(url)
+
+    def rewrite(self, text):
+        """把文本中出现的所有录制域名改写为本地回放服务器的地址。"""
+        local = urlsplit(self.base_url).netloc
+
+        def replace(match):
+            slashes, netloc = match.group(1), match.group(2)
+            # 协议相对的地址保持协议相对，其余一律改为 http（回放服务器不提供 https）
+            scheme = "" if match.group(0).startswith(slashes) else "http:"
+            target = local if self.site_origin.endswith("//" + netloc) else local + REPLAY_PREFIX + netloc
+            if "\\" in slashes:
+                target = target.replace("/", "\\/")
+            return scheme + slashes + target
+
+        return self._origin_pattern.sub(replace, text)
+
+    def restore(self, text):
+        """rewrite 的逆操作：把本地回放服务器的地址改回录制时的原始地址。"""
+        for origin in self.origins:
+            if origin != self.site_origin:
+                text = text.replace(self.base_url + REPLAY_PREFIX + urlsplit(origin).netloc, origin)
+        return text.replace(self.base_url, self.site_origin)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """按存档返回录制的响应。"""
+
+    archive = None  # ReplayArchive 实例，由 start_replay_server 设置
+    latency_scale = 0.0  # 响应前按录制耗时的倍数停留，0 表示零延迟
+
+    def log_message(self, format, *args):
+        pass  # 保持回放输出整洁
+
+    def _replay(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        post_data = self.rfile.read(length).decode("utf-8", "replace") if length else None
+        url = self.archive.original_url(self.path)
+        entry = self.archive.lookup(self.command, url, post_data)
+        if entry is None:
+            if self.command == "OPTIONS":
+                # 跨域预检请求在录制时不会出现在性能日志中，直接放行
+                self.send_response(204)
+                self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+                self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+                self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers") or "*")
+                self.send_header("Access-Control-Allow-Credentials", "true")
+                self.end_headers()
+                return
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.latency_scale:
+            time.sleep(entry.get("elapsed", 0.0) * self.latency_scale)
+        content_type = entry.get("content_type") or "application/octet-stream"
+        body = entry.get("body") or ""
+        if entry.get("base64"):
+            data = base64.b64decode(body)
+        else:
+            if any(kind in content_type for kind in TEXT_CONTENT_TYPES):
+                body = self.archive.rewrite(body)
+            data = body.encode("utf-8")
+
+        self.send_response(entry.get("status") or 200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        if entry.get("location"):
+            self.send_header("Location", self.archive.rewrite(entry["location"]))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = do_OPTIONS = _replay
+
+
+def start_replay_server(archive, latency_scale=0.0, port=0):
+    """
+    在后台线程中启动回放服务器。
+
+    :param archive: ReplayArchive 实例。
+    :param latency_scale: 浮点数，按录制耗时的倍数延迟每个响应，0 表示零延迟。
+    :param port: 整数，监听端口，0 表示随机端口。
+    :return: (ThreadingHTTPServer 实例, 服务器地址)。
+    """
+    handler = type("BoundReplayHandler", (ReplayHandler,),
+                   {"archive": archive, "latency_scale": latency_scale})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    archive.base_url = f"http://127.0.0.1:{server.server_port}"
+    return server, archive.base_url
+
+
+class ReplayObserver:
+    """
+    benchmark.run_once 的 observer：回放前写入录制时的 Cookie，每个任务结束后记录结果和定位器匹配数量，
+    并可选地保存 DOM 快照，便于与存档中的快照比较。
+    """
+
+    def __init__(self, archive, snapshot_dir=None):
+        self.archive = archive
+        self.snapshot_dir = snapshot_dir
+        self.steps = []
+
+    def attach(self, driver):
+        with untracked(driver):
+            for cookie in self.archive.cookies:
+                driver.execute_cdp_cmd("Network.setCookie", {
+                    "url": self.archive.base_url, "name": cookie["name"], "value": cookie["value"],
+                    "path": cookie.get("path", "/")})
+
+    def after_step(self, driver, name, result):
+        step = {"task": name, "result": to_jsonable(result), "census": selector_census(driver)}
+        if self.snapshot_dir:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with untracked(driver):
+                html = driver.execute_script("return document.documentElement.outerHTML;")
+            path = os.path.join(self.snapshot_dir, f"{len(self.steps) + 1:02d}-{name}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.archive.restore(html or ""))
+        self.steps.append(step)
+
+
+def compare_with_recording(archive, steps):
+    """
+    比较回放与录制时每个任务的返回值和定位器匹配数量。
+
+    :param archive: ReplayArchive 实例。
+    :param steps: ReplayObserver.steps。
+    :return: 差异描述的列表，为空表示结果一致。
+    """
+    differences = []
+    recorded = {step["task"]: step for step in archive.manifest["steps"]}
+    for step in steps:
+        expected = recorded.get(step["task"])
+        if expected is None:
+            differences.append(f"{step['task']}: 存档中没有该任务")
+            continue
+        result = json.loads(archive.restore(json.dumps(step["result"], ensure_ascii=False)))
+        if result != expected["result"]:
+            differences.append(f"{step['task']}: 返回值 {expected['result']!r} → {result!r}")
+        changed = sorted(name for name in set(expected["census"]) | set(step["census"])
+                         if expected["census"].get(name) != step["census"].get(name))
+        for name in changed:
+            differences.append(f"{step['task']}: 定位器 {name} 匹配 {expected['census'].get(name)} → "
+                               f"{step['census'].get(name)} 个元素")
+    return differences
+
+
+def browser_options_from(args):
+    """:return: 根据命令行参数生成的 setup_driver 启动选项。"""
+    options = {"headless": not args.headed, "extra_arguments": []}
+    if args.no_sandbox:
+        options["extra_arguments"].append("--no-sandbox")
+    return options
+
+
+def record(args):
+    """在真实站点上运行一次全部任务，并保存为存档。"""
+    accounts = AutoCheckin.load_accounts(args.accounts)
+    if args.account:
+        accounts = [account for account in accounts if account["name"] == args.account]
+        if not accounts:
+            sys.exit(f"❌ 账号配置中没有账号 {args.account}")
+    account = accounts[0]
+
+    recorder = SessionRecorder(args.archive)
+    print(f"--- 使用账号 {account['name']} 录制到 {args.archive} ---")
+    run = None
+    try:
+        run = benchmark.run_once(AutoCheckin.SITE_BASE_URL, browser_options_from(args),
+                                 profile_path=account["profile_path"], observer=recorder)
+    finally:
+        # 运行中途出错时同样保存已录制的部分，便于排查
+        count = recorder.save(account["name"], run["report"] if run else None)
+        if run:
+            print(f"✅ 已录制 {count} 个响应和 {len(recorder.steps)} 个任务快照。")
+        else:
+            print(f"🟡 录制中途出错，已保存不完整的存档（{count} 个响应，{len(recorder.steps)} 个任务快照）。")
+
+
+def replay(args):
+    """在本地回放服务器上重复运行全部任务，检查结果并比较性能。"""
+    archive = ReplayArchive(args.archive)
+    latency_scale = args.latency_scale if args.latency == "recorded" else 0.0
+    server, base_url = start_replay_server(archive, latency_scale)
+    benchmark.point_autocheckin_at(base_url)
+    AutoCheckin.API_BASE_URL = archive.local_url(archive.manifest["api_base_url"])
+    AutoCheckin.NUM_TO_LIKE = archive.manifest["num_to_like"]
+    AutoCheckin.NUM_TO_COMMENT = archive.manifest["num_to_comment"]
+    AutoCheckin.NUM_TO_BROWSE = archive.manifest["num_to_browse"]
+    browser_options = browser_options_from(args)
+    browser_options["extra_arguments"].append(OFFLINE_RESOLVER_RULES)
+    print(f"--- 回放服务器已启动: {base_url}（{len(archive.entries)} 个响应，"
+          f"{'按录制耗时 x' + str(latency_scale) if latency_scale else '零延迟'}） ---")
+
+    runs = []
+    differences = []
+    try:
+        for i in range(args.runs):
+            print(f"\n===== 第 {i + 1}/{args.runs} 轮回放 =====")
+            archive.reset()
+            observer = ReplayObserver(archive, args.snapshots if i == 0 else None)
+            runs.append(benchmark.run_once(base_url, browser_options, observer=observer))
+            differences += [f"第 {i + 1} 轮 {line}" for line in compare_with_recording(archive, observer.steps)]
+            if archive.misses:
+                print(f"🟡 有 {len(archive.misses)} 个请求在存档中没有对应的响应，例如: {archive.misses[0]}")
+    finally:
+        server.shutdown()
+
+    results = benchmark.aggregate(runs)
+    benchmark.print_results(results, statistics.median(run["launch_time"] for run in runs))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.output}")
+
+    failed = False
+    if differences:
+        print("\n❌ 回放结果与录制时不一致:")
+        for line in differences:
+            print(f"  {line}")
+        failed = True
+    else:
+        print("\n✅ 回放结果与录制时一致。")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = benchmark.compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ 发现性能回退:")
+            for line in regressions:
+                print(f"  {line}")
+            failed = True
+        else:
+            print("✅ 与基准结果相比没有性能回退。")
+    if failed:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制一次真实运行，并在本地离线回放以检查结果和性能。")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    record_parser = subparsers.add_parser("record", help="在真实站点上运行全部任务并录制")
+    record_parser.add_argument("--accounts", default=AutoCheckin.ACCOUNTS_FILE, help="账号配置文件路径")
+    record_parser.add_argument("--account", help="录制使用的账号名称，默认为第一个账号")
+
+    replay_parser = subparsers.add_parser("replay", help="在本地回放服务器上离线运行全部任务")
+    replay_parser.add_argument("--runs", type=int, default=1, help="重复回放的轮数，结果取中位数")
+    replay_parser.add_argument("--latency", choices=("zero", "recorded"), default="zero",
+                               help="响应延迟：零延迟，或按录制时的响应耗时")
+    replay_parser.add_argument("--latency-scale", type=float, default=1.0, help="--latency recorded 时耗时的倍数")
+    replay_parser.add_argument("--snapshots", help="将第一轮回放中每个任务结束时的 DOM 保存到该目录")
+    replay_parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    replay_parser.add_argument("--baseline", help="与之前保存的 JSON 结果比较，发现回退时以非零状态码退出")
+    replay_parser.add_argument("--tolerance", type=float, default=0.2, help="允许的耗时增幅，默认 0.2（20%%）")
+
+    for sub in (record_parser, replay_parser):
+        sub.add_argument("--archive", required=True, help="存档目录")
+        sub.add_argument("--fast", action="store_true", help="开启 FAST_MODE，去掉所有装饰性的停留")
+        sub.add_argument("--headed", action="store_true", help="显示浏览器窗口（默认无头）")
+        sub.add_argument("--no-sandbox", action="store_true", help="以 --no-sandbox 启动 Chrome（容器中以 root 运行时需要）")
+    args = parser.parse_args()
+
+    AutoCheckin.FAST_MODE = args.fast
+    AutoCheckin.HIGHLIGHT_ELEMENTS = False
+    # 录制依赖浏览器性能日志；回放时同样开启，使两者的往返次数可以直接比较
+    AutoCheckin.NETWORK_WAITS = True
+    # 点赞前的接口查询由 Python 直接发出，不经过浏览器，无法录制，因此两种模式都以页面上的状态为准
+    AutoCheckin.LIKE_STATE_FROM_API = False
+    if args.mode == "record":
+        record(args)
+    else:
+        replay(args)
+
+
+if __name__ == '__main__':
+    main()
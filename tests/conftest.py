@@ -0,0 +1,21 @@
+"""
+测试公共设置：让测试可以直接导入仓库根目录下的脚本，并把运行状态数据库隔离到临时目录。
+
+这些测试不启动浏览器，WebDriver 由各测试中的假对象代替。
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import AutoCheckin  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """每个测试使用独立的运行状态数据库，避免读写仓库目录下的 run_state.sqlite3。"""
+    monkeypatch.setattr(AutoCheckin, "STATE_DB_PATH", str(tmp_path / "run_state.sqlite3"))
+    monkeypatch.setattr(AutoCheckin, "_state_store", None)
+    yield
@@ -0,0 +1,37 @@
+"""run_account_async：今日任务已全部完成的账号不导出 Cookie、不启动浏览器。"""
+import asyncio
+
+import AutoCheckin
+from AutoCheckin import run_account_async
+
+ACCOUNT = {"name": "main", "profile_path": "/profiles/main"}
+
+
+def run(account):
+    return asyncio.run(run_account_async(account, asyncio.Semaphore(4), asyncio.Semaphore(1)))
+
+
+def test_finished_account_skips_cookie_export(monkeypatch):
+    AutoCheckin.get_state_store().mark_tasks_done("main", list(AutoCheckin.POINTS_TASK_IDENTIFIERS))
+    exported = []
+    monkeypatch.setattr(AutoCheckin, "load_account_cookies", lambda account: exported.append(account) or [])
+
+    result = run(ACCOUNT)
+
+    assert result["success"]
+    assert result["error"] is None
+    assert exported == []
+
+
+def test_cookie_failure_falls_back_to_browser(monkeypatch):
+    def load_account_cookies(account):
+        raise RuntimeError("profile locked")
+
+    monkeypatch.setattr(AutoCheckin, "load_account_cookies", load_account_cookies)
+    monkeypatch.setattr(AutoCheckin, "run_account", lambda account, tasks, driver_pool=None:
+                        {"name": account["name"], "success": False, "error": ",".join(sorted(tasks)), "elapsed": 0.0})
+
+    result = run(ACCOUNT)
+
+    assert not result["success"]
+    assert "daily_check_in" in result["error"]
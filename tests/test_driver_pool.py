@@ -0,0 +1,68 @@
+"""DriverPool：常驻浏览器在账号之间复用，故障浏览器被回收后腾出启动名额。"""
+import threading
+
+import pytest
+
+import AutoCheckin
+from AutoCheckin import DriverPool, run_account
+
+ACCOUNT = {"name": "main", "profile_path": "/profiles/main"}
+
+
+class FakePoolDriver:
+    """只支持会话切换命令的假 WebDriver；cdp_error 不为 None 时 CDP 命令失败。"""
+
+    def __init__(self, cdp_error=None):
+        self.cdp_error = cdp_error
+        self.closed = False
+
+    def execute_cdp_cmd(self, command, params):
+        if self.cdp_error:
+            raise self.cdp_error
+        return {}
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def launched(tmp_path, monkeypatch):
+    """替换浏览器启动：返回的列表按顺序记录池启动的每个假浏览器。"""
+    drivers = []
+
+    def setup_driver(profile_path, browser_options=None):
+        drivers.append(FakePoolDriver(cdp_error=RuntimeError("session lost") if not drivers else None))
+        return drivers[-1]
+
+    monkeypatch.setattr(AutoCheckin, "setup_driver", setup_driver)
+    monkeypatch.setattr(AutoCheckin, "REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(AutoCheckin, "load_account_cookies", lambda account: [])
+    return drivers
+
+
+def test_released_driver_is_reused():
+    pool = DriverPool(1)
+    pool.launched = 1
+    driver = FakePoolDriver()
+
+    pool.release(driver)
+
+    assert pool.acquire() is driver
+
+
+def test_failed_session_switch_returns_driver_to_pool(launched):
+    pool = DriverPool(1)
+
+    result = run_account(ACCOUNT, tasks={"daily_check_in"}, driver_pool=pool)
+
+    assert not result["success"]
+    assert "session lost" in result["error"]
+    # 切换会话失败的浏览器按故障回收，启动名额被释放
+    assert launched[0].closed
+    assert (pool.launched, pool.idle) == (0, [])
+
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire()), daemon=True)
+    thread.start()
+    thread.join(2)
+    assert acquired == [launched[1]]
@@ -0,0 +1,61 @@
+"""expand_points_tasks：点击“展开”后等待被隐藏的任务行显示出来。"""
+import time
+
+import pytest
+
+import AutoCheckin
+from AutoCheckin import SELECTORS, expand_points_tasks
+
+
+class FakePointsDriver:
+    """
+    模拟积分页面：所有任务行一开始都在页面中，展开前只有前 visible_before 行可见。
+    reveals 为 False 时点击“展开”不会显示更多任务行。
+    """
+
+    def __init__(self, rows=3, visible_before=1, reveals=True):
+        self.rows = [f"row-{i}" for i in range(rows)]
+        self.visible_before = visible_before
+        self.reveals = reveals
+        self.expanded = False
+
+    def execute_script(self, script, *args):
+        if script is AutoCheckin._RESOLVE_SELECTOR_JS:
+            spec, context, mode = args
+            if spec["css"] == SELECTORS.spec("points_expand_button")["css"]:
+                return {"strategy": "css", "elements": ["expand-button"]}
+            if spec["css"] == SELECTORS.spec("points_progress_row")["css"]:
+                rows = self.rows
+                if mode != "present" and not (self.expanded and self.reveals):
+                    rows = rows[:self.visible_before]
+                return {"strategy": "css", "elements": list(rows)}
+            return {"strategy": None, "elements": []}
+        if script == "arguments[0].click();":
+            self.expanded = True
+            return None
+        raise AssertionError("unexpected script")
+
+
+@pytest.fixture(autouse=True)
+def short_reveal_timeout(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "EXPAND_REVEAL_TIMEOUT", 1)
+
+
+def test_hidden_rows_count_as_revealed_when_shown(capsys):
+    driver = FakePointsDriver()
+
+    start = time.perf_counter()
+    expand_points_tasks(driver)
+
+    # 任务行数量不变，但可见的任务行增加了，不应等满超时
+    assert driver.expanded
+    assert time.perf_counter() - start < AutoCheckin.EXPAND_REVEAL_TIMEOUT
+    assert "没有新的任务行" not in capsys.readouterr().out
+
+
+def test_no_revealed_rows_times_out_quietly(capsys):
+    driver = FakePointsDriver(reveals=False)
+
+    expand_points_tasks(driver)
+
+    assert "没有新的任务行" in capsys.readouterr().out
@@ -0,0 +1,118 @@
+"""FeedReader：按需读取帖子卡片、滚动加载更多，并维护帖子索引。"""
+import functools
+
+import pytest
+
+import AutoCheckin
+from AutoCheckin import FeedReader
+
+
+def make_post(post_id, liked=False, comments=0):
+    """构造一个与 _QUERY_POSTS_JS 返回格式相同的帖子字典，元素引用用字符串代替。"""
+    return {"element": f"card-{post_id}", "like": f"like-{post_id}", "liked": liked, "likes": 3,
+            "title": f"title-{post_id}", "title_text": f"标题 {post_id}",
+            "url": f"https://www.blablalink.com/post/{post_id}", "id": f"/post/{post_id}", "comments": comments}
+
+
+class FakeFeedDriver:
+    """
+    模拟帖子列表页：pages[0] 为首屏渲染的帖子，之后每次滚动到底部追加下一页。
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.rendered = list(pages[0])
+        self.loaded_pages = 1
+        self.query_starts = []  # 每次读取卡片时的起始下标
+
+    def execute_script(self, script, *args):
+        if script is AutoCheckin._QUERY_POSTS_JS:
+            start = args[1]
+            self.query_starts.append(start)
+            return {"posts": [dict(post) for post in self.rendered[start:]], "strategies": {"card": "css"}}
+        if script is AutoCheckin._SCROLL_FEED_JS:
+            count = len(self.rendered)
+            if args[1] and self.loaded_pages < len(self.pages):
+                self.rendered += self.pages[self.loaded_pages]
+                self.loaded_pages += 1
+            return count
+        raise AssertionError("unexpected script")
+
+
+@pytest.fixture(autouse=True)
+def quick_scroll_timeout(monkeypatch):
+    """没有更多帖子时，load_more_posts 只等待很短的时间。"""
+    monkeypatch.setattr(AutoCheckin, "load_more_posts",
+                        functools.partial(AutoCheckin.load_more_posts, timeout=0.2))
+
+
+def test_take_reads_rendered_posts_without_scrolling():
+    driver = FakeFeedDriver([[make_post("p1"), make_post("p2"), make_post("p3")]])
+    feed = FeedReader(driver)
+
+    posts = feed.take(2)
+
+    assert [post["id"] for post in posts] == ["p1", "p2"]
+    assert driver.loaded_pages == 1
+
+
+def test_take_scrolls_and_reads_only_new_cards():
+    driver = FakeFeedDriver([[make_post("p1"), make_post("p2")], [make_post("p3"), make_post("p4")]])
+    feed = FeedReader(driver, max_scrolls=3)
+
+    posts = feed.take(3, lambda post: not post["liked"])
+
+    assert [post["id"] for post in posts] == ["p1", "p2", "p3"]
+    assert driver.loaded_pages == 2
+    # 滚动前先检查是否有新渲染的卡片，之后都只从第 2 个卡片开始读取
+    assert driver.query_starts == [0, 2, 2]
+
+
+def test_take_stops_when_feed_is_exhausted():
+    driver = FakeFeedDriver([[make_post("p1")]])
+    feed = FeedReader(driver, max_scrolls=2)
+
+    assert [post["id"] for post in feed.take(5)] == ["p1"]
+    assert feed.exhausted
+
+
+def test_predicate_skips_liked_posts():
+    driver = FakeFeedDriver([[make_post("p1", liked=True), make_post("p2"), make_post("p3", liked=True)]])
+    feed = FeedReader(driver)
+
+    assert [post["id"] for post in feed.take(5, lambda post: not post["liked"])] == ["p2"]
+
+
+def test_index_keeps_state_across_invalidate():
+    driver = FakeFeedDriver([[make_post("p1"), make_post("p2")]])
+    feed = FeedReader(driver)
+    feed.take(2)
+    feed.update(["p1"], liked=True)
+    feed.update(["p2"], comment_sent=True)
+
+    # 离开列表页后返回：页面上的状态尚未刷新，索引中的状态应当保留
+    feed.invalidate()
+    posts = {post["id"]: post for post in feed.take(2)}
+
+    assert posts["p1"]["liked"]
+    assert posts["p2"]["comment_sent"]
+    assert driver.query_starts == [0, 0]
+
+
+def test_api_liked_states_override_page_state():
+    driver = FakeFeedDriver([[make_post("p1"), make_post("p2", liked=True)]])
+    feed = FeedReader(driver)
+    feed.sync_liked_states({"p1": True, "p2": False})
+
+    posts = {post["id"]: post for post in feed.take(2)}
+
+    assert posts["p1"]["liked"]
+    assert not posts["p2"]["liked"]
+
+
+def test_duplicate_cards_are_indexed_once():
+    driver = FakeFeedDriver([[make_post("p1"), make_post("p1"), make_post("p2")]])
+    feed = FeedReader(driver)
+
+    assert [post["id"] for post in feed.take(5)] == ["p1", "p2"]
+    assert feed.visible_ids == ["p1", "p2"]
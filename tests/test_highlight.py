@@ -0,0 +1,44 @@
+"""highlight_element：关闭时不产生任何 WebDriver 调用，开启时只发出一次脚本调用。"""
+import AutoCheckin
+from AutoCheckin import highlight_element
+
+
+class FakeScriptDriver:
+    """记录 execute_script 调用的假 WebDriver。"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        if self.error:
+            raise self.error
+
+
+def test_disabled_highlight_makes_no_driver_calls(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "HIGHLIGHT_ELEMENTS", False)
+    driver = FakeScriptDriver()
+
+    highlight_element(driver, "element")
+
+    assert driver.calls == []
+
+
+def test_enabled_highlight_uses_one_script_call(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "HIGHLIGHT_ELEMENTS", True)
+    driver = FakeScriptDriver()
+
+    highlight_element(driver, "element", duration=0.25)
+
+    # 样式由页面内的 setTimeout 恢复，持续时间以毫秒传入
+    assert driver.calls == [("element", 250)]
+
+
+def test_highlight_errors_are_ignored(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "HIGHLIGHT_ELEMENTS", True)
+    driver = FakeScriptDriver(error=RuntimeError("stale element"))
+
+    highlight_element(driver, "element")
+
+    assert len(driver.calls) == 1
@@ -0,0 +1,94 @@
+"""HTTP 接口模式：ApiClient 与 run_account_http 在 benchmark.py 的模拟站点上运行。"""
+import pytest
+
+import AutoCheckin
+import benchmark
+from AutoCheckin import ApiClient, ApiError, run_account_http
+
+ACCOUNT = {"name": "main", "profile_path": "/profiles/main"}
+FEED_TASKS = {"like_posts", "post_emoji_comment", "browse_posts"}
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """启动模拟站点，返回 (服务端状态, 站点地址)。"""
+    server, base_url = benchmark.start_mock_server()
+    monkeypatch.setattr(AutoCheckin, "API_BASE_URL", base_url)
+    yield server.RequestHandlerClass.state, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_calls_mock_endpoints(site):
+    state, base_url = site
+    client = ApiClient([{"name": "session", "value": "abc"}], base_url=base_url)
+
+    client.daily_check_in()
+    posts = client.list_posts(limit=3)
+    client.like_post(posts[0]["id"])
+
+    assert state.checked_in
+    # 最新排序：最后发布的帖子在前
+    assert [post["id"] for post in posts] == ["post-011", "post-010", "post-009"]
+    assert not any(post["liked"] for post in posts)
+    assert state.liked_ids == {"post-011"}
+    assert client.list_posts(limit=1)[0]["liked"]
+
+
+def test_client_raises_api_error_on_error_code(site):
+    _, base_url = site
+    with pytest.raises(ApiError, match="404"):
+        ApiClient([], base_url=base_url).like_post("missing")
+
+
+def test_run_account_http_completes_tasks_without_browser(site):
+    state, base_url = site
+
+    failed, completed = run_account_http(ACCOUNT, client=ApiClient([], base_url=base_url))
+
+    assert failed == set()
+    assert completed == {"daily_check_in"} | FEED_TASKS
+    assert state.checked_in
+    assert len(state.liked_ids) == AutoCheckin.NUM_TO_LIKE
+    assert len(state.browsed_ids) == AutoCheckin.NUM_TO_BROWSE
+    assert state.comments == AutoCheckin.NUM_TO_COMMENT
+    # 默认不在浏览器中确认，接口完成的任务直接记为今日已完成，无需启动浏览器
+    assert AutoCheckin.get_state_store().completed_tasks("main") == completed
+    assert AutoCheckin._browser_followup("main", failed, completed) == set()
+
+
+def test_rerun_after_completion_makes_no_requests(site):
+    state, base_url = site
+    run_account_http(ACCOUNT, client=ApiClient([], base_url=base_url))
+    state.reset()
+
+    assert run_account_http(ACCOUNT, client=ApiClient([], base_url=base_url)) == (set(), set())
+    assert not state.checked_in
+
+
+def test_browser_verification_is_opt_in(site, monkeypatch):
+    _, base_url = site
+    monkeypatch.setattr(AutoCheckin, "API_VERIFY_IN_BROWSER", True)
+
+    failed, completed = run_account_http(ACCOUNT, client=ApiClient([], base_url=base_url))
+
+    # 任务由浏览器中的积分页面确认后才记为已完成
+    assert AutoCheckin.get_state_store().completed_tasks("main") == set()
+    assert AutoCheckin._browser_followup("main", failed, completed) == completed | {"check_points_page"}
+
+
+def test_failed_tasks_fall_back_to_browser(site):
+    assert AutoCheckin._browser_followup("main", {"like_posts"}, {"daily_check_in"}) == \
+        {"like_posts", "check_points_page"}
+
+
+def test_process_account_http_engine_skips_browser(site, monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "ENGINE", "http")
+    monkeypatch.setattr(AutoCheckin, "load_account_cookies", lambda account: [])
+    launched = []
+    monkeypatch.setattr(AutoCheckin, "run_account", lambda *args, **kwargs: launched.append(args))
+
+    result = AutoCheckin.process_account(ACCOUNT)
+
+    assert result["success"]
+    assert launched == []
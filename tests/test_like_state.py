@@ -0,0 +1,70 @@
+"""点赞状态：接口返回的点赞状态只在字段存在时采用，点击结果以点赞数的变化确认。"""
+import AutoCheckin
+from AutoCheckin import ApiClient, _like_count_changes, _restore_unliked, fetch_liked_states
+
+
+class FakeCountDriver:
+    """按顺序返回点赞数的假 WebDriver：counts 中的每一项是一次 _LIKE_COUNTS_JS 调用的结果。"""
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.clicked = []
+
+    def execute_script(self, script, *args):
+        assert script is AutoCheckin._LIKE_COUNTS_JS
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+
+    def get_cookies(self):
+        return []
+
+
+def target(post_id, likes):
+    return {"id": post_id, "like": f"like-{post_id}", "likes": likes}
+
+
+def test_list_posts_keeps_missing_like_state_unknown():
+    client = ApiClient([])
+    client.call = lambda endpoint, payload: {"list": [
+        {"post_uuid": "p1", "title": "a", "my_upvote": 1},
+        {"post_uuid": "p2", "title": "b", "my_upvote": 0},
+        {"post_uuid": "p3", "title": "c"},
+    ]}
+
+    assert [post["liked"] for post in client.list_posts()] == [True, False, None]
+
+
+def test_fetch_liked_states_only_returns_reported_states(monkeypatch):
+    class FakeClient:
+        def __init__(self, cookies, **kwargs):
+            assert kwargs["retries"] == 0
+
+        def list_posts(self, limit):
+            return [{"id": "p1", "liked": True}, {"id": "p2", "liked": None}]
+
+    monkeypatch.setattr(AutoCheckin, "ApiClient", FakeClient)
+
+    assert fetch_liked_states(FakeCountDriver([[]]), 10) == {"p1": True}
+
+
+def test_like_count_changes_wait_until_counts_update():
+    driver = FakeCountDriver([[3, 5, None], [4, 4, None]])
+
+    changes = _like_count_changes(driver, [target("p1", 3), target("p2", 5), target("p3", 2)], timeout=1)
+
+    assert changes == [1, -1, None]
+
+
+def test_unchanged_count_is_reported_after_timeout():
+    driver = FakeCountDriver([[3]])
+
+    assert _like_count_changes(driver, [target("p1", 3)], timeout=0.2) == [0]
+
+
+def test_restore_reclicks_only_decreased_counts(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "click_elements", lambda driver, elements: driver.clicked.extend(elements))
+    driver = FakeCountDriver([[]])
+
+    restored = _restore_unliked(driver, [target("p1", 3), target("p2", 5)], [1, -1])
+
+    assert restored == ["p2"]
+    assert driver.clicked == ["like-p2"]
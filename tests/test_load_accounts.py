@@ -0,0 +1,55 @@
+"""load_accounts：读取并校验多账号配置文件。"""
+import json
+
+import pytest
+
+import AutoCheckin
+from AutoCheckin import load_accounts
+
+
+def write_accounts(tmp_path, accounts):
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps(accounts), encoding="utf-8")
+    return str(path)
+
+
+def test_missing_file_falls_back_to_default_profile(tmp_path):
+    accounts = load_accounts(str(tmp_path / "missing.json"))
+    assert accounts == [{"name": "default", "profile_path": AutoCheckin.DEFAULT_CHROME_PROFILE_PATH}]
+
+
+def test_names_default_to_position(tmp_path):
+    accounts = load_accounts(write_accounts(tmp_path, [
+        {"name": "main", "profile_path": "/profiles/main"},
+        {"profile_path": "/profiles/alt"},
+    ]))
+    assert [account["name"] for account in accounts] == ["main", "account-2"]
+
+
+def test_missing_profile_path_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="profile_path"):
+        load_accounts(write_accounts(tmp_path, [{"name": "main"}]))
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="main"):
+        load_accounts(write_accounts(tmp_path, [
+            {"name": "main", "profile_path": "/profiles/a"},
+            {"name": "main", "profile_path": "/profiles/b"},
+        ]))
+
+
+def test_generated_name_collision_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="account-2"):
+        load_accounts(write_accounts(tmp_path, [
+            {"name": "account-2", "profile_path": "/profiles/a"},
+            {"profile_path": "/profiles/b"},
+        ]))
+
+
+def test_duplicate_profile_paths_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="/profiles/shared"):
+        load_accounts(write_accounts(tmp_path, [
+            {"name": "main", "profile_path": "/profiles/shared"},
+            {"name": "alt", "profile_path": "/profiles/shared"},
+        ]))
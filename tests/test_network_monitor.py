@@ -0,0 +1,77 @@
+"""NetworkMonitor / network_outcomes：按接口响应判断操作结果，观察不到请求时退回页面元素判断。"""
+import json
+
+import pytest
+
+import AutoCheckin
+from AutoCheckin import NetworkMonitor, network_mark, network_outcomes
+
+LIKE_URL = AutoCheckin.API_BASE_URL + AutoCheckin.API_ENDPOINTS["like"]
+
+
+def log_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def like_request(request_id, status=200):
+    """一个点赞请求从发出到结束的三条性能日志。"""
+    return [
+        log_entry("Network.requestWillBeSent", requestId=request_id, request={"url": LIKE_URL, "method": "POST"}),
+        log_entry("Network.responseReceived", requestId=request_id, response={"status": status}),
+        log_entry("Network.loadingFinished", requestId=request_id),
+    ]
+
+
+class FakeLogDriver:
+    """只提供性能日志和响应体的假 WebDriver。"""
+
+    def __init__(self):
+        self.pending = []  # 下一次 get_log 返回的日志
+        self.bodies = {}  # requestId -> 响应体
+
+    def get_log(self, log_type):
+        assert log_type == "performance"
+        entries, self.pending = self.pending, []
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "Network.getResponseBody"
+        return {"body": self.bodies[params["requestId"]]}
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "NETWORK_REQUEST_GRACE", 0.2)
+    driver = FakeLogDriver()
+    driver.network_monitor = NetworkMonitor(driver)
+    return driver
+
+
+def test_outcomes_fall_back_when_no_request_is_observed(driver):
+    since = network_mark(driver)
+    assert network_outcomes(driver, AutoCheckin.make_wait(driver, 1), "like", since, 2) is None
+
+
+def test_outcomes_follow_status_and_response_code(driver):
+    since = network_mark(driver)
+    driver.pending = like_request("1") + like_request("2") + like_request("3", status=500)
+    driver.bodies = {"1": '{"code": 0}', "2": '{"code": 1001, "msg": "error"}'}
+
+    assert network_outcomes(driver, AutoCheckin.make_wait(driver, 1), "like", since, 3) == [True, False, False]
+
+
+def test_outcomes_ignore_requests_before_mark(driver):
+    driver.pending = like_request("old")
+    since = network_mark(driver)
+
+    assert network_outcomes(driver, AutoCheckin.make_wait(driver, 1), "like", since) is None
+
+
+def test_zero_count_returns_immediately(driver):
+    assert network_outcomes(driver, AutoCheckin.make_wait(driver, 1), "like", network_mark(driver), 0) == []
+
+
+def test_no_monitor_means_dom_fallback():
+    driver = FakeLogDriver()
+    assert network_mark(driver) is None
+    assert network_outcomes(driver, None, "like", None) is None
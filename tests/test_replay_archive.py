@@ -0,0 +1,85 @@
+"""ReplayArchive：按请求查找录制的响应，并在原始地址与本地回放地址之间改写。"""
+import json
+
+import pytest
+
+import replay
+from replay import ReplayArchive
+
+SITE = "https://www.blablalink.com"
+API = "https://api.blablalink.com"
+LOCAL = "http://127.0.0.1:8123"
+
+
+def entry(method, url, body, post_data=None):
+    return {"method": method, "url": url, "post_data": post_data, "status": 200,
+            "content_type": "application/json", "body": body, "elapsed": 0.01}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    manifest = {"format": replay.ARCHIVE_FORMAT, "site_base_url": SITE, "api_base_url": API, "steps": []}
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    entries = [
+        entry("GET", f"{SITE}/points", "before"),
+        entry("GET", f"{SITE}/points", "after"),
+        entry("POST", f"{API}/api/like", '{"code":0}', post_data='{"post_uuid":"p1"}'),
+        entry("POST", f"{API}/api/like", '{"code":1}', post_data='{"post_uuid":"p2"}'),
+        entry("GET", f"{API}/api/list?t=100", '{"list":[]}'),
+    ]
+    (tmp_path / "traffic.jsonl").write_text("\n".join(json.dumps(e) for e in entries) + "\n", encoding="utf-8")
+    archive = ReplayArchive(str(tmp_path))
+    archive.base_url = LOCAL
+    return archive
+
+
+def test_lookup_returns_repeated_requests_in_recorded_order(archive):
+    assert archive.lookup("GET", f"{SITE}/points", None)["body"] == "before"
+    assert archive.lookup("GET", f"{SITE}/points", None)["body"] == "after"
+    # 用完后重复返回最后一个响应
+    assert archive.lookup("GET", f"{SITE}/points", None)["body"] == "after"
+
+    archive.reset()
+    assert archive.lookup("GET", f"{SITE}/points", None)["body"] == "before"
+
+
+def test_lookup_prefers_matching_request_body(archive):
+    assert archive.lookup("POST", f"{API}/api/like", '{"post_uuid":"p2"}')["body"] == '{"code":1}'
+    assert archive.lookup("POST", f"{API}/api/like", '{"post_uuid":"p1"}')["body"] == '{"code":0}'
+
+
+def test_lookup_falls_back_to_path_without_query(archive):
+    assert archive.lookup("GET", f"{API}/api/list?t=200", None)["body"] == '{"list":[]}'
+
+
+def test_lookup_records_misses(archive):
+    assert archive.lookup("GET", f"{SITE}/unknown", None) is None
+    assert archive.misses == [f"GET {SITE}/unknown"]
+
+
+def test_rewrite_maps_recorded_origins_to_local_server(archive):
+    assert archive.rewrite(f'<a href="{SITE}/post/p1">') == f'<a href="{LOCAL}/post/p1">'
+    assert archive.rewrite(f"fetch('{API}/api/like')") == f"fetch('{LOCAL}/__replay/api.blablalink.com/api/like')"
+    # 协议相对的地址保持协议相对
+    assert archive.rewrite('src="//api.blablalink.com/x.js"') == 'src="//127.0.0.1:8123/__replay/api.blablalink.com/x.js"'
+    # JSON 中转义的斜杠保持转义
+    assert archive.rewrite('"https:\\/\\/api.blablalink.com\\/a"') == \
+        '"http:\\/\\/127.0.0.1:8123\\/__replay\\/api.blablalink.com\\/a"'
+
+
+def test_rewrite_leaves_unrecorded_hosts_alone(archive):
+    text = "https://www.blablalink.community/x https://cdn.example.com/y"
+    assert archive.rewrite(text) == text
+
+
+def test_restore_and_original_url_invert_rewrite(archive):
+    text = f"{SITE}/points {API}/api/like"
+    assert archive.restore(archive.rewrite(text)) == text
+    assert archive.original_url("/__replay/api.blablalink.com/api/like") == f"{API}/api/like"
+    assert archive.original_url("/points?x=1") == f"{SITE}/points?x=1"
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    (tmp_path / "manifest.json").write_text(json.dumps({"format": 999}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        ReplayArchive(str(tmp_path))
@@ -0,0 +1,92 @@
+"""ResourceGovernor：按本机资源放行浏览器会话。"""
+import threading
+import time
+
+import pytest
+
+import AutoCheckin
+from AutoCheckin import ResourceGovernor
+
+
+@pytest.fixture(autouse=True)
+def quick_admit(monkeypatch):
+    monkeypatch.setattr(AutoCheckin, "GOVERNOR_ADMIT_INTERVAL", 0.02)
+
+
+def test_sessions_are_counted():
+    governor = ResourceGovernor()
+    first = governor.acquire("a")
+    second = governor.acquire("b")
+    assert (governor.active, governor.launching) == (2, 2)
+
+    governor.launched(first, None)
+    assert (governor.active, governor.launching) == (2, 1)
+
+    governor.release(first)
+    governor.release(second)  # 浏览器未能启动的会话同样要释放启动名额
+    assert (governor.active, governor.launching) == (0, 0)
+    assert len(governor.session_times) == 2
+
+
+def test_waiting_session_is_admitted_after_release():
+    governor = ResourceGovernor()
+    # 模拟资源紧张：同时只允许一个会话
+    governor._headroom = lambda active, launching, samples: (active < 1, "busy")
+    first = governor.acquire("a")
+
+    admitted = threading.Event()
+    waiter = threading.Thread(target=lambda: (governor.acquire("b"), admitted.set()))
+    waiter.start()
+    assert not admitted.wait(0.2)
+
+    governor.release(first)
+    assert admitted.wait(2)
+    waiter.join(2)
+    assert governor.active == 1
+
+
+def test_headroom_is_measured_without_holding_the_lock():
+    governor = ResourceGovernor()
+    lock_free = []
+
+    def probe():
+        if governor.condition.acquire(timeout=0.5):
+            governor.condition.release()
+            lock_free.append(True)
+
+    def headroom(active, launching, samples):
+        # 在另一个线程中尝试获取锁：测量期间不应持有 condition
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        return True, ""
+
+    governor._headroom = headroom
+    governor.acquire("a")
+    assert lock_free == [True]
+
+
+def test_concurrent_acquires_remeasure_after_another_admission():
+    governor = ResourceGovernor()
+
+    def headroom(active, launching, samples):
+        time.sleep(0.02)  # 让多个线程的测量互相重叠
+        return launching < 2, "busy"
+
+    governor._headroom = headroom
+    threads = [threading.Thread(target=governor.acquire, args=(f"a{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.3)
+    assert governor.launching == 2
+
+    with governor.condition:
+        governor.launching = 0  # 已放行的浏览器启动完成
+        governor.condition.notify_all()
+    for thread in threads:
+        thread.join(2)
+    assert governor.active == 4
+
+
+def test_capacity_requires_measurements():
+    assert ResourceGovernor().capacity() is None
@@ -0,0 +1,77 @@
+"""run_account：账号是否成功由每个任务的执行结果决定。"""
+import pytest
+
+import AutoCheckin
+from AutoCheckin import PointsSnapshot, run_account
+
+ACCOUNT = {"name": "main", "profile_path": "/profiles/main"}
+
+
+class FakeDriver:
+    """只记录打开的页面和是否已关闭的假 WebDriver。"""
+
+    def __init__(self):
+        self.urls = []
+        self.closed = False
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def statuses(tmp_path, monkeypatch):
+    """
+    替换浏览器启动和任务执行：返回的字典即 run_tasks_with_verification 的执行结果，测试可以直接修改。
+    """
+    result = {}
+    monkeypatch.setattr(AutoCheckin, "REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(AutoCheckin, "setup_driver", lambda profile_path: FakeDriver())
+    monkeypatch.setattr(AutoCheckin, "instrument_driver", lambda driver, metrics: None)
+    monkeypatch.setattr(AutoCheckin, "attach_network_monitor", lambda driver: None)
+    monkeypatch.setattr(AutoCheckin, "scrape_points_progress", lambda driver, wait: PointsSnapshot())
+    monkeypatch.setattr(AutoCheckin, "run_tasks_with_verification",
+                        lambda ctx, tasks: {t: s for t, s in result.items() if t in tasks})
+    return result
+
+
+def test_unfinished_tasks_include_tasks_without_status():
+    statuses = {"daily_check_in": "success", "like_posts": "failed"}
+    assert AutoCheckin._unfinished_tasks({"daily_check_in", "like_posts", "browse_posts"}, statuses) == \
+        ["browse_posts", "like_posts"]
+
+
+def test_account_succeeds_when_every_task_succeeds(statuses):
+    statuses.update(daily_check_in="success", like_posts="success")
+
+    result = run_account(ACCOUNT, tasks={"daily_check_in", "like_posts"})
+
+    assert result["success"]
+    assert result["error"] is None
+
+
+def test_failed_task_fails_the_account(statuses):
+    statuses.update(daily_check_in="success", like_posts="failed", browse_posts="skipped")
+
+    result = run_account(ACCOUNT, tasks={"daily_check_in", "like_posts", "browse_posts"})
+
+    assert not result["success"]
+    assert "like_posts" in result["error"] and "browse_posts" in result["error"]
+
+
+def test_task_without_status_fails_the_account(statuses):
+    statuses.update(daily_check_in="success")
+
+    result = run_account(ACCOUNT, tasks={"daily_check_in", "check_points_page"})
+
+    assert not result["success"]
+    assert "check_points_page" in result["error"]
+
+
+def test_cached_tasks_succeed_without_browser(statuses, monkeypatch):
+    AutoCheckin.get_state_store().mark_tasks_done("main", ["daily_check_in", "like_posts"])
+    monkeypatch.setattr(AutoCheckin, "setup_driver", pytest.fail)
+
+    assert run_account(ACCOUNT, tasks={"daily_check_in", "like_posts", "check_points_page"})["success"]
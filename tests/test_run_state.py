@@ -0,0 +1,51 @@
+"""RunStateStore：按账号和服务器日记录已完成的任务与已操作过的帖子。"""
+from datetime import datetime, timedelta, timezone
+
+import AutoCheckin
+from AutoCheckin import RunStateStore
+
+
+def test_tasks_are_recorded_per_account_and_day(tmp_path):
+    store = RunStateStore(str(tmp_path / "state.sqlite3"))
+    store.mark_tasks_done("main", ["daily_check_in", "like_posts"], day="2026-10-17")
+    store.mark_tasks_done("main", ["daily_check_in"], day="2026-10-17")  # 重复记录被忽略
+
+    assert store.completed_tasks("main", day="2026-10-17") == {"daily_check_in", "like_posts"}
+    assert store.completed_tasks("main", day="2026-10-16") == set()
+    assert store.completed_tasks("other", day="2026-10-17") == set()
+
+
+def test_post_ids_are_recorded_per_action(tmp_path):
+    store = RunStateStore(str(tmp_path / "state.sqlite3"))
+    store.record_posts("main", "like", ["p1", "p2"], day="2026-10-17")
+    store.record_posts("main", "browse", ["p3"], day="2026-10-17")
+
+    assert store.post_ids("main", "like", day="2026-10-17") == {"p1", "p2"}
+    assert store.post_ids("main", "browse", day="2026-10-17") == {"p3"}
+    assert store.post_ids("main", "comment", day="2026-10-17") == set()
+
+
+def test_state_survives_reopening(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    RunStateStore(path).mark_tasks_done("main", ["browse_posts"])
+
+    assert RunStateStore(path).completed_tasks("main") == {"browse_posts"}
+
+
+def test_old_days_are_evicted(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    store = RunStateStore(path, retention_days=7)
+    old_day = AutoCheckin.server_day(datetime.now(timezone.utc) - timedelta(days=30))
+    store.mark_tasks_done("main", ["daily_check_in"], day=old_day)
+    store.record_posts("main", "like", ["p1"], day=old_day)
+    store.mark_tasks_done("main", ["daily_check_in"])
+
+    store.evict(retention_days=7)
+
+    assert store.completed_tasks("main", day=old_day) == set()
+    assert store.post_ids("main", "like", day=old_day) == set()
+    assert store.completed_tasks("main") == {"daily_check_in"}
+
+
+def test_get_state_store_is_shared():
+    assert AutoCheckin.get_state_store() is AutoCheckin.get_state_store()